@@ -0,0 +1,46 @@
+"""shared result cache and cross-worker single-flight leases
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_entries",
+        sa.Column("namespace", sa.String(length=64), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.Column("accessed_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("namespace", "key"),
+    )
+    op.create_index("ix_cache_entries_expires_at", "cache_entries", ["expires_at"])
+    op.create_index("ix_cache_entries_accessed_at", "cache_entries", ["accessed_at"])
+
+    op.create_table(
+        "inflight_leases",
+        sa.Column("key", sa.String(length=128), nullable=False),
+        sa.Column("owner", sa.String(length=255), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inflight_leases")
+    op.drop_index("ix_cache_entries_accessed_at", table_name="cache_entries")
+    op.drop_index("ix_cache_entries_expires_at", table_name="cache_entries")
+    op.drop_table("cache_entries")
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
 
-from app.api.api_v1.endpoints import auth, users
-from app.api.api_v1.endpoints import text_extraction, claimbuster, factcheck, llm_verify
-from app.dependencies.auth import get_current_user
+from app.api.api_v1.endpoints import auth, users, health
+from app.api.api_v1.endpoints import text_extraction, claimbuster, factcheck, llm_verify, pipeline, jobs
+from app.dependencies.auth import get_admin_principal, get_current_principal
 
 api_router = APIRouter()
 
@@ -11,10 +11,15 @@ api_router.include_router(auth.router)   # login/refresh (public)
 api_router.include_router(users.router)  # register will be public; /me still protected
 
 # Protected group for everything else
-protected = APIRouter(dependencies=[Depends(get_current_user)])
+protected = APIRouter(dependencies=[Depends(get_current_principal)])
 protected.include_router(text_extraction.router)
 protected.include_router(claimbuster.router)
 protected.include_router(factcheck.router)
 protected.include_router(llm_verify.router)
+protected.include_router(pipeline.router)
+protected.include_router(jobs.router)
 
 api_router.include_router(protected)
+
+# Operators only: per-worker internals (liveness stays public at /health)
+api_router.include_router(health.router, dependencies=[Depends(get_admin_principal)])
@@ -1,28 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import verify_password, create_access_token, create_refresh_token
-from app.db.session import get_db
-from app.services.user_service import get_user_by_email
-from app.schemas.auth import TokenResponse
-from app.dependencies.auth import get_refresh_subject, get_current_user
+from app.core.executors import ExecutorBusyError
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    estimated_hash_wait_seconds,
+    verify_and_update_password_async,
+)
+from app.db.session import get_async_db
+from app.services.user_service import get_user_by_email_async, revoke_tokens_async, update_password_hash_async
+from app.schemas.auth import Principal, TokenResponse
+from app.dependencies.auth import get_current_user, get_refresh_principal
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = get_user_by_email(db, form_data.username)  # username = email
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await get_user_by_email_async(db, form_data.username)  # username = email
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = create_access_token(subject=user.email)
-    refresh_token = create_refresh_token(subject=user.email)
+    try:
+        valid, new_hash = await verify_and_update_password_async(form_data.password, user.password_hash)
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(int(estimated_hash_wait_seconds()) + 1)},
+        )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # transparent rehash after BCRYPT_ROUNDS changed
+        await update_password_hash_async(db, user, new_hash)
+
+    access_token = create_access_token(subject=user.email, user_id=user.id, token_version=user.token_version)
+    refresh_token = create_refresh_token(subject=user.email, user_id=user.id, token_version=user.token_version)
 
     response.set_cookie(
         key="refresh_token",
@@ -37,11 +57,25 @@ def login(
     return TokenResponse(access_token=access_token)
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh(subject: str = Depends(get_refresh_subject)):
-    return TokenResponse(access_token=create_access_token(subject=subject))
+async def refresh(principal: Principal = Depends(get_refresh_principal)):
+    # uid/ver come from the DB check, so the new access token stays usable in stateless mode
+    return TokenResponse(
+        access_token=create_access_token(
+            subject=principal.email,
+            user_id=principal.user_id,
+            token_version=principal.token_version,
+        )
+    )
 
 # Logout should be protected (only logged-in users can call it)
 @router.post("/logout")
-def logout(response: Response, _user=Depends(get_current_user)):
+async def logout(
+    response: Response,
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Revokes every refresh token of this user (all devices); in AUTH_MODE="stateless"
+    # already-issued access tokens stay valid until they expire
+    await revoke_tokens_async(db, current_user)
     response.delete_cookie(key="refresh_token", path="/")
     return {"status": "ok"}
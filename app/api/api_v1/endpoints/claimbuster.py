@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, status
 import httpx
 
+from app.core.resilience import CircuitOpenError
 from app.schemas.claimbuster import ClaimBusterScoreRequest, ClaimBusterScoreResponse
-from app.services.claimbuster import score_text
+from app.services.claimbuster import ClaimBusterMatchError, score_text
 
 router = APIRouter(prefix="/claimbuster", tags=["ClaimBuster"])
 
@@ -11,12 +12,30 @@ async def score_claimbuster(payload: ClaimBusterScoreRequest):
     try:
         results = await score_text(payload.input_text)
         return ClaimBusterScoreResponse(results=results)
+    except CircuitOpenError as e:
+        # upstream is failing; don't pile on
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+    except TimeoutError as e:
+        # the shared batch this request joined did not finish in time
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"ClaimBuster timed out: {str(e)}",
+        )
     except httpx.HTTPStatusError as e:
         # if third-party returned an error (401, 429, 5xx etc.)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"ClaimBuster error: {e.response.status_code} - {e.response.text[:300]}",
         )
+    except ClaimBusterMatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"ClaimBuster error: {str(e)}",
+        )
     except httpx.RequestError as e:
         # for network error, dns, connection, timeout
         raise HTTPException(
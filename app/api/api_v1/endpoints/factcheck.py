@@ -1,38 +1,47 @@
-from fastapi import APIRouter, HTTPException, status
-import httpx
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.streaming import event_stream_response
 
 from app.schemas.factcheck import (
     FactCheckVerifyRequest,
     FactCheckVerifyResponse,
-    FactCheckSentenceResult,
 )
-from app.services.factcheck import search_fact_checks
+from app.services.factcheck import iter_fact_checks, search_fact_checks_many
 
 router = APIRouter(prefix="/factcheck", tags=["Fact Check"])
 
 @router.post("/verify", response_model=FactCheckVerifyResponse)
 async def verify_claims(payload: FactCheckVerifyRequest):
-    try:
-        results = []
-        for sentence in payload.sentences:
-            matches = await search_fact_checks(
-                query=sentence,
-                language=payload.language,
-                page_size=payload.page_size,
-            )
-            results.append(FactCheckSentenceResult(sentence=sentence, matches=matches))
-
-        return FactCheckVerifyResponse(results=results)
-
-    except httpx.HTTPStatusError as e:
-        # Google API returned 4xx/5xx
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Google Fact Check error: {e.response.status_code} - {e.response.text[:300]}",
-        )
-    except httpx.RequestError as e:
-        # Network / timeout / DNS
+    results = await search_fact_checks_many(
+        payload.sentences,
+        language=payload.language,
+        page_size=payload.page_size,
+        max_concurrency=1 if payload.mode == "sequential" else None,
+    )
+
+    # Per-sentence failures are reported inline; only a total outage is a 502
+    if all(r.error for r in results):
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"Google Fact Check request failed: {str(e)}",
+            detail=results[0].error,
         )
+
+    return FactCheckVerifyResponse(results=results)
+
+
+@router.post("/verify/stream")
+async def verify_claims_stream(payload: FactCheckVerifyRequest, accept: str | None = Header(default=None)):
+    async def _events() -> AsyncIterator[Dict[str, Any]]:
+        # Results arrive in completion order; each carries its sentence
+        async for result in iter_fact_checks(
+            payload.sentences,
+            language=payload.language,
+            page_size=payload.page_size,
+            max_concurrency=1 if payload.mode == "sequential" else None,
+        ):
+            yield {"type": "factcheck", **result.model_dump()}
+        yield {"type": "done"}
+
+    return event_stream_response(_events(), accept)
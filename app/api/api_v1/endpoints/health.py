@@ -0,0 +1,29 @@
+import os
+
+from fastapi import APIRouter, Request
+
+from app.core.batching import batcher_stats
+from app.core.cache import cache_stats
+from app.core.executors import executor_stats
+from app.core.resilience import resilience_stats
+from app.core.singleflight import singleflight_stats
+from app.services.jobs import job_workers
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/diagnostics")
+def diagnostics(request: Request):
+    """
+    Internal state of the worker that served this request. Every counter is per
+    worker; /metrics has the same signals aggregated across workers.
+    """
+    return {
+        "pid": os.getpid(),
+        "startup_ms": getattr(request.app.state, "startup_timings", {}),
+        "caches": cache_stats(),          # hit/miss counters
+        "inflight": singleflight_stats(), # request coalescing
+        "batchers": batcher_stats(),      # upstream micro-batching: fill, dedup, caller timeouts
+        "upstreams": resilience_stats(),  # circuit state, adaptive rate, retries/hedges
+        "executors": executor_stats(),    # bounded thread/process pools
+        "jobs": job_workers.stats(),      # queue consumers
+    }
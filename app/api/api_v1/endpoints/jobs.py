@@ -0,0 +1,65 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import ValidationError
+
+from app.dependencies.auth import get_current_principal
+from app.schemas.auth import Principal
+from app.schemas.jobs import JobCreate, JobRead
+from app.services.jobs import (
+    InvalidWebhookURLError,
+    JobQueueFullError,
+    cancel_job,
+    enqueue_job,
+    get_job,
+    job_to_read,
+    list_jobs,
+)
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.post("", response_model=JobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(payload: JobCreate, principal: Principal = Depends(get_current_principal)):
+    # Returns at once; poll GET /jobs/{id} or wait for the webhook
+    try:
+        job = await enqueue_job(
+            user_id=principal.user_id,
+            kind=payload.kind,
+            payload=payload.payload,
+            priority=payload.priority,
+            webhook_url=str(payload.webhook_url) if payload.webhook_url else None,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+    except InvalidWebhookURLError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=str(e),
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        )
+    return job_to_read(job)
+
+@router.get("", response_model=List[JobRead])
+async def my_jobs(principal: Principal = Depends(get_current_principal)):
+    return [job_to_read(job) for job in await list_jobs(principal.user_id)]
+
+@router.get("/{job_id}", response_model=JobRead)
+async def read_job(job_id: str, principal: Principal = Depends(get_current_principal)):
+    job = await get_job(job_id, principal.user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_read(job)
+
+@router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_job(job_id: str, principal: Principal = Depends(get_current_principal)):
+    if not await cancel_job(job_id, principal.user_id):
+        if await get_job(job_id, principal.user_id) is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail="Job already started")
@@ -1,34 +1,63 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Response, status
 
 from app.schemas.llm_verify import LLMVerifyRequest, LLMVerifyResponse
-from app.services.llm_verify import llm_verify_paragraph
+from app.core.resilience import CircuitOpenError
+from app.core.streaming import event_stream_response
+from app.services.llm_verify import (
+    llm_verify_paragraph,
+    stream_llm_verify_paragraph,
+    to_llm_verify_response,
+)
 
 router = APIRouter(prefix="/llm", tags=["LLM Claim Verification"])
 
+def _wants_bypass(cache_control: str | None, x_cache_bypass: str | None) -> bool:
+    if x_cache_bypass and x_cache_bypass.lower() in {"1", "true", "yes"}:
+        return True
+    return bool(cache_control) and "no-cache" in cache_control.lower()
+
 @router.post("/verify", response_model=LLMVerifyResponse)
-async def verify_with_llm(payload: LLMVerifyRequest):
+async def verify_with_llm(
+    payload: LLMVerifyRequest,
+    response: Response,
+    cache_control: str | None = Header(default=None),
+    x_cache_bypass: str | None = Header(default=None),
+):
     try:
         data = await llm_verify_paragraph(
             input_text=payload.input_text,
             top_n=payload.top_n,
             min_sources=payload.min_sources,
+            use_cache=not _wants_bypass(cache_control, x_cache_bypass),
         )
+        response.headers["X-Cache"] = data.get("_cache", "miss").upper()
+        return to_llm_verify_response(data)
 
-        # If parsing failed, return raw (still 200)
-        if data.get("_parse_error"):
-            return LLMVerifyResponse(
-                claims=[],
-                overall_reliability=None,
-                raw=data.get("raw"),
-            )
-
-        return LLMVerifyResponse(
-            claims=data.get("claims", []),
-            overall_reliability=data.get("overall_reliability"),
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
         )
-
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"LLM verification failed: {str(e)}",
         )
+
+
+@router.post("/verify/stream")
+async def verify_with_llm_stream(
+    payload: LLMVerifyRequest,
+    accept: str | None = Header(default=None),
+    cache_control: str | None = Header(default=None),
+    x_cache_bypass: str | None = Header(default=None),
+):
+    # Claims are emitted one by one while the model is still writing the rest
+    events = stream_llm_verify_paragraph(
+        input_text=payload.input_text,
+        top_n=payload.top_n,
+        min_sources=payload.min_sources,
+        use_cache=not _wants_bypass(cache_control, x_cache_bypass),
+    )
+    return event_stream_response(events, accept)
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.executors import ExecutorBusyError
+from app.core.streaming import event_stream_response
+from app.schemas.pipeline import AnalyzeRequest, AnalyzeResponse, BatchAnalyzeRequest
+from app.services.batch import analyze_batch
+from app.services.pipeline import analyze, analyze_stream
+
+router = APIRouter(tags=["Pipeline"])
+
+
+@router.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_input(payload: AnalyzeRequest):
+    # Stage failures after extraction come back inline in `errors`
+    try:
+        return await analyze(payload)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Extraction timed out: {str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Analysis failed: {str(e)}",
+        )
+
+
+@router.post("/analyze/stream")
+async def analyze_input_stream(payload: AnalyzeRequest, accept: str | None = Header(default=None)):
+    # NDJSON by default; SSE with "Accept: text/event-stream"
+    return event_stream_response(analyze_stream(payload), accept)
+
+
+@router.post("/batch/analyze")
+async def analyze_batch_input(payload: BatchAnalyzeRequest, accept: str | None = Header(default=None)):
+    # One NDJSON line per document as it finishes, then a "done" summary
+    if len(payload.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BATCH_MAX_ITEMS} items per batch; split it or use scripts/batch_analyze.py.",
+        )
+    # HTTP callers may lower the concurrency, never raise it (the CLI is not capped)
+    concurrency = min(payload.max_concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY)
+    events = analyze_batch(payload.items, payload.options, max_concurrency=concurrency)
+    return event_stream_response(events, accept)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status
 
+from app.core.executors import ExecutorBusyError
 from app.schemas.text_extraction import (
     TextExtractRequest,
     TextExtractResponse,
@@ -35,6 +36,17 @@ async def text_extraction(payload: TextExtractRequest):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Extraction timed out: {str(e)}",
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.executors import ExecutorBusyError
+from app.core.security import estimated_hash_wait_seconds, hash_password_async
+from app.db.session import get_async_db
 from app.schemas.user import UserCreate, UserRead
-from app.services.user_service import create_user, get_user_by_email
+from app.services.user_service import create_user_async, get_user_by_email_async
 from app.dependencies.auth import get_current_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("", response_model=UserRead, status_code=201)
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    if get_user_by_email(db, payload.email):
+async def register(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await get_user_by_email_async(db, payload.email):
         raise HTTPException(status_code=409, detail="Email already registered")
-    return create_user(db, payload)
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except ExecutorBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(int(estimated_hash_wait_seconds()) + 1)},
+        )
+    return await create_user_async(db, payload, password_hash=password_hash)
 
 @router.get("/me", response_model=UserRead)
-def me(current_user=Depends(get_current_user)):
+async def me(current_user=Depends(get_current_user)):
     return current_user
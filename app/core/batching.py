@@ -0,0 +1,150 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, TypeVar
+
+from app.core.metrics import (
+    BATCH_CALLER_TIMEOUTS,
+    BATCH_DEDUP_HITS,
+    BATCH_ERRORS,
+    BATCH_FILL_RATIO,
+    BATCH_FLUSH_SIZE,
+    BATCH_FLUSHES,
+    BATCH_ITEMS,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class MicroBatcher(Generic[K, V]):
+    """
+    Collects items from concurrent callers for up to `window_seconds` (or until
+    `max_batch` distinct items are waiting), sends them in one `flush_fn` call and
+    scatters the results back to every waiting caller.
+
+    `flush_fn(items)` must return one result per item, in the same order.
+    Identical items submitted by different callers share one slot in the batch.
+    A caller that times out stops waiting; the batch itself still completes for
+    everyone else.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[List[K]], Awaitable[List[V]]],
+        max_batch: int,
+        window_seconds: float,
+    ) -> None:
+        self.name = name
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.window_seconds = window_seconds
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        # metrics
+        self.batches = 0
+        self.items = 0
+        self.submitted = 0
+        self.callers = 0
+        self.full_flushes = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def submit(self, items: List[K], timeout: float | None = None) -> List[V]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = self._pending.get(item)
+            if future is None:
+                future = loop.create_future()
+                self._pending[item] = future
+                if len(self._pending) >= self.max_batch:
+                    self.full_flushes += 1
+                    self._flush("full")
+                elif self._timer is None:
+                    self._timer = loop.call_later(self.window_seconds, self._flush)
+            else:
+                BATCH_DEDUP_HITS.labels(self.name).inc()
+            futures.append(future)
+
+        self.callers += 1
+        self.submitted += len(items)
+        BATCH_ITEMS.labels(self.name).inc(len(items))
+        gathered = asyncio.gather(*futures)
+        try:
+            # shield: one caller timing out must not cancel futures others share
+            return list(await asyncio.wait_for(asyncio.shield(gathered), timeout))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            BATCH_CALLER_TIMEOUTS.labels(self.name).inc()
+            gathered.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise TimeoutError(f"{self.name} batch did not complete within {timeout}s.")
+
+    def _flush(self, trigger: str = "window") -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        BATCH_FLUSHES.labels(self.name, trigger).inc()
+        BATCH_FLUSH_SIZE.labels(self.name).observe(len(batch))
+        BATCH_FILL_RATIO.labels(self.name).observe(len(batch) / self.max_batch)
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _send(self, batch: Dict[K, asyncio.Future]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        keys = list(batch)
+        try:
+            results = await self.flush_fn(keys)
+            if len(results) != len(keys):
+                raise RuntimeError(f"{self.name} flush returned {len(results)} results for {len(keys)} items")
+            for key, result in zip(keys, results):
+                batch[key].set_result(result)
+        except Exception as e:
+            self.errors += 1
+            BATCH_ERRORS.labels(self.name).inc()
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # cancelled mid-flight (shutdown): release the waiters too
+            for future in batch.values():
+                future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "submitted": self.submitted,
+            "callers": self.callers,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "avg_fill_ratio": round(self.items / (self.batches * self.max_batch), 3) if self.batches else 0.0,
+            "dedup_saved": self.submitted - self.items - len(self._pending),
+            "full_flushes": self.full_flushes,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+
+
+def get_batcher(
+    name: str,
+    flush_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+    max_batch: int,
+    window_seconds: float,
+) -> MicroBatcher:
+    batcher = _batchers.get(name)
+    if batcher is None:
+        batcher = MicroBatcher(name, flush_fn, max_batch, window_seconds)
+        _batchers[name] = batcher
+    return batcher
+
+
+def batcher_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: b.stats() for name, b in _batchers.items()}
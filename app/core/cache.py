@@ -0,0 +1,445 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Stable cache key from arbitrary JSON-able parts.
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class BaseCache(ABC):
+    """
+    Async key/value cache with TTL expiry and a max-entries bound.
+    Values must be JSON-serialisable. Subclasses implement _get/_set, where
+    _get returns (expires_at, value) and drops entries past their expiry, and
+    may override _get_many/_set_many to batch round-trips.
+
+    With `stale_seconds` > 0 an entry is kept that much longer after its TTL;
+    lookup() then returns it flagged as stale (for stale-while-revalidate),
+    while get() treats it as a miss.
+    """
+
+    backend = "base"
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, stale_seconds: float = 0) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def lookup(self, key: str) -> tuple[Any | None, bool]:
+        """
+        Returns (value, is_stale); value is None on a miss.
+        """
+        return self._record(await self._get(key), time.time())
+
+    def _record(self, item: tuple[float, Any] | None, now: float) -> tuple[Any | None, bool]:
+        if item is None:
+            self.misses += 1
+            CACHE_LOOKUPS.labels(self.name, "miss").inc()
+            return None, False
+        expires_at, value = item
+        if now > expires_at - self.stale_seconds:
+            self.stale_hits += 1
+            CACHE_LOOKUPS.labels(self.name, "stale").inc()
+            return value, True
+        self.hits += 1
+        CACHE_LOOKUPS.labels(self.name, "hit").inc()
+        return value, False
+
+    async def get(self, key: str) -> Any | None:
+        value, stale = await self.lookup(key)
+        return None if stale else value
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fresh values for those of `keys` that are cached, in one backend
+        round-trip where the backend supports it; misses (and stale entries)
+        are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        items = await self._get_many(keys)
+        now = time.time()
+        found: Dict[str, Any] = {}
+        for key in keys:
+            value, stale = self._record(items.get(key), now)
+            if value is not None and not stale:
+                found[key] = value
+        return found
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._set(key, value)
+
+    async def set_many(self, items: Dict[str, Any]) -> None:
+        if items:
+            await self._set_many(items)
+
+    def _expires_at(self) -> float:
+        return time.time() + self.ttl_seconds + self.stale_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / total, 4) if total else None,
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> tuple[float, Any] | None: ...
+
+    @abstractmethod
+    async def _set(self, key: str, value: Any) -> None: ...
+
+    async def _get_many(self, keys: List[str]) -> Dict[str, tuple[float, Any]]:
+        items = {}
+        for key in keys:
+            item = await self._get(key)
+            if item is not None:
+                items[key] = item
+        return items
+
+    async def _set_many(self, items: Dict[str, Any]) -> None:
+        for key, value in items.items():
+            await self._set(key, value)
+
+
+class MemoryCache(BaseCache):
+    """
+    In-process TTL + LRU cache (per worker).
+    """
+
+    backend = "memory"
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, stale_seconds: float = 0) -> None:
+        super().__init__(name, ttl_seconds, max_entries, stale_seconds)
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    async def _get(self, key: str) -> tuple[float, Any] | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[0] < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    async def _set(self, key: str, value: Any) -> None:
+        self._data[key] = (self._expires_at(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """
+        Synchronous invalidation (safe to call from ORM event hooks).
+        """
+        self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        data = super().stats()
+        data["entries"] = len(self._data)
+        return data
+
+
+class DatabaseCache(BaseCache):
+    """
+    Cache stored in the `cache_entries` table through the app's SQLAlchemy engine,
+    so every gunicorn worker shares hits. DB errors degrade to cache misses.
+    """
+
+    backend = "database"
+    # Evict (expired + least-recently-used over the bound) every N writes
+    PRUNE_EVERY = 64
+    # Keys per IN (...) clause; stays under SQLite's bound-parameter limit
+    IN_CHUNK = 500
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, stale_seconds: float = 0) -> None:
+        super().__init__(name, ttl_seconds, max_entries, stale_seconds)
+        self._writes = 0
+
+    def _get_sync(self, key: str) -> tuple[float, Any] | None:
+        from app.db.session import SessionLocal
+        from app.models.cache_entry import CacheEntry
+
+        now = time.time()
+        with SessionLocal() as db:
+            entry = db.get(CacheEntry, (self.name, key))
+            if entry is None or entry.expires_at < now:
+                return None
+            entry.accessed_at = now
+            item = (entry.expires_at, json.loads(entry.value))
+            db.commit()
+            return item
+
+    def _get_many_sync(self, keys: List[str]) -> Dict[str, tuple[float, Any]]:
+        from app.db.session import SessionLocal
+        from app.models.cache_entry import CacheEntry
+
+        now = time.time()
+        items: Dict[str, tuple[float, Any]] = {}
+        with SessionLocal() as db:
+            for start in range(0, len(keys), self.IN_CHUNK):
+                chunk = keys[start:start + self.IN_CHUNK]
+                rows = db.execute(
+                    select(CacheEntry.key, CacheEntry.expires_at, CacheEntry.value).where(
+                        CacheEntry.namespace == self.name,
+                        CacheEntry.key.in_(chunk),
+                        CacheEntry.expires_at >= now,
+                    )
+                ).all()
+                for key, expires_at, value in rows:
+                    items[key] = (expires_at, json.loads(value))
+            if items:
+                found = list(items)
+                for start in range(0, len(found), self.IN_CHUNK):
+                    db.execute(
+                        update(CacheEntry)
+                        .where(CacheEntry.namespace == self.name, CacheEntry.key.in_(found[start:start + self.IN_CHUNK]))
+                        .values(accessed_at=now)
+                    )
+                db.commit()
+        return items
+
+    def _set_sync(self, key: str, value: Any, prune: bool) -> None:
+        self._set_many_sync({key: value}, prune)
+
+    def _set_many_sync(self, items: Dict[str, Any], prune: bool) -> None:
+        from app.db.session import SessionLocal
+        from app.models.cache_entry import CacheEntry
+
+        now = time.time()
+        expires_at = self._expires_at()
+        keys = list(items)
+        with SessionLocal() as db:
+            # upsert as delete + insert: portable, and one statement each per chunk
+            for start in range(0, len(keys), self.IN_CHUNK):
+                chunk = keys[start:start + self.IN_CHUNK]
+                db.execute(
+                    delete(CacheEntry).where(CacheEntry.namespace == self.name, CacheEntry.key.in_(chunk))
+                )
+                db.execute(
+                    insert(CacheEntry),
+                    [
+                        {
+                            "namespace": self.name,
+                            "key": key,
+                            "value": json.dumps(items[key], ensure_ascii=False),
+                            "expires_at": expires_at,
+                            "accessed_at": now,
+                        }
+                        for key in chunk
+                    ],
+                )
+            db.commit()
+
+            if prune:
+                self._prune(db, now)
+
+    def _prune(self, db, now: float) -> None:
+        from app.models.cache_entry import CacheEntry
+
+        db.execute(
+            delete(CacheEntry).where(
+                CacheEntry.namespace == self.name,
+                CacheEntry.expires_at < now,
+            )
+        )
+        # LRU: keep only the `max_entries` most recently accessed rows
+        cutoff = db.execute(
+            select(CacheEntry.accessed_at)
+            .where(CacheEntry.namespace == self.name)
+            .order_by(CacheEntry.accessed_at.desc())
+            .offset(self.max_entries)
+            .limit(1)
+        ).scalar()
+        if cutoff is not None:
+            db.execute(
+                delete(CacheEntry).where(
+                    CacheEntry.namespace == self.name,
+                    CacheEntry.accessed_at <= cutoff,
+                )
+            )
+        db.commit()
+
+    def _count_writes(self, n: int) -> bool:
+        # True when this write crosses a PRUNE_EVERY boundary
+        before = self._writes
+        self._writes += n
+        return before // self.PRUNE_EVERY != self._writes // self.PRUNE_EVERY
+
+    async def _get(self, key: str) -> tuple[float, Any] | None:
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except SQLAlchemyError:
+            logger.warning("Cache %s: database read failed", self.name, exc_info=True)
+            return None
+
+    async def _set(self, key: str, value: Any) -> None:
+        try:
+            await asyncio.to_thread(self._set_sync, key, value, self._count_writes(1))
+        except SQLAlchemyError:
+            logger.warning("Cache %s: database write failed", self.name, exc_info=True)
+
+    async def _get_many(self, keys: List[str]) -> Dict[str, tuple[float, Any]]:
+        try:
+            return await asyncio.to_thread(self._get_many_sync, keys)
+        except SQLAlchemyError:
+            logger.warning("Cache %s: database read failed", self.name, exc_info=True)
+            return {}
+
+    async def _set_many(self, items: Dict[str, Any]) -> None:
+        try:
+            await asyncio.to_thread(self._set_many_sync, items, self._count_writes(len(items)))
+        except SQLAlchemyError:
+            logger.warning("Cache %s: database write failed", self.name, exc_info=True)
+
+
+class DiskCache(BaseCache):
+    """
+    One JSON file per entry under settings.CACHE_DIR/<name>; survives restarts.
+    File mtime doubles as the LRU clock. I/O errors degrade to cache misses.
+    """
+
+    backend = "disk"
+    PRUNE_EVERY = 64
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, stale_seconds: float = 0) -> None:
+        super().__init__(name, ttl_seconds, max_entries, stale_seconds)
+        self.directory = os.path.join(settings.CACHE_DIR, name)
+        self._writes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _get_sync(self, key: str) -> tuple[float, Any] | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        if entry["expires_at"] < time.time():
+            os.remove(path)
+            return None
+        os.utime(path)
+        return entry["expires_at"], entry["value"]
+
+    def _set_sync(self, key: str, value: Any, prune: bool) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": self._expires_at(), "value": value}, f, ensure_ascii=False)
+        os.replace(tmp, path)  # atomic, so readers never see a partial file
+
+        if prune:
+            files = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+            if len(files) > self.max_entries:
+                files.sort(key=lambda e: e.stat().st_mtime)
+                for e in files[: len(files) - self.max_entries]:
+                    try:
+                        os.remove(e.path)
+                    except FileNotFoundError:
+                        pass
+
+    async def _get(self, key: str) -> tuple[float, Any] | None:
+        try:
+            return await asyncio.to_thread(self._get_sync, key)
+        except (OSError, ValueError, KeyError):
+            logger.warning("Cache %s: disk read failed", self.name, exc_info=True)
+            return None
+
+    async def _set(self, key: str, value: Any) -> None:
+        self._writes += 1
+        try:
+            await asyncio.to_thread(self._set_sync, key, value, self._writes % self.PRUNE_EVERY == 0)
+        except OSError:
+            logger.warning("Cache %s: disk write failed", self.name, exc_info=True)
+
+    def _get_many_sync(self, keys: List[str]) -> Dict[str, tuple[float, Any]]:
+        items = {}
+        for key in keys:
+            try:
+                item = self._get_sync(key)
+            except (OSError, ValueError, KeyError):
+                logger.warning("Cache %s: disk read failed", self.name, exc_info=True)
+                continue
+            if item is not None:
+                items[key] = item
+        return items
+
+    def _set_many_sync(self, items: Dict[str, Any]) -> None:
+        for key, value in items.items():
+            self._writes += 1
+            try:
+                self._set_sync(key, value, self._writes % self.PRUNE_EVERY == 0)
+            except OSError:
+                logger.warning("Cache %s: disk write failed", self.name, exc_info=True)
+
+    async def _get_many(self, keys: List[str]) -> Dict[str, tuple[float, Any]]:
+        # one thread hop for the whole batch instead of one per key
+        return await asyncio.to_thread(self._get_many_sync, keys)
+
+    async def _set_many(self, items: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._set_many_sync, items)
+
+
+_BACKENDS = {
+    MemoryCache.backend: MemoryCache,
+    DatabaseCache.backend: DatabaseCache,
+    DiskCache.backend: DiskCache,
+}
+
+_caches: Dict[str, BaseCache] = {}
+
+
+def get_cache(
+    name: str,
+    ttl_seconds: float,
+    max_entries: int,
+    backend: str | None = None,
+    stale_seconds: float = 0,
+) -> BaseCache:
+    """
+    Return the named cache, creating it on first use.
+    `backend` defaults to settings.CACHE_BACKEND ("memory", "database" or "disk").
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        backend = backend or settings.CACHE_BACKEND
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown cache backend: {backend}")
+        cache = _BACKENDS[backend](name, ttl_seconds, max_entries, stale_seconds)
+        _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -13,6 +13,32 @@ class Settings(BaseSettings):
 
     # DB (use sqlite for now; switch to Postgres later)
     DATABASE_URL: str = "sqlite:///./dev.db"
+    # Pool tuning (server databases; both the sync and the async engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_STATEMENT_CACHE_SIZE: int = 100    # asyncpg prepared statements; 0 behind pgbouncer
+    # SQLite dev path
+    SQLITE_WAL: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Schema at startup: create_all is the SQLite dev path; prod runs Alembic
+    DB_CREATE_ALL: bool = True
+    RUN_MIGRATIONS: bool = False          # "alembic upgrade head" in the lifespan instead of create_all
+    ALEMBIC_CONFIG: str = "alembic.ini"
+
+    # Startup
+    PRELOAD_PROVIDERS: bool = False       # build the OpenAI client / import trafilatura before serving
+
+    # Metrics (Prometheus /metrics; multi-worker via PROMETHEUS_MULTIPROC_DIR, see gunicorn.conf.py)
+    METRICS_ENABLED: bool = True
+    METRICS_SAMPLE_INTERVAL_SECONDS: float = 1.0   # event-loop lag probe + pool gauges
+
+    # Tracing (W3C traceparent in/out; spans go to a local exporter, no collector needed)
+    TRACING_EXPORTER: str = "none"        # "none" | "console" (log lines) | "file" (JSON lines)
+    TRACING_FILE: str = "traces.jsonl"    # "{pid}" is replaced by the worker pid, e.g. "traces-{pid}.jsonl"
+    TRACING_QUEUE_MAX: int = 10000        # spans buffered for the file writer thread before dropping
+    TRACING_SAMPLE_RATIO: float = 1.0     # for new traces; an incoming traceparent's flag wins
 
     # JWT
     SECRET_KEY: str
@@ -20,6 +46,25 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 14
 
+    # Password hashing (bcrypt runs on its own bounded pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"      # or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_MAX_WAIT_SECONDS: float = 5   # reject logins that would queue longer
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10
+
+    # How protected routes resolve the caller:
+    #   "stateless" - trust signed token claims (uid/email/ver), no DB
+    #   "cached"    - check token version against a TTL'd principal cache (DB on miss)
+    #   "database"  - load the User row on every request
+    AUTH_MODE: str = "cached"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Operators: may read /api/v1/health/diagnostics (per-worker counters, queues, circuit state)
+    ADMIN_EMAILS: List[str] = []
+
     # Cookie for refresh token
     COOKIE_SECURE: bool = False       # True in production (HTTPS)
     COOKIE_SAMESITE: str = "lax"      # if React is on a different domain + HTTPS use "none"
@@ -29,18 +74,108 @@ class Settings(BaseSettings):
     CLAIMBUSTER_API_KEY: str
     CLAIMBUSTER_BATCH_URL: str = "https://idir.uta.edu/claimbuster/api/v2/score/text/sentences/"
     CLAIMBUSTER_TIMEOUT_SECONDS: int = 30
+    CLAIMBUSTER_POOL_SIZE: int = 20
+    CLAIMBUSTER_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # scores are deterministic per sentence
+    CLAIMBUSTER_CACHE_MAX_ENTRIES: int = 100_000
+    # Micro-batching: concurrent callers' sentences are merged into one upstream POST
+    CLAIMBUSTER_BATCHING: bool = True
+    CLAIMBUSTER_BATCH_WINDOW_MS: float = 5
+    CLAIMBUSTER_BATCH_MAX_SENTENCES: int = 64
+    CLAIMBUSTER_RATE_PER_SECOND: float = 5
+    CLAIMBUSTER_HEDGE_AFTER_SECONDS: float = 0    # 0 = no hedged requests
 
     # Google Fact Checking
     FACT_CHECK_API_KEY: str
     FACTCHECK_ENDPOINT: str = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
     FACTCHECK_TIMEOUT_SECONDS: int = 30
+    FACTCHECK_POOL_SIZE: int = 50
+    FACTCHECK_MAX_CONCURRENCY: int = 8             # parallel sentence lookups per request
+    FACTCHECK_REQUEST_DEADLINE_SECONDS: float = 45 # whole-request budget for /factcheck/verify
+    FACTCHECK_CACHE_TTL_SECONDS: int = 6 * 3600
+    FACTCHECK_CACHE_MAX_ENTRIES: int = 10_000
+    FACTCHECK_RATE_PER_SECOND: float = 20
+    FACTCHECK_HEDGE_AFTER_SECONDS: float = 2      # race a second GET when the first is this slow
+
+    # Result caches: "memory" (per worker), "database" (shared via DATABASE_URL)
+    # or "disk" (files under CACHE_DIR, survives restarts)
+    CACHE_BACKEND: str = "memory"
+    CACHE_DIR: str = "./.cache"
+
+    # In-flight request coalescing (see app/core/singleflight.py)
+    SINGLEFLIGHT_CROSS_WORKER: bool = False  # coordinate workers via DB leases (needs CACHE_BACKEND=database)
+    SINGLEFLIGHT_LEASE_SECONDS: float = 120
+    SINGLEFLIGHT_POLL_INTERVAL_SECONDS: float = 0.5
+
+    # Upstream resilience (see app/core/resilience.py)
+    UPSTREAM_MAX_RETRIES: int = 3         # idempotent calls, transient errors (429/5xx/network) only
+    UPSTREAM_RETRY_BASE_SECONDS: float = 0.25
+    UPSTREAM_RETRY_MAX_SECONDS: float = 8
+    CIRCUIT_FAILURE_THRESHOLD: int = 5    # consecutive failures before failing fast
+    CIRCUIT_RESET_SECONDS: float = 30     # open -> half-open probe
+
+    # Shared outbound HTTP clients (see app/core/http_clients.py)
+    HTTP2_ENABLED: bool = True            # used only if the "h2" package is installed
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30
+    HTTP_POOL_TIMEOUT_SECONDS: float = 10 # max wait for a free pooled connection
+
+    # Text extraction (article download + trafilatura / YouTube transcripts)
+    ARTICLE_FETCH_TIMEOUT_SECONDS: float = 20
+    ARTICLE_POOL_SIZE: int = 20
+    ARTICLE_MAX_BYTES: int = 20_000_000
+    ARTICLE_USER_AGENT: str = "Mozilla/5.0 (compatible; ClaimPolygraph/1.0)"
+    ARTICLE_CACHE_BACKEND: str | None = None        # defaults to CACHE_BACKEND; "disk" survives restarts
+    ARTICLE_CACHE_FRESH_SECONDS: int = 15 * 60      # served without revalidating
+    ARTICLE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # kept for conditional revalidation
+    ARTICLE_CACHE_MAX_ENTRIES: int = 5_000
+    EXTRACTION_EXECUTOR: str = "thread"   # "thread" or "process" for trafilatura.extract
+    EXTRACTION_MAX_WORKERS: int = 4
+    EXTRACTION_MAX_QUEUE: int = 32        # extra waiting jobs before returning 503
+    EXTRACTION_TIMEOUT_SECONDS: float = 30
+    SEGMENT_INLINE_MAX_CHARS: int = 50_000  # longer texts are segmented in a worker thread
+    YOUTUBE_MAX_WORKERS: int = 8
+    YOUTUBE_MAX_QUEUE: int = 32
+    YOUTUBE_TIMEOUT_SECONDS: float = 30
+    YOUTUBE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    YOUTUBE_CACHE_MAX_ENTRIES: int = 2_000
 
     # OpenAI / LLM
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: str | None = None   # OpenAI-compatible endpoint (proxy, benchmarks/mock_upstreams.py)
 
     # LLM tuning
     LLM_TOP_N_CLAIMS: int = 3
     LLM_MIN_SOURCES: int = 2
 
+    # LLM client (async, shared per worker)
+    LLM_MAX_CONCURRENCY: int = 8      # max in-flight LLM calls per worker
+    LLM_TIMEOUT_SECONDS: float = 90
+    LLM_MAX_RETRIES: int = 2
+    LLM_VERIFY_MODEL: str = "gpt-5"
+    LLM_RATE_PER_SECOND: float = 5
+
+    # LLM verification result cache (persistent by default)
+    LLM_CACHE_BACKEND: str = "database"
+    LLM_CACHE_TTL_SECONDS: int = 24 * 3600
+    LLM_CACHE_STALE_SECONDS: int = 6 * 24 * 3600  # serve stale + refresh in background
+    LLM_CACHE_MAX_ENTRIES: int = 5_000
+
+    # Batch analysis (/batch/analyze and scripts/batch_analyze.py)
+    BATCH_MAX_ITEMS: int = 1_000          # per HTTP request; the CLI is unbounded
+    BATCH_MAX_CONCURRENCY: int = 8        # documents in flight per batch
+
+    # Background jobs (DB-backed queue, see app/services/jobs.py)
+    JOB_WORKERS: int = 2                  # queue consumers per app worker; 0 = enqueue only
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 300          # running jobs not heartbeated within this are requeued
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 10 # doubled per attempt
+    JOB_MAX_RUNNING_PER_USER: int = 2
+    JOB_MAX_QUEUED_PER_USER: int = 100
+    WEBHOOK_TIMEOUT_SECONDS: float = 10
+    WEBHOOK_MAX_ATTEMPTS: int = 3
+    WEBHOOK_REQUIRE_HTTPS: bool = True          # False for local dev receivers
+    WEBHOOK_ALLOW_PRIVATE_HOSTS: bool = False   # loopback / RFC1918 / link-local targets (dev only)
+
 
 settings = Settings()
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorBusyError(RuntimeError):
+    """
+    Raised when a bounded executor's queue is full; callers should shed load (503).
+    """
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool for blocking / CPU-heavy work called from async code.
+
+    At most `max_workers` tasks run and `max_queue` more may wait; beyond that
+    run() fails fast with ExecutorBusyError instead of piling up work.
+    Slots are released when the underlying task really finishes, so a timed-out
+    call still counts against the bound until its worker is free again.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, kind: str = "thread") -> None:
+        if kind not in {"thread", "process"}:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        _executors[name] = self
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def _release(self, _future: Any) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: float | None = None) -> T:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusyError(f"{self.name} is overloaded, try again later.")
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()  # only helps if it has not started yet
+            self.timeouts += 1
+            raise TimeoutError(f"{self.name} timed out after {timeout}s.")
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._pending - self.max_workers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: ex.stats() for name, ex in _executors.items()}
+
+
+def shutdown_executors() -> None:
+    for ex in _executors.values():
+        ex.shutdown()
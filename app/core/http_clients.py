@@ -0,0 +1,79 @@
+import importlib.util
+from typing import Dict
+
+import httpx
+
+from app.core.config import settings
+from app.core.tracing import traceparent_headers
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+async def _inject_traceparent(request: httpx.Request) -> None:
+    # W3C trace context on every outbound call, so upstream logs can be joined to our spans
+    for name, value in traceparent_headers().items():
+        request.headers.setdefault(name, value)
+
+
+class HTTPClientRegistry:
+    """
+    Application-scoped pool of httpx.AsyncClient instances, one per upstream provider.
+    Clients are opened in the app lifespan and closed on shutdown; a client requested
+    before startup (scripts, tests) is created lazily on first use.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _provider_config(self, provider: str) -> tuple[float, int]:
+        if provider == "claimbuster":
+            return settings.CLAIMBUSTER_TIMEOUT_SECONDS, settings.CLAIMBUSTER_POOL_SIZE
+        if provider == "factcheck":
+            return settings.FACTCHECK_TIMEOUT_SECONDS, settings.FACTCHECK_POOL_SIZE
+        if provider == "articles":
+            return settings.ARTICLE_FETCH_TIMEOUT_SECONDS, settings.ARTICLE_POOL_SIZE
+        if provider == "webhooks":
+            return settings.WEBHOOK_TIMEOUT_SECONDS, 10
+        raise KeyError(f"Unknown HTTP provider: {provider}")
+
+    def _build(self, provider: str) -> httpx.AsyncClient:
+        timeout, pool_size = self._provider_config(provider)
+        # Arbitrary news sites: follow redirects and look like a regular browser fetch.
+        # Webhooks never follow them: a redirect would skip the target checks in app/services/jobs.py
+        extra = (
+            {"follow_redirects": True, "headers": {"User-Agent": settings.ARTICLE_USER_AGENT}}
+            if provider == "articles"
+            else {"follow_redirects": False}
+        )
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=min(pool_size, settings.HTTP_MAX_KEEPALIVE_CONNECTIONS),
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, pool=settings.HTTP_POOL_TIMEOUT_SECONDS),
+            limits=limits,
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            event_hooks={"request": [_inject_traceparent]},
+            **extra,
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build(provider)
+            self._clients[provider] = client
+        return client
+
+    async def startup(self) -> None:
+        for provider in ("claimbuster", "factcheck", "articles", "webhooks"):
+            self.get(provider)
+
+    async def shutdown(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
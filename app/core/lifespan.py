@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Iterator
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.executors import shutdown_executors
+from app.core.http_clients import http_clients
+from app.core.metrics import monitor_event_loop
+from app.core.tracing import shutdown_tracing
+from app.services.jobs import job_workers
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info("startup phase %s took %.1f ms", name, timings[name])
+
+
+def create_schema() -> None:
+    # dev convenience (SQLite). For real prod use RUN_MIGRATIONS / Alembic.
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.models import user, cache_entry, inflight_lease, job  # noqa: F401  (register tables)
+
+    Base.metadata.create_all(bind=engine)
+
+
+def _run_migrations() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(settings.ALEMBIC_CONFIG)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def _preload_providers() -> None:
+    # Pay the slow imports / client construction before the first request instead of during it
+    import trafilatura  # noqa: F401
+
+    from app.llm.llm_inference import get_client
+
+    get_client()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings: Dict[str, float] = {}
+    app.state.startup_timings = timings
+
+    with _phase(timings, "total"):
+        if settings.RUN_MIGRATIONS:
+            with _phase(timings, "migrations"):
+                await asyncio.to_thread(_run_migrations)
+        elif settings.DB_CREATE_ALL:
+            with _phase(timings, "create_all"):
+                await asyncio.to_thread(create_schema)
+
+        # Pooled upstream HTTP clients live for the whole worker lifetime
+        with _phase(timings, "http_clients"):
+            await http_clients.startup()
+
+        if settings.JOB_WORKERS > 0:
+            with _phase(timings, "job_workers"):
+                await job_workers.start()
+
+        if settings.PRELOAD_PROVIDERS:
+            with _phase(timings, "providers"):
+                await asyncio.to_thread(_preload_providers)
+
+    monitor = asyncio.create_task(monitor_event_loop()) if settings.METRICS_ENABLED else None
+    try:
+        yield
+    finally:
+        if monitor is not None:
+            monitor.cancel()
+        from app.llm.llm_inference import close_client
+
+        await job_workers.stop()
+        await http_clients.shutdown()
+        await close_client()
+        shutdown_executors()
+        await asyncio.to_thread(shutdown_tracing)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import REGISTRY, multiprocess
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Under gunicorn, PROMETHEUS_MULTIPROC_DIR (set in gunicorn.conf.py) makes every
+# worker write its samples to shared files; /metrics then aggregates them all.
+_MULTIPROC = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Upstream calls run from ~10 ms (cache-adjacent APIs) to minutes (LLM + web search)
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the last body byte)",
+    ["method", "route"], buckets=_LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds", "Latency of calls to external providers and blocking stages",
+    ["provider", "outcome"], buckets=_LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total", "Failed calls to external providers and blocking stages", ["provider", "error"]
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups (hit ratio = hit+stale / all)", ["cache", "result"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke a periodic timer",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "executor_queue_depth", "Jobs waiting for a worker thread/process", ["executor"], multiprocess_mode="livesum"
+)
+EXECUTOR_IN_FLIGHT = Gauge(
+    "executor_in_flight", "Jobs running or queued on a bounded executor", ["executor"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+UPSTREAM_CIRCUIT_OPEN = Gauge(
+    "upstream_circuit_open", "1 while a provider's circuit breaker is open or half-open", ["provider"],
+    multiprocess_mode="max",
+)
+UPSTREAM_RATE = Gauge(
+    "upstream_rate_limit_per_second", "Current adaptive rate limit per provider", ["provider"],
+    multiprocess_mode="min",
+)
+BATCH_FLUSHES = Counter(
+    "batch_flushes_total", "Micro-batch flushes by trigger (window elapsed or batch full)", ["batcher", "trigger"]
+)
+BATCH_FLUSH_SIZE = Histogram(
+    "batch_flush_size", "Distinct items sent per micro-batch flush", ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+BATCH_FILL_RATIO = Histogram(
+    "batch_fill_ratio", "Micro-batch flush size as a fraction of its max batch", ["batcher"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1),
+)
+BATCH_ITEMS = Counter(
+    "batch_submitted_items_total", "Items submitted to a micro-batcher", ["batcher"]
+)
+BATCH_DEDUP_HITS = Counter(
+    "batch_dedup_hits_total", "Submitted items that joined an identical item already waiting", ["batcher"]
+)
+BATCH_CALLER_TIMEOUTS = Counter(
+    "batch_caller_timeouts_total", "Callers that stopped waiting for their micro-batch", ["batcher"]
+)
+BATCH_ERRORS = Counter(
+    "batch_flush_errors_total", "Micro-batch flushes that failed for every item", ["batcher"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "DB connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+
+
+@asynccontextmanager
+async def track_upstream(provider: str) -> AsyncIterator[None]:
+    """
+    Time one call to `provider` and count its failures by exception type.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        if not isinstance(e, asyncio.CancelledError):
+            UPSTREAM_ERRORS.labels(provider, type(e).__name__).inc()
+            UPSTREAM_LATENCY.labels(provider, "error").observe(time.perf_counter() - started)
+        raise
+    UPSTREAM_LATENCY.labels(provider, "ok").observe(time.perf_counter() - started)
+
+
+def route_template(scope: Scope) -> str:
+    # The matched route only knows its own path; include_router prefixes are
+    # recovered by re-rendering the template with the path params
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return "unmatched"
+    try:
+        rendered = path_format.format(**{k: str(v) for k, v in scope.get("path_params", {}).items()})
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    path = scope["path"]
+    return path[: len(path) - len(rendered)] + path_format if path.endswith(rendered) else path_format
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (streaming-safe): per-route request counts and latency,
+    labelled with the route template so path parameters don't explode cardinality.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_IN_PROGRESS.labels(method).dec()
+            template = route_template(scope)
+            HTTP_REQUESTS.labels(method, template, str(status)).inc()
+            HTTP_LATENCY.labels(method, template).observe(time.perf_counter() - started)
+
+
+def _sample_pools() -> None:
+    from app.core.executors import executor_stats
+    from app.core.resilience import resilience_stats
+    from app.db.session import async_engine, engine
+
+    for name, stats in executor_stats().items():
+        EXECUTOR_QUEUE_DEPTH.labels(name).set(stats["queue_depth"])
+        EXECUTOR_IN_FLIGHT.labels(name).set(stats["in_flight"])
+    for name, stats in resilience_stats().items():
+        UPSTREAM_CIRCUIT_OPEN.labels(name).set(0 if stats["circuit"] == "closed" else 1)
+        UPSTREAM_RATE.labels(name).set(stats["rate_per_second"])
+    for name, eng in (("sync", engine), ("async", async_engine.sync_engine)):
+        checked_out = getattr(eng.pool, "checkedout", None)
+        if checked_out is not None:
+            DB_POOL_CHECKED_OUT.labels(name).set(checked_out())
+
+
+async def monitor_event_loop() -> None:
+    """
+    Runs for the worker's lifetime: measures event-loop lag (a blocked loop wakes
+    this timer late) and samples executor / DB pool gauges.
+    """
+    interval = settings.METRICS_SAMPLE_INTERVAL_SECONDS
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+        try:
+            _sample_pools()
+        except Exception:
+            logger.debug("Pool sampling failed", exc_info=True)
+
+
+def metrics_endpoint(_request: Request) -> Response:
+    if _MULTIPROC:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,335 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import track_upstream
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised without calling the provider while its circuit breaker is open;
+    callers should shed load (503 + Retry-After).
+    """
+
+    def __init__(self, provider: str, retry_after: float) -> None:
+        super().__init__(f"{provider} is temporarily unavailable (circuit open), retry in {retry_after:.0f}s.")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Per-provider rate limiter. The rate adapts AIMD-style: a 429 halves it and
+    pauses everyone until the upstream's Retry-After has passed (at most
+    `max_pause` seconds), each success creeps it back towards the configured maximum.
+    """
+
+    def __init__(self, rate: float, burst: float, max_pause: float) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_pause = max_pause
+        self.tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:  # FIFO: waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        if now < self._paused_until or self._lock.locked():
+            return False
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def throttle(self, retry_after: float | None) -> None:
+        self.rate = max(self.max_rate / 10, self.rate / 2)
+        if retry_after:
+            # one "Retry-After: 3600" must not park every caller for an hour
+            pause = min(retry_after, self.max_pause)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def relax(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `threshold` consecutive failures; open fails fast for
+    `reset_seconds`, then half-open lets a single probe through: success closes
+    the circuit, failure re-opens it.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if self.retry_after() > 0:
+                return False
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open":
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def release(self) -> None:
+        """
+        The call that `allow` let through ended without a verdict (cancelled):
+        free the half-open probe slot so the next caller can probe.
+        """
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+def _retry_after_seconds(response: Any) -> float | None:
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _classify(e: BaseException) -> tuple[bool, float | None]:
+    """
+    (transient, retry_after): transient errors are retried and count against the
+    breaker; anything else (4xx, bad input) is the caller's problem and is not.
+    """
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500, _retry_after_seconds(response)
+    if isinstance(e, (httpx.TransportError, TimeoutError)):
+        return True, None
+    # openai.APIConnectionError / APITimeoutError carry no status code
+    return type(e).__module__.startswith("openai"), None
+
+
+class Provider:
+    """
+    Resilience policy for one upstream: rate limit -> circuit breaker ->
+    call (optionally hedged) -> jittered exponential retry on transient errors.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        max_retries: int,
+        hedge_after_seconds: float = 0,
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(
+            rate_per_second,
+            burst=max(1.0, rate_per_second * 2),
+            max_pause=settings.UPSTREAM_RETRY_MAX_SECONDS,
+        )
+        self.breaker = CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+        self.max_retries = max_retries
+        self.hedge_after_seconds = hedge_after_seconds
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": spreads retries from many callers instead of synchronizing them
+        cap = min(settings.UPSTREAM_RETRY_MAX_SECONDS, settings.UPSTREAM_RETRY_BASE_SECONDS * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def max_call_seconds(self, attempt_seconds: float) -> float:
+        """
+        Longest an idempotent `call` can keep going when each attempt takes at most
+        `attempt_seconds`: every attempt plus the longest sleep before each retry
+        (backoff and honoured Retry-After are both capped at UPSTREAM_RETRY_MAX_SECONDS).
+        """
+        return (self.max_retries + 1) * attempt_seconds + self.max_retries * settings.UPSTREAM_RETRY_MAX_SECONDS
+
+    async def call(self, fn: Callable[[], Awaitable[T]], idempotent: bool = True) -> T:
+        """
+        Run `fn` under this provider's policy. Only idempotent calls are retried
+        or hedged; non-idempotent ones still get rate limiting and the breaker.
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.breaker.retry_after())
+            probe = self.breaker.state == "half_open"
+            try:
+                await self.bucket.acquire()
+                self.calls += 1
+                async with track_upstream(self.name):
+                    if idempotent and self.hedge_after_seconds > 0:
+                        result = await self._hedged(fn)
+                    else:
+                        result = await fn()
+            except Exception as e:
+                transient, retry_after = _classify(e)
+                if not transient:
+                    # the provider answered; it's healthy even if the request wasn't
+                    self.breaker.record_success()
+                    raise
+                self.failures += 1
+                self.breaker.record_failure()
+                if retry_after is not None or getattr(getattr(e, "response", None), "status_code", None) == 429:
+                    self.throttled += 1
+                    self.bucket.throttle(retry_after)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                if retry_after is not None and retry_after > settings.UPSTREAM_RETRY_MAX_SECONDS:
+                    # longer than we hold a request for: fail fast rather than sleep through it
+                    raise
+                await asyncio.sleep(retry_after if retry_after is not None else self._backoff(attempt))
+                attempt += 1
+                self.retries += 1
+                continue
+            except BaseException:
+                # cancelled (client disconnect, deadline) or exiting: says nothing
+                # about the upstream, but a half-open probe must not stay taken
+                if probe:
+                    self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            self.bucket.relax()
+            return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        # Tail latency: if the first attempt is slow, race a second one against it
+        first = asyncio.ensure_future(fn())
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_after_seconds)
+        except BaseException:
+            first.cancel()
+            raise
+        if done or not self.bucket.try_acquire():
+            return await first
+
+        self.hedges += 1
+        second = asyncio.ensure_future(fn())
+        pending = {first, second}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "circuit_opened": self.breaker.opened,
+            "rate_per_second": round(self.bucket.rate, 3),
+            "max_rate_per_second": self.bucket.max_rate,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+        }
+
+
+def _provider_config(name: str) -> tuple[float, int, float]:
+    # (rate/s, retries, hedge after s)
+    if name == "claimbuster":
+        return settings.CLAIMBUSTER_RATE_PER_SECOND, settings.UPSTREAM_MAX_RETRIES, settings.CLAIMBUSTER_HEDGE_AFTER_SECONDS
+    if name == "factcheck":
+        return settings.FACTCHECK_RATE_PER_SECOND, settings.UPSTREAM_MAX_RETRIES, settings.FACTCHECK_HEDGE_AFTER_SECONDS
+    if name == "openai":
+        # the OpenAI SDK already retries (LLM_MAX_RETRIES); don't multiply them
+        return settings.LLM_RATE_PER_SECOND, 0, 0
+    raise KeyError(f"Unknown upstream provider: {name}")
+
+
+_providers: Dict[str, Provider] = {}
+
+
+def get_provider(name: str) -> Provider:
+    provider = _providers.get(name)
+    if provider is None:
+        rate, retries, hedge_after = _provider_config(name)
+        provider = Provider(name, rate, retries, hedge_after)
+        _providers[name] = provider
+    return provider
+
+
+def resilience_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: p.stats() for name, p in _providers.items()}
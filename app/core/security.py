@@ -1,9 +1,22 @@
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.executors import BoundedExecutor, ExecutorBusyError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost is tunable; hashes made with an older cost are upgraded on next login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# Dedicated pool so a login burst cannot starve FastAPI's shared threadpool
+_hash_executor = BoundedExecutor(
+    "password_hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+# EWMA of one hash/verify, used to estimate queueing delay
+_avg_hash_seconds = 0.25
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -16,12 +29,54 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
-def create_access_token(subject: str) -> str:
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """
+    Returns (valid, new_hash); new_hash is set when the stored hash uses
+    outdated parameters and should be replaced.
+    """
+    return pwd_context.verify_and_update(password, password_hash)
+
+def estimated_hash_wait_seconds() -> float:
+    return (_hash_executor.queue_depth + 1) * _avg_hash_seconds / _hash_executor.max_workers
+
+def _timed(fn, *args):
+    # Runs in the pool worker, so only the hash itself is timed: queueing is
+    # already accounted for by the queue depth in estimated_hash_wait_seconds
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+async def _run_hash_job(fn, *args):
+    global _avg_hash_seconds
+    # Shed load early when the queue would wait longer than a client should
+    wait = estimated_hash_wait_seconds()
+    if wait > settings.PASSWORD_HASH_MAX_WAIT_SECONDS:
+        raise ExecutorBusyError(f"Too many concurrent logins, retry in {int(wait) + 1}s.")
+    result, seconds = await _hash_executor.run(_timed, fn, *args, timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    _avg_hash_seconds = 0.8 * _avg_hash_seconds + 0.2 * seconds
+    return result
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(hash_password, password)
+
+async def verify_and_update_password_async(password: str, password_hash: str) -> tuple[bool, str | None]:
+    return await _run_hash_job(verify_and_update_password, password, password_hash)
+
+def _principal_claims(user_id: int | None, token_version: int | None) -> dict:
+    # uid/ver let protected routes authorize from the token alone (AUTH_MODE)
+    claims = {}
+    if user_id is not None:
+        claims["uid"] = user_id
+    if token_version is not None:
+        claims["ver"] = token_version
+    return claims
+
+def create_access_token(subject: str, user_id: int | None = None, token_version: int | None = None) -> str:
     exp = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": subject, "type": "access", "exp": exp}
+    payload = {"sub": subject, "type": "access", "exp": exp, **_principal_claims(user_id, token_version)}
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
-def create_refresh_token(subject: str) -> str:
+def create_refresh_token(subject: str, user_id: int | None = None, token_version: int | None = None) -> str:
     exp = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    payload = {"sub": subject, "type": "refresh", "exp": exp}
+    payload = {"sub": subject, "type": "refresh", "exp": exp, **_principal_claims(user_id, token_version)}
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing: concurrent calls with the same key share one
+    execution instead of each hitting the upstream.
+
+    The shared work runs in its own task, so a caller that disconnects (and is
+    cancelled) does not cancel the work for everyone else awaiting the same key.
+
+    When `peek` is given and SINGLEFLIGHT_CROSS_WORKER is on, workers also
+    coordinate through a database lease: the lease holder does the work, the
+    others poll `peek` (typically a shared-cache lookup) until the result shows up.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        peek: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.leaders += 1
+        if peek is not None and settings.SINGLEFLIGHT_CROSS_WORKER:
+            work = _with_lease(f"{self.name}:{key}", fn, peek)
+        else:
+            work = fn()
+        task = asyncio.ensure_future(work)
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; callers already got it
+
+    def stats(self) -> Dict[str, Any]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+
+# ---- cross-worker lease (cache_entries-style table on the app engine) ----
+
+def _try_acquire(lease_key: str) -> bool:
+    from app.db.session import SessionLocal
+    from app.models.inflight_lease import InflightLease
+
+    now = time.time()
+    expires_at = now + settings.SINGLEFLIGHT_LEASE_SECONDS
+    with SessionLocal() as db:
+        try:
+            db.add(InflightLease(key=lease_key, owner=_OWNER, expires_at=expires_at))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+        # Take over a lease whose holder died without releasing it
+        taken = db.execute(
+            update(InflightLease)
+            .where(InflightLease.key == lease_key, InflightLease.expires_at < now)
+            .values(owner=_OWNER, expires_at=expires_at)
+        )
+        db.commit()
+        return taken.rowcount == 1
+
+
+def _lease_held(lease_key: str) -> bool:
+    from app.db.session import SessionLocal
+    from app.models.inflight_lease import InflightLease
+
+    with SessionLocal() as db:
+        lease = db.get(InflightLease, lease_key)
+        return lease is not None and lease.expires_at >= time.time()
+
+
+def _release(lease_key: str) -> None:
+    from app.db.session import SessionLocal
+    from app.models.inflight_lease import InflightLease
+
+    with SessionLocal() as db:
+        db.execute(delete(InflightLease).where(InflightLease.key == lease_key, InflightLease.owner == _OWNER))
+        db.commit()
+
+
+async def _with_lease(
+    lease_key: str,
+    fn: Callable[[], Awaitable[T]],
+    peek: Callable[[], Awaitable[T | None]],
+) -> T:
+    try:
+        acquired = await asyncio.to_thread(_try_acquire, lease_key)
+    except SQLAlchemyError:
+        logger.warning("Single-flight lease unavailable, running locally", exc_info=True)
+        return await fn()
+
+    if acquired:
+        try:
+            return await fn()
+        finally:
+            try:
+                await asyncio.to_thread(_release, lease_key)
+            except SQLAlchemyError:
+                logger.warning("Single-flight lease release failed", exc_info=True)
+
+    # Another worker is computing it: wait for its result to land in the shared cache
+    while True:
+        await asyncio.sleep(settings.SINGLEFLIGHT_POLL_INTERVAL_SECONDS)
+        result = await peek()
+        if result is not None:
+            return result
+        try:
+            if not await asyncio.to_thread(_lease_held, lease_key):
+                break
+        except SQLAlchemyError:
+            break
+
+    # Holder finished without a cacheable result (or died): do it ourselves
+    return await fn()
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    flight = _flights.get(name)
+    if flight is None:
+        flight = SingleFlight(name)
+        _flights[name] = flight
+    return flight
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: flight.stats() for name, flight in _flights.items()}
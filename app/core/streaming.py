@@ -0,0 +1,47 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_sse(accept: str | None) -> bool:
+    # NDJSON unless the client explicitly asks for Server-Sent Events
+    return bool(accept) and SSE_MEDIA_TYPE in accept.lower()
+
+
+def encode_event(event: Dict[str, Any], sse: bool) -> str:
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if sse:
+        return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _encode(events: AsyncIterator[Dict[str, Any]], sse: bool) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            yield encode_event(event, sse)
+    except Exception as e:
+        # Headers are already sent; report the failure as the last event
+        logger.warning("Stream aborted", exc_info=True)
+        yield encode_event({"type": "error", "detail": str(e)}, sse)
+
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]], accept: str | None) -> StreamingResponse:
+    """
+    Serialize an async iterator of event dicts ({"type": ..., ...}) as SSE or NDJSON.
+    """
+    sse = wants_sse(accept)
+    return StreamingResponse(
+        _encode(events, sse),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
+        },
+    )
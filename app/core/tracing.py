@@ -0,0 +1,305 @@
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# W3C Trace Context: version-traceid-parentid-flags
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    """
+    One timed operation in a trace. Field names follow the OpenTelemetry data
+    model so exported lines can be loaded by OTel-aware tools.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "attributes",
+                 "sampled", "start_ns", "end_ns", "status", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: str | None, sampled: bool) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.attributes: Dict[str, Any] = {}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.status = "OK"
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.error},
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+_STOP = object()
+
+
+class _SpanFileWriter:
+    """
+    Appends exported span lines to a file from a daemon thread, so a span ending
+    on the event loop only costs a queue put. Lines are dropped (and counted)
+    when the writer falls more than `max_queued` behind.
+    """
+
+    def __init__(self, path: str, max_queued: int) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            f = open(self.path, "a", encoding="utf-8")
+        except OSError:
+            logger.warning("Cannot open trace file %s, spans are discarded", self.path, exc_info=True)
+            while self._queue.get() is not _STOP:
+                pass
+            return
+        with f:
+            while True:
+                # write whatever has piled up, then one flush per batch
+                item = self._queue.get()
+                while item is not _STOP:
+                    f.write(item)
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                f.flush()
+                if item is _STOP:
+                    return
+
+
+_writer: _SpanFileWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def _file_writer() -> _SpanFileWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                path = settings.TRACING_FILE.format(pid=os.getpid())
+                _writer = _SpanFileWriter(path, settings.TRACING_QUEUE_MAX)
+                atexit.register(shutdown_tracing)
+    return _writer
+
+
+def shutdown_tracing() -> None:
+    """
+    Flush queued spans to the trace file and stop the writer thread.
+    """
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+        if writer.dropped:
+            logger.warning("Dropped %d spans: trace file writer fell behind", writer.dropped)
+
+
+def _enabled() -> bool:
+    return settings.TRACING_EXPORTER in {"console", "file"}
+
+
+def _export(span: Span) -> None:
+    if settings.TRACING_EXPORTER == "console":
+        logger.info(
+            "span %s trace=%s span=%s parent=%s %.1fms %s%s",
+            span.name, span.trace_id, span.span_id, span.parent_span_id or "-",
+            (span.end_ns - span.start_ns) / 1e6, span.status,
+            f" {span.attributes}" if span.attributes else "",
+        )
+        return
+    # One JSON object per line, written by this process's writer thread only.
+    # Workers sharing one file are not guaranteed whole-line appends (O_APPEND
+    # only keeps small writes intact on local filesystems): put "{pid}" in
+    # TRACING_FILE to give each worker its own file.
+    _file_writer().put(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def current_traceparent() -> str | None:
+    span = _current_span.get()
+    return span.traceparent if span is not None else None
+
+
+def traceparent_headers() -> Dict[str, str]:
+    """
+    Headers that continue the current trace in an outbound call.
+    """
+    value = current_traceparent()
+    return {"traceparent": value} if value else {}
+
+
+@contextmanager
+def span(
+    name: str,
+    traceparent: str | None = None,
+    activate: bool = True,
+    **attributes: Any,
+) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a child of the current span (or as a new root, continuing
+    `traceparent` when given). Yields None when tracing is off.
+
+    With `activate=False` the span is not made current: for async generators,
+    whose body runs in the consumer's context between yields.
+    """
+    if not _enabled():
+        yield None
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        current = Span(name, parent.trace_id, parent.span_id, parent.sampled)
+    else:
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            current = Span(name, remote[0], remote[1], remote[2])
+        else:
+            sampled = random.random() < settings.TRACING_SAMPLE_RATIO
+            current = Span(name, secrets.token_hex(16), None, sampled)
+    current.attributes.update(attributes)
+
+    token = _current_span.set(current) if activate else None
+    try:
+        yield current
+    except GeneratorExit:
+        # a generator closed by its consumer ended early, it did not fail
+        current.set_attribute("closed_early", True)
+        raise
+    except BaseException as e:
+        current.status = "ERROR"
+        current.error = f"{type(e).__name__}: {e}"[:500]
+        raise
+    finally:
+        if token is not None:
+            _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        if current.sampled:
+            try:
+                _export(current)
+            except Exception:
+                logger.debug("Span export failed", exc_info=True)
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """
+    Decorator: run the (sync or async) function inside a span named `name`
+    (default: module.qualname). Keeps the signature, so FastAPI dependencies work.
+    """
+
+    def decorator(fn: F) -> F:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    Root span per HTTP request. Continues an incoming W3C `traceparent` and
+    returns the request's own traceparent in the response headers so callers
+    can find the trace.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _enabled():
+            await self.app(scope, receive, send)
+            return
+
+        from app.core.metrics import route_template
+
+        headers = dict(scope.get("headers") or [])
+        incoming = headers.get(b"traceparent", b"").decode("latin-1") or None
+
+        with span(f"{scope['method']} {scope['path']}", traceparent=incoming) as root:
+            async def _send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (b"traceparent", root.traceparent.encode())]
+                await send(message)
+
+            root.set_attribute("http.method", scope["method"])
+            root.set_attribute("http.target", scope["path"])
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                template = route_template(scope)
+                root.name = f"{scope['method']} {template}"
+                root.set_attribute("http.route", template)
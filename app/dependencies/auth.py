@@ -1,37 +1,82 @@
 from fastapi import Depends, HTTPException, status, Cookie
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
-from app.services.user_service import get_user_by_email
+from app.core.tracing import traced
+from app.db.session import get_async_db
+from app.schemas.auth import Principal
+from app.services.user_service import get_user_by_email_async, get_principal_record
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-def _decode_token(token: str, expected_type: str) -> str:
+def _decode_payload(token: str, expected_type: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         if payload.get("type") != expected_type:
             raise ValueError("Wrong token type")
-        subject = payload.get("sub")
-        if not subject:
+        if not payload.get("sub"):
             raise ValueError("Missing sub")
-        return subject
+        return payload
     except (JWTError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
-def get_current_user(
+@traced()
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Cheap auth for routes that only need to know *who* is calling (see settings.AUTH_MODE).
+    Use get_current_user when an endpoint needs the full User row.
+    """
+    payload = _decode_payload(token, "access")
+    email, uid, ver = payload["sub"], payload.get("uid"), payload.get("ver")
+
+    # Signed claims are enough; tokens minted before uid/ver existed fall through
+    if settings.AUTH_MODE == "stateless" and uid is not None and ver is not None:
+        return Principal(user_id=uid, email=email, token_version=ver)
+
+    record = await get_principal_record(email, use_cache=settings.AUTH_MODE != "database")
+    if not record:
+        raise HTTPException(status_code=401, detail="User not found")
+    if ver is not None and ver != record["token_version"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return Principal(user_id=record["user_id"], email=email, token_version=record["token_version"])
+
+async def get_admin_principal(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """
+    Operators only (settings.ADMIN_EMAILS).
+    """
+    if principal.email.lower() not in {email.lower() for email in settings.ADMIN_EMAILS}:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return principal
+
+@traced()
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    email = _decode_token(token, "access")
-    user = get_user_by_email(db, email)
+    payload = _decode_payload(token, "access")
+    user = await get_user_by_email_async(db, payload["sub"])
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
+    if payload.get("ver") is not None and payload["ver"] != user.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
     return user
 
-def get_refresh_subject(refresh_token: str | None = Cookie(default=None)):
+def get_refresh_payload(refresh_token: str | None = Cookie(default=None)) -> dict:
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Missing refresh token")
-    return _decode_token(refresh_token, "refresh")
+    return _decode_payload(refresh_token, "refresh")
+
+async def get_refresh_principal(payload: dict = Depends(get_refresh_payload)) -> Principal:
+    """
+    The refresh token's user, checked against the stored token_version on every
+    refresh (whatever AUTH_MODE is), so revoked sessions cannot mint new access tokens.
+    """
+    record = await get_principal_record(payload["sub"], use_cache=False)
+    if not record:
+        raise HTTPException(status_code=401, detail="User not found")
+    # tokens minted before token versioning carry no "ver": they belong to version 0
+    if payload.get("ver", 0) != record["token_version"]:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return Principal(user_id=record["user_id"], email=payload["sub"], token_version=record["token_version"])
@@ -1,62 +1,126 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
-from typing import Iterable
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator
 from app.core.config import settings
+from app.core.resilience import get_provider
+from app.core.tracing import span, traceparent_headers, traced
 
-# Load environment variables (expects OPENAI_API_KEY)
-load_dotenv()
-client = OpenAI()
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
+# One shared async client per worker: it keeps its own connection pool,
+# so every call reuses warm connections instead of blocking the event loop.
+# Built on first use (or in the app lifespan), never at import time.
+_client: "AsyncOpenAI | None" = None
 
 
-def generate_response_with_search_41(prompt: str) -> str:
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+def get_client() -> "AsyncOpenAI":
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI  # heavy import, kept off the import path
 
-    response = client.responses.create(
-        model="gpt-4.1",
-        tools=[{"type": "web_search_preview"}],
-        input=prompt,
-    )
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+    return _client
 
-    return response.output_text
 
+async def close_client() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
 
-def generate_response( prompt: str | None):
+# Caps how many LLM calls a single worker keeps in flight at once
+_llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
 
-    result = client.responses.create(
-        model="gpt-5",
-        input=prompt,
-        reasoning={ "effort": "low" },
-        text={ "verbosity": "low" },
-    )
 
-    return result.output_text
+# Every OpenAI call goes through the provider policy (rate limit + circuit breaker);
+# not idempotent from our side (cost), and the SDK does its own retries.
+async def _create_response(**kwargs):
+    kwargs.setdefault("extra_headers", traceparent_headers() or None)
+    return await get_provider("openai").call(lambda: get_client().responses.create(**kwargs), idempotent=False)
+
 
+async def _create_chat_completion(**kwargs):
+    kwargs.setdefault("extra_headers", traceparent_headers() or None)
+    return await get_provider("openai").call(lambda: get_client().chat.completions.create(**kwargs), idempotent=False)
 
 
-def generate_response_with_search ( prompt: str | None):
+async def generate_response_with_search_41(prompt: str) -> str:
+    async with _llm_semaphore:
+        response = await _create_response(
+            model="gpt-4.1",
+            tools=[{"type": "web_search_preview"}],
+            input=prompt,
+        )
 
-    response = client.responses.create(
-        model="gpt-5",
-        tools=[{"type": "web_search_preview"}],
-        input= prompt
-    )
     return response.output_text
 
 
-def generate_response_40(prompt: str | None):
-    
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=2048,
-        top_p=1
-    )
-    return response.choices[0].message.content
+async def generate_response(prompt: str | None) -> str:
+    async with _llm_semaphore:
+        result = await _create_response(
+            model="gpt-5",
+            input=prompt,
+            reasoning={"effort": "low"},
+            text={"verbosity": "low"},
+        )
+
+    return result.output_text
+
 
+@traced()
+async def generate_response_with_search(prompt: str | None) -> str:
+    async with _llm_semaphore:
+        response = await _create_response(
+            model=settings.LLM_VERIFY_MODEL,
+            tools=[{"type": "web_search_preview"}],
+            input=prompt,
+        )
+    return response.output_text
 
+
+async def stream_response_with_search(prompt: str | None) -> AsyncIterator[str]:
+    """
+    Same call as generate_response_with_search, streamed: yields output text deltas
+    as the model produces them. The concurrency slot is held until the stream ends;
+    closing the generator early (aclose / cancellation) closes the upstream stream.
+    The "llm.stream" span covers the upstream stream's whole lifetime.
+    """
+    async with _llm_semaphore:
+        with span("llm.stream", activate=False, model=settings.LLM_VERIFY_MODEL) as current:
+            stream = await _create_response(
+                model=settings.LLM_VERIFY_MODEL,
+                tools=[{"type": "web_search_preview"}],
+                input=prompt,
+                stream=True,
+                extra_headers={"traceparent": current.traceparent} if current else None,
+            )
+            deltas = 0
+            try:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        deltas += 1
+                        yield event.delta
+            finally:
+                if current:
+                    current.set_attribute("llm.deltas", deltas)
+                await stream.close()
+
+
+async def generate_response_40(prompt: str | None) -> str:
+    async with _llm_semaphore:
+        response = await _create_chat_completion(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2048,
+            top_p=1
+        )
+    return response.choices[0].message.content
@@ -1,6 +1,11 @@
+from app.core.tracing import traced
 
+# Bump whenever build_factcheck_prompt's wording or output schema changes:
+# it is part of the LLM verification cache key.
+FACTCHECK_PROMPT_VERSION = "1"
 
 
+@traced()
 def build_factcheck_prompt(
     paragraph: str,
     min_sources: int = 2,
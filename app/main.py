@@ -3,12 +3,11 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.core.lifespan import lifespan
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.tracing import TracingMiddleware
 from app.api.api_v1.api import api_router
 
-from app.db.session import engine
-from app.db.base import Base
-from app.models import user
-
 def create_app() -> FastAPI:
     configure_logging()
 
@@ -16,6 +15,7 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         debug=getattr(settings, "DEBUG", False),
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -24,8 +24,16 @@ def create_app() -> FastAPI:
         allow_credentials=True,  # IMPORTANT for refresh cookie
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["traceparent"],
     )
 
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+    if settings.TRACING_EXPORTER != "none":
+        app.add_middleware(TracingMiddleware)
+
     app.include_router(api_router, prefix="/api/v1")
 
     @app.get("/health", tags=["health"])
@@ -35,6 +43,3 @@ def create_app() -> FastAPI:
     return app
 
 app = create_app()
-
-# dev convenience (SQLite). For real prod use Alembic migrations.
-Base.metadata.create_all(bind=engine)
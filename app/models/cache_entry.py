@@ -0,0 +1,12 @@
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class CacheEntry(Base):
+    __tablename__ = "cache_entries"
+
+    namespace: Mapped[str] = mapped_column(String(64), primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    accessed_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class InflightLease(Base):
+    __tablename__ = "inflight_leases"
+
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(255), nullable=False)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Float, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # claim order: queued jobs by priority, then age
+        Index("ix_jobs_claim", "status", "priority", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)          # "analyze" | "llm_verify"
+    payload: Mapped[str] = mapped_column(Text, nullable=False)             # JSON request body
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")  # queued|running|succeeded|failed|cancelled
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # higher runs first
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[float] = mapped_column(Float, nullable=False)        # retry backoff
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    locked_until: Mapped[float | None] = mapped_column(Float, nullable=True)  # lease; expired -> requeued
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)       # JSON
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    webhook_url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+    started_at: Mapped[float | None] = mapped_column(Float, nullable=True)
+    finished_at: Mapped[float | None] = mapped_column(Float, nullable=True)
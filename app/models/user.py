@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
@@ -9,3 +9,5 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     full_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    # bump to revoke every token issued so far (stamped into tokens as "ver")
+    token_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,111 @@
+"""
+Document model: normalized text segmented into sentences once, shared by every
+stage of the pipeline.
+"""
+import math
+import re
+from array import array
+from heapq import nlargest
+from typing import Any, Dict, Iterator, List, Sequence, overload
+
+from app.core.cache import make_key
+from app.processor.text_normalization import collapse_whitespace
+
+# A sentence runs to a [.!?] run followed by whitespace (or to the end of the text)
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+(?=\s|$)|$)")
+
+
+class Document(Sequence[str]):
+    """
+    Whitespace-normalized text plus its sentence spans, kept as two compact
+    offset arrays into `text`; a sentence string is only sliced out when asked
+    for. Stages annotate sentences by index: ClaimBuster scores (NaN = not
+    scored) and Fact Check results.
+
+    Behaves as a read-only sequence of sentence strings, so it can be passed
+    wherever a list of sentences is expected.
+    """
+
+    __slots__ = ("text", "starts", "ends", "scores", "fact_checks", "_keys", "_digest")
+
+    def __init__(self, text: str) -> None:
+        """
+        `text` must already be whitespace-normalized (see from_text).
+        """
+        self.text = text
+        self.starts = array("I")
+        self.ends = array("I")
+        for match in _SENTENCE_RE.finditer(text):
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+        self.scores = array("d", [math.nan]) * len(self.starts)
+        self.fact_checks: Dict[int, Any] = {}  # sentence index -> FactCheckSentenceResult
+        self._keys: List[str | None] | None = None
+        self._digest: str | None = None
+
+    @classmethod
+    def from_text(cls, text: str) -> "Document":
+        return cls(collapse_whitespace(text or ""))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.sentence(i) for i in range(*index.indices(len(self)))]
+        return self.sentence(index)
+
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        for start, end in zip(self.starts, self.ends):
+            yield text[start:end]
+
+    def sentence(self, index: int) -> str:
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def span(self, index: int) -> tuple[int, int]:
+        return self.starts[index], self.ends[index]
+
+    @property
+    def digest(self) -> str:
+        """
+        Content hash of the whole text (cache / single-flight key).
+        """
+        if self._digest is None:
+            self._digest = make_key(self.text)
+        return self._digest
+
+    def sentence_key(self, index: int) -> str:
+        """
+        Content hash of one sentence, ignoring its terminal punctuation; computed
+        once per sentence and used as the per-sentence cache key.
+        """
+        if self._keys is None:
+            self._keys = [None] * len(self)
+        key = self._keys[index]
+        if key is None:
+            key = self._keys[index] = make_key(self.sentence(index).rstrip(".!? "))
+        return key
+
+    def score(self, index: int) -> float | None:
+        value = self.scores[index]
+        return None if math.isnan(value) else value
+
+    def set_score(self, index: int, score: float) -> None:
+        # ClaimBuster may split one of our sentences further: keep the most check-worthy part
+        current = self.scores[index]
+        self.scores[index] = score if math.isnan(current) else max(current, score)
+
+    def top_sentences(self, k: int, min_score: float = 0.0) -> List[int]:
+        """
+        Indices of the `k` highest-scored sentences with score >= `min_score`,
+        best first (ties keep document order).
+        """
+        scored = (i for i, s in enumerate(self.scores) if s >= min_score)  # NaN compares False
+        return nlargest(k, scored, key=self.scores.__getitem__)
@@ -1,13 +1,55 @@
-import re
-from urllib.parse import urlparse
-import requests
-import trafilatura
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import httpx
+from app.core.cache import get_cache, make_key
+from app.core.config import settings
+from app.core.executors import BoundedExecutor
+from app.core.metrics import track_upstream
+from app.core.http_clients import http_clients
+from app.core.tracing import span, traced
 from app.processor import yt_transcript_fetcher
+from app.processor.document import Document
+from app.processor.text_normalization import basic_analysis, collapse_whitespace
 
 # from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
 
 YOUTUBE_HOSTS = {"youtube.com", "youtu.be", "www.youtube.com", "m.youtube.com"}
 
+# Query params that never change page content (dropped from article cache keys)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "smid", "spm", "_ga", "_hsenc", "_hsmi",
+}
+
+# CPU-heavy HTML extraction (optionally in worker processes)
+extraction_executor = BoundedExecutor(
+    "extraction",
+    max_workers=settings.EXTRACTION_MAX_WORKERS,
+    max_queue=settings.EXTRACTION_MAX_QUEUE,
+    kind=settings.EXTRACTION_EXECUTOR,
+)
+# youtube-transcript-api is a blocking client, so it gets its own thread pool
+youtube_executor = BoundedExecutor(
+    "youtube",
+    max_workers=settings.YOUTUBE_MAX_WORKERS,
+    max_queue=settings.YOUTUBE_MAX_QUEUE,
+)
+
+@dataclass
+class ExtractionResult:
+    """
+    Everything process_input learns about an input, computed once.
+    """
+    source_type: str                      # "plain_text" | "web_url" | "youtube_url"
+    text: str
+    analysis: dict
+    warnings: list[str] = field(default_factory=list)
+    metadata: dict[str, Any] | None = None
+    document: Document | None = None      # `text` segmented into sentences
+
 def is_url(text: str) -> bool:
     try:
         parsed = urlparse(text.strip())
@@ -19,81 +61,200 @@ def is_youtube(url: str) -> bool:
     host = urlparse(url).netloc.lower()
     return host in YOUTUBE_HOSTS
 
-def fetch_text_from_article(url: str) -> str:
-    downloaded = trafilatura.fetch_url(url)
-    if not downloaded:
-        raise ValueError("Could not download the page (blocked or unreachable).")
-    extracted = trafilatura.extract(
+def source_type(user_input: str) -> str:
+    s = (user_input or "").strip()
+    if not s:
+        return "plain_text"
+    if is_url(s):
+        return "youtube_url" if is_youtube(s) else "web_url"
+    return "plain_text"
+
+async def fetch_youtube_transcript(video_id: str) -> dict:
+    """
+    Transcript + language for a video, cached on (video_id, preferred languages).
+    """
+    languages = list(yt_transcript_fetcher.PREFERRED_LANGUAGES)
+    cache = get_cache(
+        "youtube_transcripts",
+        ttl_seconds=settings.YOUTUBE_CACHE_TTL_SECONDS,
+        max_entries=settings.YOUTUBE_CACHE_MAX_ENTRIES,
+    )
+    key = make_key(video_id, languages)
+
+    result = await cache.get(key)
+    if result is None:
+        # spans are opened on the loop side: the worker thread doesn't see the trace context
+        with span("get_youtube_transcript_any", video_id=video_id):
+            async with track_upstream("youtube"):
+                result = await youtube_executor.run(
+                    yt_transcript_fetcher.get_youtube_transcript_any, video_id, timeout=settings.YOUTUBE_TIMEOUT_SECONDS
+                )
+        if not result:
+            raise ValueError("No transcript is available for this video.")
+        await cache.set(key, result)
+    return result
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for cache keys: lowercase scheme/host, drop default ports,
+    fragments and tracking params (utm_*, fbclid, ...), sort the remaining query.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and not ((scheme == "http" and parsed.port == 80) or (scheme == "https" and parsed.port == 443)):
+        host = f"{host}:{parsed.port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, host, parsed.path or "/", parsed.params, urlencode(query), ""))
+
+@dataclass
+class FetchedPage:
+    status_code: int
+    content: bytes
+    headers: httpx.Headers
+
+_UNREACHABLE = "Could not download the page (blocked or unreachable)."
+
+async def _read_capped(resp: httpx.Response, limit: int) -> bytes:
+    # Stop as soon as the body passes `limit` instead of buffering all of it first
+    declared = resp.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise ValueError(_UNREACHABLE)
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in resp.aiter_bytes():
+        size += len(chunk)
+        if size > limit:
+            raise ValueError(_UNREACHABLE)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@traced()
+async def fetch_article(url: str, headers: dict[str, str] | None = None) -> FetchedPage:
+    """
+    Download a page, at most ARTICLE_MAX_BYTES of it (decoded); a 304
+    (conditional request) is returned as-is with an empty body.
+    """
+    try:
+        async with track_upstream("article_fetch"):
+            async with http_clients.get("articles").stream("GET", url, headers=headers) as resp:
+                if resp.status_code == 304:
+                    return FetchedPage(resp.status_code, b"", resp.headers)
+                resp.raise_for_status()
+                content = await _read_capped(resp, settings.ARTICLE_MAX_BYTES)
+    except httpx.HTTPError:
+        raise ValueError(_UNREACHABLE)
+    if not content:
+        raise ValueError(_UNREACHABLE)
+    return FetchedPage(resp.status_code, content, resp.headers)
+
+def _article_cache():
+    return get_cache(
+        "articles",
+        ttl_seconds=settings.ARTICLE_CACHE_FRESH_SECONDS,
+        max_entries=settings.ARTICLE_CACHE_MAX_ENTRIES,
+        backend=settings.ARTICLE_CACHE_BACKEND,
+        stale_seconds=settings.ARTICLE_CACHE_TTL_SECONDS,
+    )
+
+def extract_article_text(downloaded: bytes) -> str | None:
+    # module-level so it can run in a process pool; trafilatura is imported lazily
+    # because it is slow to import and only needed for web URLs
+    import trafilatura
+
+    return trafilatura.extract(
         downloaded,
         include_comments=False,
         include_tables=False,
         favor_recall=True,
         no_fallback=False,
     )
-    if not extracted:
-        raise ValueError("Failed to extract article text from this URL.")
+
+@traced()
+async def fetch_text_from_article(url: str) -> str:
+    """
+    Article text for `url`, cached on the canonical URL.
+    Fresh entries are served directly; older ones are revalidated with
+    If-None-Match / If-Modified-Since, and trafilatura.extract only runs
+    when the downloaded HTML actually changed.
+    """
+    cache = _article_cache()
+    key = make_key(canonicalize_url(url))
+
+    entry, stale = await cache.lookup(key)
+    if entry is not None and not stale:
+        return entry["text"]
+
+    conditional: dict[str, str] = {}
+    if entry is not None:
+        if entry.get("etag"):
+            conditional["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditional["If-Modified-Since"] = entry["last_modified"]
+
+    resp = await fetch_article(url, headers=conditional or None)
+    if resp.status_code == 304 and entry is not None:
+        await cache.set(key, entry)  # still valid: restart the fresh window
+        return entry["text"]
+
+    html_hash = hashlib.sha256(resp.content).hexdigest()
+    if entry is not None and entry.get("html_hash") == html_hash:
+        extracted = entry["text"]
+    else:
+        with span("trafilatura.extract", html_bytes=len(resp.content)):
+            async with track_upstream("trafilatura"):
+                extracted = await extraction_executor.run(
+                    extract_article_text, resp.content, timeout=settings.EXTRACTION_TIMEOUT_SECONDS
+                )
+        if not extracted:
+            raise ValueError("Failed to extract article text from this URL.")
+
+    await cache.set(key, {
+        "html_hash": html_hash,
+        "text": extracted,
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+    })
     return extracted
 
 def normalize_whitespace(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    return collapse_whitespace(s or "")
 
-def basic_analysis(text: str) -> dict:
-    """
-    Minimal analysis: char/word/sentence counts, top tokens (naive).
-    Keeps it dependency-light.
-    """
-    clean = normalize_whitespace(text)
-    words = re.findall(r"\b[\w’'-]+\b", clean.lower())
-    sentences = re.split(r"(?<=[.!?])\s+", clean) if clean else []
-    # naive stoplist
-    stop = {
-        "the","a","an","and","or","of","to","in","for","on","at","with","by","is","are",
-        "was","were","be","it","this","that","as","from","but","if","not","we","you",
-        "i","they","he","she","them","his","her","our","their","my","your"
-    }
-    freq = {}
-    for w in words:
-        if w in stop or len(w) < 3:
-            continue
-        freq[w] = freq.get(w, 0) + 1
-    top = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:10]
-
-    # super-light "summary": first 3 sentences preview
-    preview = " ".join(sentences[:3]).strip()
-
-    return {
-        "characters": len(clean),
-        "words": len(words),
-        "sentences": len([s for s in sentences if s]),
-        "top_terms": top,
-        "preview": preview
-    }
-
-def process_input(user_input: str) -> tuple[str, dict, list[str]]:
+def segment_and_analyze(text: str) -> tuple[Document, dict]:
+    # `text` is segmented once and the analysis reuses the sentence spans
+    document = Document(text)
+    return document, basic_analysis(document)
+
+@traced()
+async def process_input(user_input: str) -> ExtractionResult:
     """
-    Returns (final_text, analysis, warnings)
-    - user_input may be plain text or URL (YouTube/news).
+    Extract text (plus source metadata) from plain text or a URL (YouTube/news).
     """
     warnings: list[str] = []
+    metadata: dict[str, Any] | None = None
     user_input = user_input.strip()
 
     if not user_input:
         raise ValueError("Empty input.")
 
-    if is_url(user_input):
-        if is_youtube(user_input):
-            # text = youtube_transcriber.transcribe_youtube(
-            #     user_input,
-            #     engine="faster-whisper",
-            #     model="tiny",
-            #     keep_temp=False,
-            # )
-            text = ""
-            vid = yt_transcript_fetcher.extract_video_id(user_input)
-            result = yt_transcript_fetcher.get_youtube_transcript_any(vid)
-            text = result["transcript"]
-        else:
-            text = fetch_text_from_article(user_input)
+    src = source_type(user_input)
+    if src == "youtube_url":
+        # text = youtube_transcriber.transcribe_youtube(
+        #     user_input,
+        #     engine="faster-whisper",
+        #     model="tiny",
+        #     keep_temp=False,
+        # )
+        vid = yt_transcript_fetcher.extract_video_id(user_input)
+        result = await fetch_youtube_transcript(vid)
+        text = result["transcript"]
+        metadata = {"video_id": vid, "language_code": result.get("language_code")}
+    elif src == "web_url":
+        text = await fetch_text_from_article(user_input)
     else:
         text = user_input
 
@@ -101,7 +262,17 @@ def process_input(user_input: str) -> tuple[str, dict, list[str]]:
     if not text:
         raise ValueError("No textual content found.")
 
-    analysis = basic_analysis(text)
-    return text, analysis, warnings
-
-
+    # Not on extraction_executor: that small pool is for trafilatura.extract, and
+    # segmenting is cheap enough that a process hop would cost more than it saves
+    if len(text) <= settings.SEGMENT_INLINE_MAX_CHARS:
+        document, analysis = segment_and_analyze(text)
+    else:
+        document, analysis = await asyncio.to_thread(segment_and_analyze, text)
+    return ExtractionResult(
+        source_type=src,
+        text=text,
+        analysis=analysis,
+        warnings=warnings,
+        metadata=metadata,
+        document=document,
+    )
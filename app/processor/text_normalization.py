@@ -0,0 +1,116 @@
+"""
+Text normalization shared by extraction, formatting and ClaimBuster.
+
+Everything here is written for multi-megabyte transcripts and articles: one
+C-level pass per concern instead of chains of regex substitutions and
+str.replace calls, and no work at all for the common clean-input case.
+"""
+import re
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from app.processor.document import Document
+
+# Typographic punctuation -> ASCII (JSON / prompt / API safe)
+_TYPOGRAPHIC = {
+    "“": '"',
+    "”": '"',
+    "‘": "'",
+    "’": "'",
+    "—": "-",
+    "–": "-",
+}
+# Control characters that str.split() does not already treat as whitespace
+_CONTROL_CHARS = "".join(chr(c) for c in (*range(0x20), 0x7F) if not chr(c).isspace())
+_CONTROL_RE = re.compile(f"[{re.escape(_CONTROL_CHARS)}]")
+_CONTROL_TABLE = str.maketrans("", "", _CONTROL_CHARS)
+
+_WORD_RE = re.compile(r"\b[\w’'-]+\b")
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+")
+
+# naive stoplist
+STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "at", "with", "by", "is", "are",
+    "was", "were", "be", "it", "this", "that", "as", "from", "but", "if", "not", "we", "you",
+    "i", "they", "he", "she", "them", "his", "her", "our", "their", "my", "your",
+})
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Every whitespace run -> one space, stripped (same as re.sub(r"\\s+", " ").strip()).
+    """
+    return " ".join(text.split())
+
+
+def _strip_control_chars(text: str) -> str:
+    # str.translate has a fast path for ASCII text; on anything else it does a
+    # dict lookup per character and a regex is several times faster
+    if text.isascii():
+        return text.translate(_CONTROL_TABLE)
+    return _CONTROL_RE.sub("", text) if _CONTROL_RE.search(text) else text
+
+
+def to_json_ready(text: str) -> str:
+    """
+    Collapse whitespace, map typographic quotes/dashes to ASCII and drop
+    control characters.
+    """
+    if not text.isascii():
+        # replace only what is present: cheaper than a translate table on non-ASCII text
+        for char, ascii_char in _TYPOGRAPHIC.items():
+            if char in text:
+                text = text.replace(char, ascii_char)
+    return collapse_whitespace(_strip_control_chars(text))
+
+
+def terminate_sentence(text: str) -> str:
+    """
+    Make `text` end with a period (ClaimBuster expects period-terminated sentences).
+    """
+    if not text:
+        return text
+    if text.endswith(("!", "?")):
+        return text[:-1] + "."
+    if not text.endswith("."):
+        return text + "."
+    return text
+
+
+def basic_analysis(text: "str | Document", top_k: int = 10) -> Dict[str, Any]:
+    """
+    Minimal analysis: char/word/sentence counts, top terms (naive) and a
+    three-sentence preview. A Document's existing sentence spans are reused.
+    """
+    clean = collapse_whitespace(text) if isinstance(text, str) else text.text
+    words = _WORD_RE.findall(clean.lower())
+
+    # Count everything in C, then filter the (much smaller) vocabulary
+    counts = Counter(words)
+    terms = [(w, n) for w, n in counts.items() if len(w) >= 3 and w not in STOPWORDS]
+    top = nlargest(top_k, terms, key=itemgetter(1))  # stable: ties keep first-seen order
+
+    # Sentences end at [.!?] + whitespace; whitespace is collapsed, so the
+    # preview is a prefix of `clean` and no sentence list is built
+    if not isinstance(text, str):
+        sentences = len(text)
+        preview_end = text.ends[min(sentences, 3) - 1] if sentences else 0
+    else:
+        sentences = 0
+        preview_end = len(clean)
+        for sentences, boundary in enumerate(_SENTENCE_BOUNDARY_RE.finditer(clean), start=1):
+            if sentences == 3:
+                preview_end = boundary.start()
+        if clean:
+            sentences += 1  # the text after the last boundary
+
+    return {
+        "characters": len(clean),
+        "words": len(words),
+        "sentences": sentences,
+        "top_terms": top,
+        "preview": clean[:preview_end].strip(),
+    }
@@ -1,11 +1,17 @@
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 from youtube_transcript_api._errors import CouldNotRetrieveTranscript
+import logging
 import re
 
+logger = logging.getLogger(__name__)
 
-def get_youtube_transcript_any(video_id: str):
+# Languages tried first, in order, before falling back to any transcript
+PREFERRED_LANGUAGES = ("en",)
+
+
+def get_youtube_transcript_any(video_id: str, languages: tuple[str, ...] = PREFERRED_LANGUAGES):
     """
-    Try to fetch a transcript in English (if available), else fall back to any language.
+    Try to fetch a transcript in `languages` (English by default), else fall back to any language.
     Returns a dict with:
        {
          "language_code": str,
@@ -21,7 +27,7 @@ def get_youtube_transcript_any(video_id: str):
 
         # Try English first
         try:
-            transcript = transcript_list.find_transcript(['en'])
+            transcript = transcript_list.find_transcript(list(languages))
         except NoTranscriptFound:
             # fallback: pick first available transcript
             transcript = None
@@ -54,16 +60,16 @@ def get_youtube_transcript_any(video_id: str):
         }
 
     except TranscriptsDisabled:
-        print(f"[!] Transcripts are disabled for video {video_id}")
+        logger.info("Transcripts are disabled for video %s", video_id)
         return None
     except NoTranscriptFound:
-        print(f"[!] No transcript found for video {video_id}")
+        logger.info("No transcript found for video %s", video_id)
         return None
     except CouldNotRetrieveTranscript as e:
-        print(f"[!] Could not retrieve transcript for video {video_id}: {e}")
+        logger.warning("Could not retrieve transcript for video %s: %s", video_id, e)
         return None
-    except Exception as e:
-        print(f"[!] Unexpected error for video {video_id}: {e}")
+    except Exception:
+        logger.exception("Unexpected error fetching transcript for video %s", video_id)
         return None
 
 
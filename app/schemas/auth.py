@@ -3,3 +3,11 @@ from pydantic import BaseModel
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+class Principal(BaseModel):
+    """
+    Authenticated caller as asserted by a verified access token.
+    """
+    user_id: int
+    email: str
+    token_version: int = 0
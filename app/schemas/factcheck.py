@@ -1,10 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 class FactCheckVerifyRequest(BaseModel):
     sentences: List[str] = Field(..., min_length=1, description="Claim sentences to verify via Google Fact Check Tools API")
     language: str = Field(default="en", description="Language code, e.g., en")
     page_size: int = Field(default=3, ge=1, le=10, description="Max results per sentence")
+    mode: Literal["concurrent", "sequential"] = Field(default="concurrent", description="Query sentences in parallel or one by one")
 
 class FactCheckReview(BaseModel):
     publisher: str
@@ -20,6 +21,7 @@ class FactCheckMatch(BaseModel):
 class FactCheckSentenceResult(BaseModel):
     sentence: str
     matches: List[FactCheckMatch]
+    error: Optional[str] = None  # set when this sentence's lookup failed
 
 class FactCheckVerifyResponse(BaseModel):
     provider: str = "google_factcheck"
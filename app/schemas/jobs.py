@@ -0,0 +1,27 @@
+from pydantic import AnyHttpUrl, BaseModel, Field
+from typing import Any, Dict, Literal, Optional
+
+JobKind = Literal["analyze", "llm_verify"]
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+class JobCreate(BaseModel):
+    kind: JobKind = Field(..., description="'analyze' takes an AnalyzeRequest body, 'llm_verify' an LLMVerifyRequest body")
+    payload: Dict[str, Any]
+    priority: int = Field(default=0, ge=-10, le=10, description="Higher runs first")
+    webhook_url: Optional[AnyHttpUrl] = Field(
+        default=None,
+        max_length=2048,
+        description="POSTed the finished job (X-Signature: HMAC-SHA256 of the body); https, public hosts only",
+    )
+
+class JobRead(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    priority: int
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+from app.schemas.claimbuster import SentenceScore
+from app.schemas.factcheck import FactCheckSentenceResult
+from app.schemas.llm_verify import LLMVerifyResponse
+from app.schemas.text_extraction import SourceType
+
+class AnalyzeOptions(BaseModel):
+    top_n: int = Field(default=3, ge=1, le=10, description="Claims for the LLM to verify")
+    min_sources: int = Field(default=2, ge=1, le=10)
+    factcheck_top_k: int = Field(default=3, ge=0, le=10, description="Top ClaimBuster sentences to look up in Fact Check")
+    min_score: float = Field(default=0.0, ge=0.0, le=1.0, description="Skip Fact Check for sentences scoring below this")
+    language: str = Field(default="en", description="Language code for Fact Check, e.g., en")
+    page_size: int = Field(default=3, ge=1, le=10, description="Max Fact Check results per sentence")
+    include_llm: bool = Field(default=True, description="Run the (slow) LLM verification stage")
+
+class AnalyzeRequest(AnalyzeOptions):
+    input: str = Field(..., min_length=1, description="Plain text OR a URL (web article or YouTube link)")
+
+class AnalyzeResponse(BaseModel):
+    source_type: SourceType
+    text: str
+    analysis: Dict[str, Any]
+    warnings: List[str] = []
+    metadata: Optional[Dict[str, Any]] = None
+    claimbuster: List[SentenceScore] = []
+    factcheck: List[FactCheckSentenceResult] = []
+    llm: Optional[LLMVerifyResponse] = None
+    errors: Dict[str, str] = {}          # stage -> error; other stages still report
+    timings_ms: Dict[str, float] = {}    # per-stage wall time
+
+class BatchItem(BaseModel):
+    id: Optional[str] = Field(default=None, description="Caller's reference, echoed back; defaults to the item index")
+    input: str = Field(..., min_length=1, description="Plain text OR a URL (web article or YouTube link)")
+
+class BatchAnalyzeRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1)
+    options: AnalyzeOptions = Field(default_factory=AnalyzeOptions, description="Applied to every item")
+    max_concurrency: Optional[int] = Field(default=None, ge=1, description="Capped at BATCH_MAX_CONCURRENCY")
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List
+
+from app.core.config import settings
+from app.processor.processor import canonicalize_url, source_type
+from app.processor.text_normalization import collapse_whitespace
+from app.schemas.pipeline import AnalyzeOptions, AnalyzeRequest, BatchItem
+from app.services.pipeline import analyze
+
+logger = logging.getLogger(__name__)
+
+
+def _dedupe_key(user_input: str) -> str:
+    s = (user_input or "").strip()
+    if source_type(s) == "plain_text":
+        return collapse_whitespace(s)
+    return canonicalize_url(s)
+
+
+async def analyze_batch(
+    items: Iterable[BatchItem],
+    options: AnalyzeOptions,
+    max_concurrency: int | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the /analyze pipeline over many documents and yield one event per item
+    as it finishes (completion order; `index` is the position in `items`):
+
+      {"type": "item", "index", "id", "ok", "result" | "error", "duplicate_of"?}
+      {"type": "done", "total", "unique", "failed", "elapsed_ms"}   last
+
+    Identical inputs (whitespace / canonical URL) are processed once and the
+    result is reported for every copy. At most `max_concurrency` documents
+    (default BATCH_MAX_CONCURRENCY) are in flight; they share the process-wide
+    HTTP pools, caches and LLM semaphore.
+    A failing document is reported on its own line and never aborts the batch.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+    started = time.perf_counter()
+
+    # first index per unique input -> every index sharing it
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(_dedupe_key(item.input), []).append(index)
+
+    async def _one(indexes: List[int]) -> tuple[List[int], Dict[str, Any]]:
+        payload = AnalyzeRequest(input=items[indexes[0]].input, **options.model_dump())
+        async with semaphore:
+            try:
+                result = await analyze(payload)
+                return indexes, {"ok": True, "result": result.model_dump()}
+            except Exception as e:
+                logger.info("Batch item %s failed: %s", indexes[0], e)
+                return indexes, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    tasks = [asyncio.create_task(_one(indexes)) for indexes in groups.values()]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indexes, outcome = await next_done
+            for index in indexes:
+                event = {"type": "item", "index": index, "id": items[index].id or str(index), **outcome}
+                if index != indexes[0]:
+                    event["duplicate_of"] = indexes[0]
+                failed += not outcome["ok"]
+                yield event
+    finally:
+        # Consumer went away (client disconnect / Ctrl-C): stop outstanding work
+        for task in tasks:
+            task.cancel()
+
+    yield {
+        "type": "done",
+        "total": len(items),
+        "unique": len(groups),
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -1,36 +1,187 @@
-import re
-from typing import List
+import asyncio
+import logging
+from bisect import bisect_right
+from typing import List, Optional, Set
 
 import httpx
+
+from app.core.batching import get_batcher
+from app.core.cache import get_cache, make_key
 from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.core.resilience import get_provider
+from app.core.singleflight import get_singleflight
+from app.core.tracing import traced
+from app.processor.document import Document
+from app.processor.text_normalization import terminate_sentence
 from app.schemas.claimbuster import SentenceScore
 
-def _normalize_text_for_claimbuster(text: str) -> str:
+logger = logging.getLogger(__name__)
+
+class ClaimBusterMatchError(ValueError):
+    """
+    ClaimBuster returned a result that cannot be matched to any submitted sentence.
+    """
+
+def _sentence_key(sentence: str) -> str:
+    return make_key(sentence.rstrip(".!? "))
+
+def _claimbuster_cache():
+    return get_cache(
+        "claimbuster",
+        ttl_seconds=settings.CLAIMBUSTER_CACHE_TTL_SECONDS,
+        max_entries=settings.CLAIMBUSTER_CACHE_MAX_ENTRIES,
+    )
+
+@traced()
+async def score_text(input_text: str | Document) -> List[SentenceScore]:
+    """
+    Score every sentence of `input_text`. A Document is scored on its existing
+    sentence spans and gets each sentence's score recorded on it. Sentences
+    scored recently are served from the sentence cache; only the uncached ones
+    are sent to ClaimBuster, and the merged results keep the original sentence order.
+    """
+    document = input_text if isinstance(input_text, Document) else Document.from_text(input_text)
+    if not document:
+        return []
+
+    # Identical texts scored concurrently share one pass
+    per_sentence = await get_singleflight("claimbuster").do(
+        document.digest,
+        lambda: _score_document(document),
+    )
+
+    results: List[SentenceScore] = []
+    for index, items in enumerate(per_sentence):
+        for item in items:
+            document.set_score(index, item.score)
+            results.append(item)
+    return results
+
+def _scoring_sentence(document: Document, index: int) -> str:
+    # ClaimBuster wants the text period-terminated, which only affects the last sentence
+    sentence = document.sentence(index)
+    return terminate_sentence(sentence) if index == len(document) - 1 else sentence
+
+async def _score_document(document: Document) -> List[List[SentenceScore]]:
     """
-    ClaimBuster batch endpoint expects sentences ending with a period.
+    ClaimBuster results per sentence of `document` (usually one each).
     """
-    text = re.sub(r"\s+", " ", text).strip()
-    if not text:
-        return text
-    # If it ends with ! or ?, converting to .
-    if text.endswith(("!", "?")):
-        return text[:-1] + "."
-    if not text.endswith("."):
-        return text + "."
-    return text
+    cache = _claimbuster_cache()
+    per_sentence: List[List[SentenceScore]] = [[] for _ in range(len(document))]
+    uncached: List[int] = []
 
-async def score_text(input_text: str) -> List[SentenceScore]:
-    input_text = _normalize_text_for_claimbuster(input_text)
+    # One lookup for the whole document: with the database backend that is one
+    # IN (...) query instead of a thread hop and a transaction per sentence
+    cached = await cache.get_many(document.sentence_key(index) for index in range(len(document)))
+    for index in range(len(document)):
+        score = cached.get(document.sentence_key(index))
+        if score is None:
+            uncached.append(index)
+        else:
+            per_sentence[index].append(SentenceScore(sentence=_scoring_sentence(document, index), score=score))
 
+    if uncached:
+        sentences = [_scoring_sentence(document, index) for index in uncached]
+        if settings.CLAIMBUSTER_BATCHING:
+            # Shares one upstream POST with whoever else is scoring right now. Wait as
+            # long as that flush may take, retries included, not just one attempt.
+            fresh = await _claimbuster_batcher().submit(
+                sentences,
+                timeout=settings.CLAIMBUSTER_BATCH_WINDOW_MS / 1000
+                + get_provider("claimbuster").max_call_seconds(settings.CLAIMBUSTER_TIMEOUT_SECONDS),
+            )
+        else:
+            fresh = await _score_sentences(sentences)
+
+        # Sentences whose results could not be told apart in a shared call are
+        # scored again on their own; that only affects this caller
+        retry = [i for i, items in enumerate(fresh) if items is None]
+        if retry:
+            alone = await asyncio.gather(*(_score_alone(sentences[i]) for i in retry))
+            fresh = list(fresh)
+            for i, items in zip(retry, alone):
+                fresh[i] = items
+
+        scores = {}
+        for index, items in zip(uncached, fresh):
+            per_sentence[index].extend(items)
+            for item in items:
+                scores[_sentence_key(item.sentence)] = item.score
+        await cache.set_many(scores)
+
+    return per_sentence
+
+def _claimbuster_batcher():
+    return get_batcher(
+        "claimbuster",
+        _score_sentences,
+        max_batch=settings.CLAIMBUSTER_BATCH_MAX_SENTENCES,
+        window_seconds=settings.CLAIMBUSTER_BATCH_WINDOW_MS / 1000,
+    )
+
+async def _score_alone(sentence: str) -> List[SentenceScore]:
+    [items] = await _score_sentences([sentence])
+    if items is None:
+        raise ClaimBusterMatchError(f"ClaimBuster results do not match the submitted sentence: {sentence[:80]!r}")
+    return items
+
+async def _score_sentences(sentences: List[str]) -> List[Optional[List[SentenceScore]]]:
+    """
+    Score many sentences in one upstream call; returns the scores that fall in
+    each input sentence (usually one, more if ClaimBuster splits it further).
+    None marks a sentence next to a result that could not be located in the
+    submitted text: its own results may be missing, so it must be scored again.
+    """
+    # Sentences are Document spans (whitespace already collapsed); terminating the
+    # joined text only touches its end, so the offsets below index exactly what is sent
+    combined = terminate_sentence(" ".join(sentences))
+    starts: List[int] = []
+    pos = 0
+    for sentence in sentences:
+        starts.append(pos)
+        pos += len(sentence) + 1
+
+    per_sentence: List[List[SentenceScore]] = [[] for _ in sentences]
+    affected: Set[int] = set()
+    gap: int | None = None
+    # ClaimBuster may split differently; attribute each result to where its text occurs
+    cursor = 0
+    for item in await _score_upstream(combined):
+        text = item.sentence.strip()
+        found = combined.find(text, cursor)
+        if found == -1:
+            # guessing would hand this score to a neighbour, possibly another caller's
+            # sentence; it belongs somewhere between the previous match and the next
+            logger.warning("ClaimBuster returned a sentence not found in the submitted text: %r", text[:80])
+            if gap is None:
+                gap = cursor
+            continue
+        index = bisect_right(starts, found) - 1
+        if gap is not None:
+            affected.update(range(bisect_right(starts, gap) - 1, index + 1))
+            gap = None
+        per_sentence[index].append(item)
+        cursor = found + len(text)
+    if gap is not None:
+        affected.update(range(bisect_right(starts, gap) - 1, len(sentences)))
+    return [None if index in affected else items for index, items in enumerate(per_sentence)]
+
+async def _score_upstream(input_text: str) -> List[SentenceScore]:
+    """
+    POST `input_text` as is: it must already be normalized, results are matched against it.
+    """
     headers = {"x-api-key": settings.CLAIMBUSTER_API_KEY}
     payload = {"input_text": input_text}
 
-    timeout = httpx.Timeout(settings.CLAIMBUSTER_TIMEOUT_SECONDS)
-
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.post(settings.CLAIMBUSTER_BATCH_URL, json=payload, headers=headers)
+    async def _post() -> httpx.Response:
+        resp = await http_clients.get("claimbuster").post(settings.CLAIMBUSTER_BATCH_URL, json=payload, headers=headers)
         resp.raise_for_status()
-        data = resp.json()
+        return resp
+
+    # Scoring is a pure function of the text, so the POST is safe to retry/hedge
+    resp = await get_provider("claimbuster").call(_post)
+    data = resp.json()
 
     results: List[SentenceScore] = []
 
@@ -1,13 +1,60 @@
-from typing import List, Optional
+import asyncio
+from typing import AsyncIterator, List, Optional, Sequence
+
 import httpx
 
+from app.core.cache import get_cache, make_key
 from app.core.config import settings
-from app.schemas.factcheck import FactCheckMatch, FactCheckReview
+from app.core.http_clients import http_clients
+from app.core.resilience import CircuitOpenError, get_provider
+from app.core.singleflight import get_singleflight
+from app.core.tracing import traced
+from app.processor.document import Document
+from app.schemas.factcheck import FactCheckMatch, FactCheckReview, FactCheckSentenceResult
+
+def _normalize_query(query: str) -> str:
+    # Case/whitespace/trailing-punctuation differences hit the same cache entry
+    return " ".join(query.lower().split()).strip(" .!?")
+
+
+def _factcheck_cache():
+    return get_cache(
+        "factcheck",
+        ttl_seconds=settings.FACTCHECK_CACHE_TTL_SECONDS,
+        max_entries=settings.FACTCHECK_CACHE_MAX_ENTRIES,
+    )
+
 
+@traced()
 async def search_fact_checks(
     query: str,
     language: str = "en",
     page_size: int = 3,
+) -> List[FactCheckMatch]:
+    cache = _factcheck_cache()
+    key = make_key(_normalize_query(query), language, page_size)
+
+    async def _cached() -> List[FactCheckMatch] | None:
+        cached = await cache.get(key)
+        return None if cached is None else [FactCheckMatch.model_validate(m) for m in cached]
+
+    async def _fetch() -> List[FactCheckMatch]:
+        matches = await _search_fact_checks_upstream(query, language, page_size)
+        await cache.set(key, [m.model_dump() for m in matches])
+        return matches
+
+    matches = await _cached()
+    if matches is not None:
+        return matches
+
+    # Concurrent lookups of the same claim share one upstream call
+    return await get_singleflight("factcheck").do(key, _fetch, peek=_cached)
+
+
+async def _search_fact_checks_upstream(
+    query: str,
+    language: str,
+    page_size: int,
 ) -> List[FactCheckMatch]:
     params = {
         "query": query,
@@ -16,12 +63,13 @@ async def search_fact_checks(
         "key": settings.FACT_CHECK_API_KEY,
     }
 
-    timeout = httpx.Timeout(settings.FACTCHECK_TIMEOUT_SECONDS)
-
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.get(settings.FACTCHECK_ENDPOINT, params=params)
+    async def _get() -> httpx.Response:
+        resp = await http_clients.get("factcheck").get(settings.FACTCHECK_ENDPOINT, params=params)
         resp.raise_for_status()
-        data = resp.json()
+        return resp
+
+    resp = await get_provider("factcheck").call(_get)
+    data = resp.json()
 
     matches: List[FactCheckMatch] = []
 
@@ -42,3 +90,130 @@ async def search_fact_checks(
             matches.append(FactCheckMatch(claim=claim_text, claim_date=claim_date, reviews=reviews))
 
     return matches
+
+
+def _describe_error(e: Exception) -> str:
+    if isinstance(e, CircuitOpenError):
+        return f"Google Fact Check unavailable: {str(e)}"
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"Google Fact Check error: {e.response.status_code} - {e.response.text[:300]}"
+    if isinstance(e, httpx.RequestError):
+        return f"Google Fact Check request failed: {str(e)}"
+    return f"Google Fact Check lookup failed: {str(e)}"
+
+
+async def search_fact_checks_many(
+    sentences: Sequence[str],
+    language: str = "en",
+    page_size: int = 3,
+    max_concurrency: int | None = None,
+    deadline_seconds: float | None = None,
+) -> List[FactCheckSentenceResult]:
+    """
+    Look up many sentences concurrently (bounded by a semaphore).
+    Results keep the input order; a failing or timed-out sentence gets its own
+    `error` instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.FACTCHECK_MAX_CONCURRENCY)
+    if deadline_seconds is None:
+        deadline_seconds = settings.FACTCHECK_REQUEST_DEADLINE_SECONDS
+
+    async def _one(sentence: str) -> FactCheckSentenceResult:
+        async with semaphore:
+            matches = await search_fact_checks(query=sentence, language=language, page_size=page_size)
+        return FactCheckSentenceResult(sentence=sentence, matches=matches)
+
+    tasks = [asyncio.create_task(_one(s)) for s in sentences]
+    if tasks:
+        await asyncio.wait(tasks, timeout=deadline_seconds or None)
+
+    results: List[FactCheckSentenceResult] = []
+    for sentence, task in zip(sentences, tasks):
+        if not task.done():
+            task.cancel()
+            results.append(FactCheckSentenceResult(sentence=sentence, matches=[], error="Deadline exceeded"))
+        elif task.exception() is not None:
+            results.append(FactCheckSentenceResult(sentence=sentence, matches=[], error=_describe_error(task.exception())))
+        else:
+            results.append(task.result())
+
+    return results
+
+
+async def iter_fact_checks(
+    sentences: Sequence[str],
+    language: str = "en",
+    page_size: int = 3,
+    max_concurrency: int | None = None,
+    deadline_seconds: float | None = None,
+) -> AsyncIterator[FactCheckSentenceResult]:
+    """
+    Like search_fact_checks_many, but yields each sentence's result as soon as it
+    completes (completion order, not input order). Lookups still pending at the
+    deadline are cancelled and yielded with an error.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.FACTCHECK_MAX_CONCURRENCY)
+    if deadline_seconds is None:
+        deadline_seconds = settings.FACTCHECK_REQUEST_DEADLINE_SECONDS
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds if deadline_seconds else None
+
+    async def _one(sentence: str) -> List[FactCheckMatch]:
+        async with semaphore:
+            return await search_fact_checks(query=sentence, language=language, page_size=page_size)
+
+    pending = {asyncio.create_task(_one(s)): s for s in sentences}
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                sentence = pending.pop(task)
+                if task.exception() is not None:
+                    yield FactCheckSentenceResult(sentence=sentence, matches=[], error=_describe_error(task.exception()))
+                else:
+                    yield FactCheckSentenceResult(sentence=sentence, matches=task.result())
+
+        for task, sentence in pending.items():
+            task.cancel()
+            yield FactCheckSentenceResult(sentence=sentence, matches=[], error="Deadline exceeded")
+    finally:
+        # Consumer went away (client disconnect): drop the remaining lookups
+        for task in pending:
+            task.cancel()
+
+
+async def fact_check_sentences(
+    document: Document,
+    indexes: Sequence[int],
+    language: str = "en",
+    page_size: int = 3,
+) -> List[FactCheckSentenceResult]:
+    """
+    search_fact_checks_many over the given sentences of `document` (in that
+    order), recording each result on the document.
+    """
+    results = await search_fact_checks_many(
+        [document.sentence(i) for i in indexes], language=language, page_size=page_size
+    )
+    for index, result in zip(indexes, results):
+        document.fact_checks[index] = result
+    return results
+
+
+async def iter_document_fact_checks(
+    document: Document,
+    indexes: Sequence[int],
+    language: str = "en",
+    page_size: int = 3,
+) -> AsyncIterator[FactCheckSentenceResult]:
+    """
+    iter_fact_checks over the given sentences of `document`, recording each
+    result on the document as it arrives.
+    """
+    by_sentence = {document.sentence(i): i for i in indexes}
+    async for result in iter_fact_checks(list(by_sentence), language=language, page_size=page_size):
+        document.fact_checks[by_sentence[result.sentence]] = result
+        yield result
@@ -0,0 +1,420 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job
+from app.schemas.jobs import JobRead
+from app.schemas.llm_verify import LLMVerifyRequest
+from app.schemas.pipeline import AnalyzeRequest
+from app.services.llm_verify import llm_verify_paragraph, to_llm_verify_response
+from app.services.pipeline import analyze
+
+logger = logging.getLogger(__name__)
+
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_PAYLOAD_MODELS = {"analyze": AnalyzeRequest, "llm_verify": LLMVerifyRequest}
+
+
+class JobQueueFullError(RuntimeError):
+    """
+    Raised when a user already has JOB_MAX_QUEUED_PER_USER jobs waiting.
+    """
+
+
+class InvalidWebhookURLError(ValueError):
+    """
+    Raised for a webhook URL the server must not call: not https, or a host that
+    resolves to a loopback, private, link-local or otherwise non-public address.
+    """
+
+
+class _RetryableJobError(RuntimeError):
+    """
+    A stage failed inside an otherwise successful run; worth another attempt.
+    """
+
+
+def job_to_read(job: Job) -> JobRead:
+    return JobRead(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        priority=job.priority,
+        attempts=job.attempts,
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+# ---- producer side (API) ----
+
+async def enqueue_job(
+    user_id: int,
+    kind: str,
+    payload: Dict[str, Any],
+    priority: int = 0,
+    webhook_url: str | None = None,
+) -> Job:
+    """
+    Validate `payload` for `kind` and persist a queued job.
+    Raises pydantic.ValidationError for a bad payload, InvalidWebhookURLError
+    for a webhook target the server must not call and JobQueueFullError when
+    the user's backlog is full.
+    """
+    body = _PAYLOAD_MODELS[kind].model_validate(payload).model_dump()
+    if webhook_url:
+        await check_webhook_url(webhook_url)
+    now = time.time()
+
+    async with AsyncSessionLocal() as db:
+        queued = await db.scalar(
+            select(func.count()).select_from(Job).where(Job.user_id == user_id, Job.status == "queued")
+        )
+        if queued >= settings.JOB_MAX_QUEUED_PER_USER:
+            raise JobQueueFullError(f"Too many queued jobs (max {settings.JOB_MAX_QUEUED_PER_USER}).")
+
+        job = Job(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            kind=kind,
+            payload=json.dumps(body),
+            status="queued",
+            priority=priority,
+            attempts=0,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            run_after=now,
+            webhook_url=webhook_url,
+            created_at=now,
+        )
+        db.add(job)
+        await db.commit()
+        return job
+
+
+async def get_job(job_id: str, user_id: int) -> Job | None:
+    async with AsyncSessionLocal() as db:
+        job = await db.get(Job, job_id)
+        return job if job is not None and job.user_id == user_id else None
+
+
+async def list_jobs(user_id: int, limit: int = 50) -> List[Job]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Job).where(Job.user_id == user_id).order_by(Job.created_at.desc()).limit(limit)
+        )
+        return list(result.scalars())
+
+
+async def cancel_job(job_id: str, user_id: int) -> bool:
+    """
+    Cancel a job that has not started yet. Returns False if it is no longer queued.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.user_id == user_id, Job.status == "queued")
+            .values(status="cancelled", finished_at=time.time())
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+# ---- consumer side (workers) ----
+
+async def claim_next_job(worker_id: str = _WORKER_ID) -> Job | None:
+    """
+    Atomically move the best runnable job to "running" under a lease.
+    Order: priority desc, then age. Users already at JOB_MAX_RUNNING_PER_USER are
+    skipped (a soft cap: two workers may briefly overshoot it by one).
+    The conditional UPDATE makes the claim safe across workers without
+    SELECT ... FOR UPDATE SKIP LOCKED, so it works on SQLite and Postgres alike.
+    """
+    now = time.time()
+    saturated = (
+        select(Job.user_id)
+        .where(Job.status == "running")
+        .group_by(Job.user_id)
+        .having(func.count() >= settings.JOB_MAX_RUNNING_PER_USER)
+    )
+
+    async with AsyncSessionLocal() as db:
+        candidates = await db.scalars(
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= now, Job.user_id.not_in(saturated))
+            .order_by(Job.priority.desc(), Job.created_at)
+            .limit(8)
+        )
+        for job_id in candidates.all():
+            claimed = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(
+                    status="running",
+                    attempts=Job.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + settings.JOB_LEASE_SECONDS,
+                    started_at=now,
+                )
+            )
+            await db.commit()
+            if claimed.rowcount == 1:
+                return await db.get(Job, job_id, populate_existing=True)
+    return None
+
+
+async def requeue_expired_jobs() -> int:
+    """
+    Jobs whose worker died (lease expired) go back to the queue, or fail once
+    they have used up their attempts.
+    """
+    now = time.time()
+    async with AsyncSessionLocal() as db:
+        expired = (Job.status == "running", Job.locked_until < now)
+        failed = await db.execute(
+            update(Job)
+            .where(*expired, Job.attempts >= Job.max_attempts)
+            .values(status="failed", error="Worker lease expired", locked_by=None, locked_until=None, finished_at=now)
+        )
+        requeued = await db.execute(
+            update(Job)
+            .where(*expired)
+            .values(status="queued", locked_by=None, locked_until=None, run_after=now)
+        )
+        await db.commit()
+    if failed.rowcount or requeued.rowcount:
+        logger.warning("Recovered expired jobs: %s requeued, %s failed", requeued.rowcount, failed.rowcount)
+    return requeued.rowcount
+
+
+async def _execute(kind: str, payload: Dict[str, Any], last_attempt: bool) -> Dict[str, Any]:
+    if kind == "analyze":
+        result = await analyze(AnalyzeRequest.model_validate(payload))
+        # analyze() reports stage failures inline; retry those while attempts remain
+        if result.errors and not last_attempt:
+            raise _RetryableJobError("; ".join(result.errors.values()))
+        return result.model_dump()
+
+    request = LLMVerifyRequest.model_validate(payload)
+    data = await llm_verify_paragraph(
+        input_text=request.input_text,
+        top_n=request.top_n,
+        min_sources=request.min_sources,
+    )
+    return to_llm_verify_response(data).model_dump()
+
+
+async def _heartbeat(job_id: str, worker_id: str) -> None:
+    while True:
+        await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == "running")
+                .values(locked_until=time.time() + settings.JOB_LEASE_SECONDS)
+            )
+            await db.commit()
+
+
+async def _finish(job: Job, worker_id: str, **values: Any) -> Job | None:
+    async with AsyncSessionLocal() as db:
+        # Only the lease holder may write the outcome
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id, Job.status == "running")
+            .values(locked_by=None, locked_until=None, **values)
+        )
+        await db.commit()
+        if result.rowcount != 1:
+            logger.warning("Lost the lease on job %s; discarding its outcome", job.id)
+            return None
+        return await db.get(Job, job.id, populate_existing=True)
+
+
+async def run_job(job: Job, worker_id: str = _WORKER_ID) -> Job | None:
+    """
+    Execute a claimed job, then persist success, a retry (exponential backoff)
+    or the final failure, and notify the webhook once the job is final.
+    """
+    heartbeat = asyncio.create_task(_heartbeat(job.id, worker_id))
+    try:
+        result = await _execute(job.kind, json.loads(job.payload), job.attempts >= job.max_attempts)
+    except Exception as e:
+        # A bad payload will not get better on retry
+        retryable = not isinstance(e, (ValueError, ValidationError)) and job.attempts < job.max_attempts
+        if retryable:
+            logger.info("Job %s attempt %s failed, retrying: %s", job.id, job.attempts, e)
+            delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            return await _finish(job, worker_id, status="queued", error=str(e), run_after=time.time() + delay)
+        logger.warning("Job %s failed after %s attempts", job.id, job.attempts, exc_info=True)
+        final = await _finish(job, worker_id, status="failed", error=str(e), finished_at=time.time())
+    else:
+        final = await _finish(
+            job, worker_id, status="succeeded", result=json.dumps(result), error=None, finished_at=time.time()
+        )
+    finally:
+        heartbeat.cancel()
+
+    if final is not None and final.webhook_url:
+        await deliver_webhook(final)
+    return final
+
+
+async def check_webhook_url(url: str) -> str | None:
+    """
+    SSRF guard: any user can pick the URL, so refuse plain http and every host
+    that resolves to a non-public address (see WEBHOOK_* settings).
+    Returns the vetted address to connect to (None when private hosts are allowed).
+    """
+    parsed = httpx.URL(url)
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise InvalidWebhookURLError("webhook_url must be an absolute http(s) URL.")
+    if settings.WEBHOOK_REQUIRE_HTTPS and parsed.scheme != "https":
+        raise InvalidWebhookURLError("webhook_url must use https.")
+    if settings.WEBHOOK_ALLOW_PRIVATE_HOSTS:
+        return None
+
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parsed.host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise InvalidWebhookURLError(f"webhook_url host {parsed.host!r} does not resolve.")
+    addresses = []
+    for *_, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        # is_global excludes loopback, RFC1918, link-local (cloud metadata), CGNAT, reserved...
+        if not address.is_global:
+            raise InvalidWebhookURLError(f"webhook_url host {parsed.host!r} is not a public address.")
+        addresses.append(str(address))
+    if not addresses:
+        raise InvalidWebhookURLError(f"webhook_url host {parsed.host!r} does not resolve.")
+    return addresses[0]
+
+
+def _pinned_request(url: str, address: str | None) -> tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    (url, extra headers, request extensions) that connect to `address` while
+    still presenting the original host: Host header, TLS SNI and certificate check.
+    """
+    if address is None:
+        return url, {}, {}
+    parsed = httpx.URL(url)
+    return (
+        str(parsed.copy_with(host=address)),
+        {"Host": parsed.netloc.decode("ascii")},
+        {"sni_hostname": parsed.host},
+    )
+
+
+async def deliver_webhook(job: Job) -> bool:
+    # Checked again at delivery (DNS may point somewhere else by now), and the POST
+    # goes to the address that passed: letting httpx resolve the name a second time
+    # would let a DNS-rebinding host swap in an internal address after the check
+    try:
+        address = await check_webhook_url(job.webhook_url)
+    except InvalidWebhookURLError as e:
+        logger.warning("Not delivering webhook for job %s: %s", job.id, e)
+        return False
+    url, pinned_headers, extensions = _pinned_request(job.webhook_url, address)
+
+    body = job_to_read(job).model_dump_json().encode()
+    signature = hmac.new(settings.SECRET_KEY.encode(), body, hashlib.sha256).hexdigest()
+    headers = {
+        "Content-Type": "application/json",
+        "X-Job-Id": job.id,
+        "X-Signature": f"sha256={signature}",
+        **pinned_headers,
+    }
+
+    client = http_clients.get("webhooks")
+    for attempt in range(settings.WEBHOOK_MAX_ATTEMPTS):
+        try:
+            resp = await client.post(url, content=body, headers=headers, extensions=extensions)
+            if resp.status_code < 400:
+                return True
+            logger.info("Webhook for job %s returned %s", job.id, resp.status_code)
+        except Exception as e:
+            logger.info("Webhook for job %s failed: %s", job.id, e)
+        await asyncio.sleep(2 ** attempt)
+
+    logger.warning("Giving up on webhook for job %s", job.id)
+    return False
+
+
+class JobWorkerPool:
+    """
+    In-process queue consumers: `concurrency` asyncio tasks that claim and run
+    jobs. Every app worker can run a pool; the DB claim keeps them from
+    double-processing, and expired leases are swept back into the queue.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self.worker_id = _WORKER_ID
+        self._tasks: List[asyncio.Task] = []
+        self._last_sweep = 0.0
+        self.processed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        for n in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._loop(), name=f"job-worker-{n}"))
+
+    async def stop(self) -> None:
+        # Jobs interrupted here keep their lease and are requeued once it expires
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if time.monotonic() - self._last_sweep > settings.JOB_LEASE_SECONDS / 2:
+                    self._last_sweep = time.monotonic()
+                    await requeue_expired_jobs()
+
+                job = await claim_next_job(self.worker_id)
+                if job is None:
+                    await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+                    continue
+
+                final = await run_job(job, self.worker_id)
+                self.processed += 1
+                if final is not None and final.status == "failed":
+                    self.failed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job worker loop error")
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+job_workers = JobWorkerPool(settings.JOB_WORKERS)
@@ -1,13 +1,28 @@
+import asyncio
 import json
-from typing import Any, Dict, Tuple
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
 
+from app.core.cache import get_cache, make_key
 from app.core.config import settings
+from app.core.singleflight import get_singleflight
+from app.core.tracing import traced
+from app.processor.document import Document
+from app.processor.text_normalization import collapse_whitespace
 
-from app.llm.prompt_builder import build_factcheck_prompt
-from app.llm.llm_inference import generate_response_with_search
+from app.llm.prompt_builder import build_factcheck_prompt, FACTCHECK_PROMPT_VERSION
+from app.llm.llm_inference import generate_response_with_search, stream_response_with_search
+from app.schemas.llm_verify import LLMVerifyResponse
 
+logger = logging.getLogger(__name__)
 
+# Background stale-while-revalidate refreshes (keys in flight + strong task refs)
+_refreshing: Set[str] = set()
+_refresh_tasks: Set[asyncio.Task] = set()
 
+
+@traced()
 def _safe_json_loads(text: str) -> Tuple[Dict[str, Any] | None, str | None]:
     """
     parse JSON even if the model adds extra text.
@@ -28,18 +43,82 @@ def _safe_json_loads(text: str) -> Tuple[Dict[str, Any] | None, str | None]:
         return None, "JSON decode error (no JSON object found)"
 
 
-async def llm_verify_paragraph(input_text: str, top_n: int, min_sources: int) -> Dict[str, Any]:
-    prompt = build_factcheck_prompt(
+class _ClaimStreamParser:
+    """
+    Incremental scanner over the model's JSON output. Every time an object inside
+    the top-level "claims" array closes, it is parsed and returned, so claims can
+    be forwarded while the rest of the answer is still being generated.
+    """
+
+    def __init__(self) -> None:
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._start: int | None = None
+        self._buffer: List[str] = []
+        self._pos = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        claims: List[Dict[str, Any]] = []
+        for ch in chunk:
+            self._buffer.append(ch)
+            pos, self._pos = self._pos, self._pos + 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"' and self._stack:
+                self._in_string = True
+            elif ch in "{[":
+                # root object -> claims array -> claim object
+                if ch == "{" and self._stack == ["{", "["]:
+                    self._start = pos
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._start is not None and self._stack == ["{", "["]:
+                    candidate = "".join(self._buffer[self._start :])
+                    self._start = None
+                    try:
+                        claims.append(json.loads(candidate))
+                    except json.JSONDecodeError:
+                        pass
+        return claims
+
+
+def _llm_cache():
+    return get_cache(
+        "llm_verify",
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        backend=settings.LLM_CACHE_BACKEND,
+        stale_seconds=settings.LLM_CACHE_STALE_SECONDS,
+    )
+
+
+def _cache_key(input_text: str, top_n: int, min_sources: int) -> str:
+    # Content-addressed: normalized paragraph + every input that shapes the answer
+    paragraph = collapse_whitespace(input_text)
+    return make_key(paragraph, top_n, min_sources, settings.LLM_VERIFY_MODEL, FACTCHECK_PROMPT_VERSION)
+
+
+def _build_prompt(input_text: str, top_n: int, min_sources: int) -> str:
+    return build_factcheck_prompt(
         paragraph=input_text,
         min_sources=min_sources,
         output_format="json",
         include_overall_summary=True,
         top_n=top_n,
-    ) 
+    )
 
-    
-    output_text = generate_response_with_search(prompt)
 
+def _parse_output(output_text: str) -> Dict[str, Any]:
     parsed, err = _safe_json_loads(output_text)
     if parsed is None:
         # Return minimal structure with raw output
@@ -50,3 +129,191 @@ async def llm_verify_paragraph(input_text: str, top_n: int, min_sources: int) ->
     parsed.setdefault("overall_reliability", None)
     parsed["_raw"] = None
     return parsed
+
+
+async def _verify_uncached(input_text: str, top_n: int, min_sources: int) -> Dict[str, Any]:
+    output_text = await generate_response_with_search(_build_prompt(input_text, top_n, min_sources))
+    return _parse_output(output_text)
+
+
+async def _verify_streamed(
+    input_text: str,
+    top_n: int,
+    min_sources: int,
+    on_claim: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
+    parser = _ClaimStreamParser()
+    chunks: List[str] = []
+    # aclosing: the upstream stream is closed even if this is cancelled mid-way
+    async with aclosing(stream_response_with_search(_build_prompt(input_text, top_n, min_sources))) as deltas:
+        async for delta in deltas:
+            chunks.append(delta)
+            for claim in parser.feed(delta):
+                on_claim(claim)
+    return _parse_output("".join(chunks))
+
+
+async def _verify_and_store(
+    key: str,
+    input_text: str,
+    top_n: int,
+    min_sources: int,
+    on_claim: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    if on_claim is None:
+        data = await _verify_uncached(input_text, top_n, min_sources)
+    else:
+        data = await _verify_streamed(input_text, top_n, min_sources, on_claim)
+    # Only successfully parsed results are worth replaying
+    if not data.get("_parse_error"):
+        await _llm_cache().set(key, data)
+    return data
+
+
+def _schedule_refresh(key: str, input_text: str, top_n: int, min_sources: int) -> None:
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+
+    async def _refresh() -> None:
+        try:
+            await _verify_and_store(key, input_text, top_n, min_sources)
+        except Exception:
+            logger.warning("Background LLM cache refresh failed", exc_info=True)
+        finally:
+            _refreshing.discard(key)
+
+    task = asyncio.create_task(_refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+async def _lookup(key: str, input_text: str, top_n: int, min_sources: int) -> Tuple[Dict[str, Any] | None, str]:
+    """
+    (cached result or None, "hit" | "stale" | "miss"); a stale entry is refreshed in the background.
+    """
+    cached, stale = await _llm_cache().lookup(key)
+    if cached is None:
+        return None, "miss"
+    if stale:
+        _schedule_refresh(key, input_text, top_n, min_sources)
+    return cached, "stale" if stale else "hit"
+
+
+async def _verify_shared(
+    key: str,
+    input_text: str,
+    top_n: int,
+    min_sources: int,
+    on_claim: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    """
+    Cache-miss path of both entry points. Identical in-flight verifications
+    (trending stories) share one LLM call; other workers can pick the result up
+    from the shared cache. When this caller leads and passes `on_claim`, the
+    call is streamed and each claim is handed over as soon as it completes.
+    """
+    cache = _llm_cache()
+    return await get_singleflight("llm_verify").do(
+        key,
+        lambda: _verify_and_store(key, input_text, top_n, min_sources, on_claim),
+        peek=lambda: cache.get(key),
+    )
+
+
+async def llm_verify_paragraph(
+    input_text: str | Document,
+    top_n: int,
+    min_sources: int,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Verify a paragraph (text or Document) with the LLM, serving repeats from the result cache.
+    The returned dict carries `_cache` = "hit" | "stale" | "miss" | "bypass".
+    A stale entry is returned immediately and refreshed in the background.
+    """
+    if isinstance(input_text, Document):
+        input_text = input_text.text
+    key = _cache_key(input_text, top_n, min_sources)
+
+    if use_cache:
+        cached, status = await _lookup(key, input_text, top_n, min_sources)
+        if cached is not None:
+            return {**cached, "_cache": status}
+
+    data = await _verify_shared(key, input_text, top_n, min_sources)
+    return {**data, "_cache": "miss" if use_cache else "bypass"}
+
+
+def to_llm_verify_response(data: Dict[str, Any]) -> LLMVerifyResponse:
+    # If parsing failed, return raw (callers still answer 200)
+    if data.get("_parse_error"):
+        return LLMVerifyResponse(
+            claims=[],
+            overall_reliability=None,
+            raw=data.get("raw"),
+        )
+
+    return LLMVerifyResponse(
+        claims=data.get("claims", []),
+        overall_reliability=data.get("overall_reliability"),
+    )
+
+
+async def stream_llm_verify_paragraph(
+    input_text: str | Document,
+    top_n: int,
+    min_sources: int,
+    use_cache: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of llm_verify_paragraph. Yields events:
+      {"type": "llm_claim", "claim": {...}}          as each claim verdict completes
+      {"type": "llm_result", "cache": ..., "result": LLMVerifyResponse dict}   once, at the end
+    Cache hits are replayed as the same events; fresh results are stored like the
+    non-streaming path.
+    """
+    if isinstance(input_text, Document):
+        input_text = input_text.text
+    key = _cache_key(input_text, top_n, min_sources)
+
+    if use_cache:
+        cached, status = await _lookup(key, input_text, top_n, min_sources)
+        if cached is not None:
+            for claim in cached.get("claims", []):
+                yield {"type": "llm_claim", "claim": claim}
+            yield {"type": "llm_result", "cache": status, "result": to_llm_verify_response(cached).model_dump()}
+            return
+
+    claims: asyncio.Queue = asyncio.Queue()
+    # Our wait only: if this client goes away the shared call carries on for the
+    # other callers and still fills the cache
+    flight = asyncio.ensure_future(_verify_shared(key, input_text, top_n, min_sources, claims.put_nowait))
+    next_claim: asyncio.Future | None = None
+    streamed = 0
+    try:
+        while True:
+            next_claim = asyncio.ensure_future(claims.get())
+            await asyncio.wait({next_claim, flight}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_claim.done():
+                break
+            streamed += 1
+            yield {"type": "llm_claim", "claim": next_claim.result()}
+        data = await flight
+    finally:
+        if next_claim is not None:
+            next_claim.cancel()
+        flight.cancel()
+
+    while not claims.empty():
+        streamed += 1
+        yield {"type": "llm_claim", "claim": claims.get_nowait()}
+    if not streamed:
+        # joined a call led by another request (or a non-streaming one): replay its claims
+        for claim in data.get("claims", []):
+            yield {"type": "llm_claim", "claim": claim}
+    yield {
+        "type": "llm_result",
+        "cache": "miss" if use_cache else "bypass",
+        "result": to_llm_verify_response(data).model_dump(),
+    }
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator
+
+import httpx
+
+from app.core.tracing import span
+from app.schemas.pipeline import AnalyzeRequest, AnalyzeResponse
+from app.services.claimbuster import score_text
+from app.services.factcheck import fact_check_sentences, iter_document_fact_checks
+from app.services.llm_verify import llm_verify_paragraph, stream_llm_verify_paragraph, to_llm_verify_response
+from app.services.text_extraction import extract_document
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        with span(f"analyze.{stage}"):
+            yield
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _describe_error(stage: str, e: Exception) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"{stage} error: {e.response.status_code} - {e.response.text[:300]}"
+    return f"{stage} failed: {str(e)}"
+
+
+async def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
+    """
+    Extract and segment once, then run ClaimBuster scoring and LLM verification
+    concurrently on the same Document.
+    Fact Check lookups for the top-scoring sentences start as soon as the scores
+    are in, without waiting for the LLM. A failing stage is reported in `errors`
+    and the other stages still return; extraction errors propagate.
+    """
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+
+    with _timed(timings, "total"):
+        with _timed(timings, "extraction"):
+            extraction = await extract_document(payload.input)
+        document = extraction.document
+
+        result = AnalyzeResponse(
+            source_type=extraction.source_type,
+            text=extraction.text,
+            analysis=extraction.analysis,
+            warnings=list(extraction.warnings),
+            metadata=extraction.metadata,
+        )
+
+        async def _score_then_factcheck() -> None:
+            try:
+                with _timed(timings, "claimbuster"):
+                    result.claimbuster = await score_text(document)
+            except Exception as e:
+                errors["claimbuster"] = _describe_error("ClaimBuster", e)
+                return
+
+            candidates = document.top_sentences(payload.factcheck_top_k, payload.min_score)
+            if not candidates:
+                return
+
+            with _timed(timings, "factcheck"):
+                result.factcheck = await fact_check_sentences(
+                    document,
+                    candidates,
+                    language=payload.language,
+                    page_size=payload.page_size,
+                )
+            if all(r.error for r in result.factcheck):
+                errors["factcheck"] = result.factcheck[0].error
+
+        async def _llm() -> None:
+            try:
+                with _timed(timings, "llm"):
+                    data = await llm_verify_paragraph(
+                        input_text=document,
+                        top_n=payload.top_n,
+                        min_sources=payload.min_sources,
+                    )
+                result.llm = to_llm_verify_response(data)
+            except Exception as e:
+                logger.warning("LLM stage failed in /analyze", exc_info=True)
+                errors["llm"] = _describe_error("LLM verification", e)
+
+        stages = [_score_then_factcheck()]
+        if payload.include_llm:
+            stages.append(_llm())
+        await asyncio.gather(*stages)
+
+    result.errors = errors
+    result.timings_ms = timings
+    return result
+
+
+async def analyze_stream(payload: AnalyzeRequest) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of analyze(): yields events as each piece becomes available.
+
+      accepted           immediately, so the client sees the first byte right away
+      extraction         extracted text + analysis
+      claimbuster_score  one per scored sentence
+      claims             sentences selected for Fact Check
+      factcheck          one per looked-up sentence, in completion order
+      llm_claim          one per LLM verdict, while the model is still generating
+      llm_result         final LLM answer (overall reliability, cache status)
+      error              a stage failed; the others keep going
+      done               per-stage timings and errors
+    """
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+
+    yield {"type": "accepted"}
+
+    with _timed(timings, "extraction"):
+        extraction = await extract_document(payload.input)
+    document = extraction.document
+    yield {
+        "type": "extraction",
+        "source_type": extraction.source_type,
+        "text": extraction.text,
+        "analysis": extraction.analysis,
+        "warnings": list(extraction.warnings),
+        "metadata": extraction.metadata,
+    }
+
+    async def _score_then_factcheck() -> None:
+        with _timed(timings, "claimbuster"):
+            scores = await score_text(document)
+        for item in scores:
+            await queue.put({"type": "claimbuster_score", **item.model_dump()})
+
+        candidates = document.top_sentences(payload.factcheck_top_k, payload.min_score)
+        await queue.put({"type": "claims", "sentences": [document.sentence(i) for i in candidates]})
+        if not candidates:
+            return
+
+        with _timed(timings, "factcheck"):
+            async for item in iter_document_fact_checks(
+                document, candidates, language=payload.language, page_size=payload.page_size
+            ):
+                await queue.put({"type": "factcheck", **item.model_dump()})
+
+    async def _llm() -> None:
+        with _timed(timings, "llm"):
+            async for event in stream_llm_verify_paragraph(
+                input_text=document,
+                top_n=payload.top_n,
+                min_sources=payload.min_sources,
+            ):
+                await queue.put(event)
+
+    async def _run(stage: str, label: str, fn: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await fn()
+        except Exception as e:
+            logger.warning("%s stage failed in /analyze/stream", stage, exc_info=True)
+            errors[stage] = _describe_error(label, e)
+            await queue.put({"type": "error", "stage": stage, "detail": errors[stage]})
+        finally:
+            await queue.put(None)
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(_run("claimbuster", "ClaimBuster", _score_then_factcheck))]
+    if payload.include_llm:
+        tasks.append(asyncio.create_task(_run("llm", "LLM verification", _llm)))
+
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await queue.get()
+            if event is None:
+                remaining -= 1
+            else:
+                yield event
+    finally:
+        # Client disconnected mid-stream: stop the remaining stages
+        for task in tasks:
+            task.cancel()
+
+    timings["total"] = round(timings["extraction"] + (time.perf_counter() - started) * 1000, 2)
+    yield {"type": "done", "errors": errors, "timings_ms": timings}
@@ -1,6 +1,7 @@
-import re
 from typing import Optional
 
+from app.processor.text_normalization import terminate_sentence, to_json_ready
+
 
 class TextFormatterService:
     """
@@ -14,18 +15,12 @@ class TextFormatterService:
     def to_json_ready(text: Optional[str]) -> str:
         """
         Main entry point.
-        Converts any raw input into a clean, JSON-ready string.
+        Converts any raw input into a clean, JSON-ready string: whitespace
+        collapsed, smart quotes/dashes as ASCII, control characters removed.
         """
         if not text:
             return ""
-
-        text = str(text)
-
-        text = TextFormatterService._normalize_whitespace(text)
-        text = TextFormatterService._normalize_quotes(text)
-        text = TextFormatterService._remove_control_chars(text)
-
-        return text.strip()
+        return to_json_ready(str(text))
 
     @staticmethod
     def to_sentence_ready(text: Optional[str]) -> str:
@@ -33,52 +28,4 @@ class TextFormatterService:
         Ensures text is suitable for sentence-based APIs
         (e.g. ClaimBuster expects sentences ending with '.')
         """
-        text = TextFormatterService.to_json_ready(text)
-
-        if not text:
-            return text
-
-        # Replace ! or ? at end with .
-        if text.endswith(("!", "?")):
-            text = text[:-1] + "."
-
-        if not text.endswith("."):
-            text += "."
-
-        return text
-
-    @staticmethod
-    def _normalize_whitespace(text: str) -> str:
-        """
-        - Convert newlines to spaces
-        - Collapse multiple spaces
-        """
-        text = text.replace("\r\n", " ").replace("\n", " ").replace("\t", " ")
-        text = re.sub(r"\s+", " ", text)
-        return text
-
-    @staticmethod
-    def _normalize_quotes(text: str) -> str:
-        """
-        Replace smart quotes with standard ASCII quotes
-        """
-        replacements = {
-            "“": '"',
-            "”": '"',
-            "‘": "'",
-            "’": "'",
-            "—": "-",
-            "–": "-",
-        }
-
-        for k, v in replacements.items():
-            text = text.replace(k, v)
-
-        return text
-
-    @staticmethod
-    def _remove_control_chars(text: str) -> str:
-        """
-        Remove non-printable/control characters that break JSON
-        """
-        return re.sub(r"[\x00-\x1f\x7f]", "", text)
+        return terminate_sentence(TextFormatterService.to_json_ready(text))
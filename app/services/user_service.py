@@ -1,4 +1,9 @@
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
 from app.models.user import User
 from app.core.security import hash_password
 from app.schemas.user import UserCreate
@@ -6,13 +11,93 @@ from app.schemas.user import UserCreate
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, payload: UserCreate) -> User:
+def create_user(db: Session, payload: UserCreate, password_hash: str | None = None) -> User:
     user = User(
         email=payload.email,
         full_name=payload.full_name,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash or hash_password(payload.password),
     )
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
+
+# ---- async variants (AsyncSession from get_async_db) ----
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> User | None:
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    return result.scalars().first()
+
+async def create_user_async(db: AsyncSession, payload: UserCreate, password_hash: str) -> User:
+    user = User(
+        email=payload.email,
+        full_name=payload.full_name,
+        password_hash=password_hash,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+async def update_password_hash_async(db: AsyncSession, user: User, password_hash: str) -> User:
+    user.password_hash = password_hash
+    await db.commit()
+    return user
+
+def update_password_hash(db: Session, user: User, password_hash: str) -> User:
+    user.password_hash = password_hash
+    db.commit()
+    return user
+
+async def revoke_tokens_async(db: AsyncSession, user: User) -> User:
+    """
+    Invalidate every access/refresh token issued to `user` so far.
+    """
+    user.token_version += 1
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+# ---- principal cache (AUTH_MODE="cached") ----
+
+def _principal_cache():
+    # per worker on purpose: invalidation below is synchronous and local,
+    # other workers converge within PRINCIPAL_CACHE_TTL_SECONDS
+    return get_cache(
+        "principals",
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        backend="memory",
+    )
+
+async def _load_principal_record(email: str) -> dict | None:
+    async with AsyncSessionLocal() as db:
+        user = await get_user_by_email_async(db, email)
+        if not user:
+            return None
+        return {"user_id": user.id, "token_version": user.token_version}
+
+async def get_principal_record(email: str, use_cache: bool = True) -> dict | None:
+    """
+    {"user_id", "token_version"} for `email`, served from the principal cache
+    and loaded through the async engine on a miss.
+    """
+    if not use_cache:
+        return await _load_principal_record(email)
+
+    cache = _principal_cache()
+    record = await cache.get(email)
+    if record is None:
+        record = await _load_principal_record(email)
+        if record is not None:
+            await cache.set(email, record)
+    return record
+
+def invalidate_principal(email: str) -> None:
+    _principal_cache().discard(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(_mapper, _connection, target: User) -> None:
+    invalidate_principal(target.email)
@@ -0,0 +1,366 @@
+"""
+Offline load test: drives the FastAPI app in-process against the local mock
+upstreams (benchmarks/mock_upstreams.py, started as a subprocess), so it needs
+no API keys and spends no quota. Reports, per endpoint: throughput, p50/p95/p99
+latency, error rate and event-loop block time.
+
+    python benchmarks/load.py                                  # every scenario
+    python benchmarks/load.py -s analyze,llm_verify -c 32 -n 300
+    python benchmarks/load.py --replay requests.jsonl --input-field body --warm
+    python benchmarks/load.py --json pr.json --baseline main.json   # CI regression gate
+
+Scenarios run one after another, so the event-loop block time measured during
+a scenario belongs to that endpoint. It is the total time a 5 ms probe timer
+woke late, which counts the in-process load generator too; compare runs, not
+absolute values. By default every request carries a unique input so caches
+miss and the upstream path is measured; --warm reuses inputs (cache-hit path).
+
+The run fails (exit 1) when a scenario's error rate is above --max-error-rate
+and, with --baseline, when its p95 grows or its throughput drops by more than
+--max-regression, which makes it usable as a CI gate. Settings can be
+overridden through the environment as usual (e.g. CLAIMBUSTER_BATCHING=false).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+_PARAGRAPHS = [
+    "The city council approved a budget of 4.2 billion dollars on Tuesday. Spending on schools rose by 12 percent "
+    "compared with last year. The mayor said crime has fallen for the third year in a row. Critics noted that "
+    "police overtime doubled since 2019.",
+    "Researchers reported that the new vaccine was 94 percent effective in a trial of 30,000 adults. Side effects "
+    "were mild and lasted less than two days. The company expects to ship 100 million doses by March. Several "
+    "countries have already signed purchase agreements.",
+    "Unemployment dropped to 3.5 percent, the lowest level in fifty years. Wages grew faster than inflation for the "
+    "first time since 2020. The central bank kept interest rates unchanged. Analysts expect a slowdown next year.",
+    "The river flooded more than 2,000 homes after three days of record rainfall. Officials said the levee was "
+    "built in 1952 and never upgraded. Emergency crews rescued 340 people. The governor declared a state of "
+    "emergency on Sunday.",
+]
+
+# name -> (method, path, body builder(text, url) -> json)
+SCENARIOS: Dict[str, tuple[str, str, Callable[[str, str], Dict[str, Any]]]] = {
+    "text_extract": ("POST", "/api/v1/text/extract", lambda text, url: {"input": url}),
+    "claimbuster_score": ("POST", "/api/v1/claimbuster/score", lambda text, url: {"input_text": text}),
+    "factcheck_verify": (
+        "POST", "/api/v1/factcheck/verify",
+        lambda text, url: {"sentences": [s.strip() + "." for s in text.split(".") if s.strip()][:5]},
+    ),
+    "llm_verify": ("POST", "/api/v1/llm/verify", lambda text, url: {"input_text": text}),
+    "analyze": ("POST", "/api/v1/analyze", lambda text, url: {"input": text}),
+    "analyze_url": ("POST", "/api/v1/analyze", lambda text, url: {"input": url, "include_llm": False}),
+}
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    requests: int
+    concurrency: int
+    errors: int
+    elapsed_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    loop_block_ms: float
+    loop_max_lag_ms: float
+    status_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class LoopLagProbe:
+    """
+    Sums how late a short periodic timer fires: the time the loop was blocked.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.blocked += lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def __enter__(self) -> "LoopLagProbe":
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._task.cancel()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mocks(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    cmd = [sys.executable, os.path.join(ROOT, "benchmarks", "mock_upstreams.py"), "--port", str(port),
+           "--seed", str(args.seed)]
+    for name in ("claimbuster", "factcheck", "openai", "articles"):
+        if getattr(args, f"mock_{name}"):
+            cmd += [f"--{name}", getattr(args, f"mock_{name}")]
+    proc = subprocess.Popen(cmd, cwd=ROOT)
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"mock upstreams exited with {proc.returncode}")
+        try:
+            if httpx.get(f"{base}/healthz", timeout=0.5).status_code == 200:
+                return proc, base
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise SystemExit("mock upstreams did not start")
+
+
+def configure_environment(mock_base: str, db_path: str) -> None:
+    # Must run before app.core.config is imported; explicit env vars still win
+    defaults = {
+        "SECRET_KEY": "benchmark-secret",
+        "CLAIMBUSTER_API_KEY": "bench",
+        "FACT_CHECK_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+        "LLM_CACHE_BACKEND": "memory",
+        "JOB_WORKERS": "0",
+        # measure the app, not our politeness towards the real providers
+        "CLAIMBUSTER_RATE_PER_SECOND": "1000",
+        "FACTCHECK_RATE_PER_SECOND": "1000",
+        "LLM_RATE_PER_SECOND": "1000",
+        "LLM_MAX_RETRIES": "0",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+    # always point at the mocks and a throwaway DB: never the real providers or data
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["CLAIMBUSTER_BATCH_URL"] = f"{mock_base}/claimbuster/api/v2/score/text/sentences/"
+    os.environ["FACTCHECK_ENDPOINT"] = f"{mock_base}/v1alpha1/claims:search"
+    os.environ["OPENAI_BASE_URL"] = f"{mock_base}/v1"
+
+
+def load_inputs(args: argparse.Namespace) -> List[str]:
+    if not args.replay:
+        return list(_PARAGRAPHS)
+    texts: List[str] = []
+    with open(args.replay, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            text = record if isinstance(record, str) else record.get(args.input_field)
+            if text:
+                texts.append(str(text)[: args.max_input_chars])
+    if not texts:
+        raise SystemExit(f"no '{args.input_field}' values in {args.replay}")
+    return texts
+
+
+async def _authenticate(client: httpx.AsyncClient) -> Dict[str, str]:
+    creds = {"email": "bench@example.com", "password": "benchmark-password"}
+    await client.post("/api/v1/users", json=creds)  # 409 on re-runs is fine
+    resp = await client.post("/api/v1/auth/login", data={"username": creds["email"], "password": creds["password"]})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    inputs: List[str],
+    mock_base: str,
+    args: argparse.Namespace,
+    run_id: str,
+) -> ScenarioResult:
+    method, path, build = SCENARIOS[name]
+
+    def _body(i: int) -> Dict[str, Any]:
+        text = inputs[i % len(inputs)]
+        url = f"{mock_base}/articles/story-{i % len(inputs)}"
+        if not args.warm:
+            # unique per request: caches, single-flight and dedup all miss
+            text = f"Benchmark run {run_id} request {i} of {name} started. {text}"
+            url = f"{url}?run={run_id}&i={i}"
+        return build(text, url)
+
+    async def _one(i: int, record: bool) -> None:
+        started = time.perf_counter()
+        try:
+            resp = await client.request(method, path, json=_body(i))
+            status = str(resp.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if record:
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    await asyncio.gather(*(_one(-1 - i, record=False) for i in range(args.warmup)))
+
+    counter = iter(range(args.requests))
+
+    async def _worker() -> None:
+        for i in counter:
+            await _one(i, record=True)
+
+    with LoopLagProbe() as probe:
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+    return ScenarioResult(
+        scenario=name,
+        requests=len(latencies),
+        concurrency=args.concurrency,
+        errors=errors,
+        elapsed_s=round(elapsed, 3),
+        throughput_rps=round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(_percentile(ordered, 50) * 1000, 1),
+        p95_ms=round(_percentile(ordered, 95) * 1000, 1),
+        p99_ms=round(_percentile(ordered, 99) * 1000, 1),
+        max_ms=round((ordered[-1] if ordered else 0) * 1000, 1),
+        loop_block_ms=round(probe.blocked * 1000, 1),
+        loop_max_lag_ms=round(probe.max_lag * 1000, 1),
+        status_counts=statuses,
+    )
+
+
+def print_report(results: List[ScenarioResult]) -> None:
+    header = f"{'scenario':<18} {'reqs':>5} {'conc':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} " \
+             f"{'err %':>6} {'loop block ms':>14} {'max lag ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r.scenario:<18} {r.requests:>5} {r.concurrency:>4} {r.throughput_rps:>8.1f} {r.p50_ms:>8.1f} "
+              f"{r.p95_ms:>8.1f} {r.p99_ms:>8.1f} {r.error_rate * 100:>6.1f} {r.loop_block_ms:>14.1f} "
+              f"{r.loop_max_lag_ms:>10.1f}")
+
+
+def check_results(results: List[ScenarioResult], args: argparse.Namespace) -> List[str]:
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+    failures: List[str] = []
+    for r in results:
+        if r.error_rate > args.max_error_rate:
+            failures.append(f"{r.scenario}: error rate {r.error_rate:.1%} > {args.max_error_rate:.1%}")
+        base = baseline.get(r.scenario)
+        if base is None:
+            continue
+        if r.p95_ms > base["p95_ms"] * (1 + args.max_regression):
+            failures.append(f"{r.scenario}: p95 {r.p95_ms:.1f} ms vs baseline {base['p95_ms']:.1f} ms")
+        if r.throughput_rps < base["throughput_rps"] / (1 + args.max_regression):
+            failures.append(f"{r.scenario}: {r.throughput_rps:.1f} rps vs baseline {base['throughput_rps']:.1f} rps")
+    return failures
+
+
+async def run(args: argparse.Namespace, mock_base: str) -> List[ScenarioResult]:
+    from app.main import app  # imported after configure_environment()
+
+    inputs = load_inputs(args)
+    run_id = f"{int(time.time())}"
+    results: List[ScenarioResult] = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            client.headers.update(await _authenticate(client))
+            for name in args.scenarios:
+                result = await run_scenario(client, name, inputs, mock_base, args, run_id)
+                results.append(result)
+                print(f"  {name}: {result.throughput_rps:.1f} rps, p95 {result.p95_ms:.1f} ms", file=sys.stderr)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="measured requests per scenario")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=4, help="unmeasured requests before each scenario")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--warm", action="store_true", help="reuse inputs so caches hit")
+    parser.add_argument("--replay", metavar="JSONL", help="take inputs from a JSONL file (e.g. requests.jsonl)")
+    parser.add_argument("--input-field", default="body", help="field holding the text in --replay lines")
+    parser.add_argument("--max-input-chars", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0, help="mock latency / error seed")
+    for name in ("claimbuster", "factcheck", "openai", "articles"):
+        parser.add_argument(f"--mock-{name}", metavar="MEDIAN:P99[:ERR]",
+                            help=f"{name} mock latency ms and error rate (see mock_upstreams.py)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON (usable as a --baseline)")
+    parser.add_argument("--baseline", metavar="PATH", help="fail on regressions against a previous --json")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95/throughput change")
+    parser.add_argument("--max-error-rate", type=float, default=0.02)
+    args = parser.parse_args()
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    mocks, mock_base = start_mocks(args)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            configure_environment(mock_base, os.path.join(tmp, "bench.db"))
+            results = asyncio.run(run(args, mock_base))
+    finally:
+        mocks.terminate()
+        mocks.wait(timeout=10)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "warm": args.warm,
+                "results": [asdict(r) for r in results],
+            }, f, indent=2)
+
+    failures = check_results(results, args)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Local stand-ins for every upstream the API calls, for load tests that must not
+spend real ClaimBuster / Google / OpenAI quota:
+
+    POST /claimbuster/api/v2/score/text/sentences/   ClaimBuster batch scoring
+    GET  /v1alpha1/claims:search                      Google Fact Check Tools
+    POST /v1/responses                                OpenAI Responses API (JSON or SSE stream)
+    GET  /articles/{slug}                             news-like HTML pages (ETag / 304 aware)
+
+Each upstream has its own log-normal latency (median and p99) and error rate;
+errors are 503s, plus 429s with Retry-After so the client-side throttling is
+exercised too. Responses are deterministic per input; latencies and errors are
+seeded (--seed) so runs are repeatable.
+
+    python benchmarks/mock_upstreams.py --port 8900 --openai 400:2000:0.01
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+(?=\s|$)|$)")
+_Z99 = 2.326  # standard normal 99th percentile
+
+
+@dataclass
+class UpstreamProfile:
+    median_ms: float
+    p99_ms: float
+    error_rate: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "UpstreamProfile":
+        """
+        "median_ms:p99_ms[:error_rate]", e.g. "80:400" or "400:2000:0.02".
+        """
+        parts = [float(p) for p in spec.split(":")]
+        if len(parts) not in (2, 3) or parts[1] < parts[0] or parts[0] <= 0:
+            raise argparse.ArgumentTypeError(f"expected median_ms:p99_ms[:error_rate], got {spec!r}")
+        return cls(*parts)
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        sigma = math.log(self.p99_ms / self.median_ms) / _Z99
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000
+
+
+DEFAULT_PROFILES: Dict[str, UpstreamProfile] = {
+    "claimbuster": UpstreamProfile(80, 400),
+    "factcheck": UpstreamProfile(40, 250),
+    "openai": UpstreamProfile(400, 2000),
+    "articles": UpstreamProfile(30, 200),
+}
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def _llm_output(prompt: str) -> str:
+    # Shaped like the JSON the fact-check prompt asks for (see app/llm/prompt_builder.py)
+    seed = _digest(prompt)
+    claims = [
+        {
+            "rank": rank,
+            "sentence": f"Mock claim {rank} ({seed % 997}).",
+            "verdict": ("True", "False", "Misleading", "Unverified")[(seed >> rank) % 4],
+            "confidence": 40 + (seed >> (rank * 3)) % 60,
+            "confidence_band": "Likely",
+            "reasoning": "Several independent, recent sources agree on the core figures. " * 3,
+            "sources": [f"https://example.org/source/{seed % 1000}/{i}" for i in range(3)],
+        }
+        for rank in (1, 2, 3)
+    ]
+    return json.dumps({
+        "claims": claims,
+        "overall_reliability": {"score": 50 + seed % 50, "band": "Likely", "summary": "Mostly supported."},
+    })
+
+
+def _response_object(model: str, text: str) -> dict:
+    return {
+        "id": "resp_mock",
+        "object": "response",
+        "created_at": 0,
+        "model": model,
+        "status": "completed",
+        "output": [{
+            "type": "message",
+            "id": "msg_mock",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _article_html(slug: str, paragraphs: int) -> str:
+    seed = _digest(slug)
+    body = "\n".join(
+        f"<p>Officials said on day {(seed + i) % 28 + 1} that spending rose by {(seed >> i) % 40 + 1} percent. "
+        f"The report, published by agency {i % 7}, covered {(seed * (i + 1)) % 5000} households across the region. "
+        "Critics argued the figures were incomplete and called for an independent review.</p>"
+        for i in range(paragraphs)
+    )
+    nav = "".join(f"<li><a href='/articles/related-{i}'>Related story {i}</a></li>" for i in range(20))
+    return (
+        f"<html><head><title>Mock article {slug}</title></head><body>"
+        f"<nav><ul>{nav}</ul></nav><article><h1>Mock article {slug}</h1>{body}</article>"
+        "<footer>Copyright mock news</footer></body></html>"
+    )
+
+
+def create_mock_app(
+    profiles: Dict[str, UpstreamProfile] | None = None,
+    seed: int = 0,
+    article_paragraphs: int = 40,
+) -> FastAPI:
+    profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+    rng = random.Random(seed)
+    app = FastAPI(title="mock upstreams")
+    app.state.calls = {name: 0 for name in profiles}
+
+    async def _delay_or_fail(name: str) -> Response | None:
+        profile = profiles[name]
+        app.state.calls[name] += 1
+        await asyncio.sleep(profile.sample_seconds(rng))
+        if profile.error_rate and rng.random() < profile.error_rate:
+            if rng.random() < 0.3:
+                return JSONResponse({"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"})
+            return JSONResponse({"error": "upstream unavailable"}, status_code=503)
+        return None
+
+    @app.get("/healthz")
+    def healthz():
+        return {"status": "ok", "calls": app.state.calls}
+
+    @app.post("/claimbuster/api/v2/score/text/sentences/")
+    async def claimbuster(request: Request):
+        if (error := await _delay_or_fail("claimbuster")) is not None:
+            return error
+        text = (await request.json()).get("input_text", "")
+        results = [
+            {"text": m.group(), "score": round((_digest(m.group()) % 1000) / 1000, 3)}
+            for m in _SENTENCE_RE.finditer(text)
+        ]
+        return {"version": "2", "results": results}
+
+    @app.get("/v1alpha1/claims:search")
+    async def factcheck(query: str = "", languageCode: str = "en", pageSize: int = 3):
+        if (error := await _delay_or_fail("factcheck")) is not None:
+            return error
+        seed = _digest(query)
+        if seed % 3:  # most sentences have no published fact-check
+            return {}
+        return {"claims": [
+            {
+                "text": query,
+                "claimDate": "2024-01-01T00:00:00Z",
+                "claimReview": [{
+                    "publisher": {"name": f"Mock Checker {i}"},
+                    "url": f"https://factcheck.example/{seed % 10_000}/{i}",
+                    "title": f"Fact check of: {query[:60]}",
+                    "textualRating": ("False", "Mostly true", "Misleading")[(seed + i) % 3],
+                    "languageCode": languageCode,
+                }],
+            }
+            for i in range(min(pageSize, 1 + seed % 3))
+        ]}
+
+    @app.post("/v1/responses")
+    async def openai_responses(request: Request):
+        body = await request.json()
+        text = _llm_output(str(body.get("input", "")))
+        model = body.get("model", "mock")
+        if not body.get("stream"):
+            if (error := await _delay_or_fail("openai")) is not None:
+                return error
+            return _response_object(model, text)
+
+        # Streamed: first byte after ~10% of the sampled latency, the rest spread over the deltas
+        total = profiles["openai"].sample_seconds(rng)
+        app.state.calls["openai"] += 1
+        chunks = [text[i:i + 40] for i in range(0, len(text), 40)]
+
+        async def _events() -> AsyncIterator[str]:
+            await asyncio.sleep(total * 0.1)
+            for seq, chunk in enumerate(chunks):
+                event = {"type": "response.output_text.delta", "item_id": "msg_mock", "output_index": 0,
+                         "content_index": 0, "delta": chunk, "sequence_number": seq}
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                await asyncio.sleep(total * 0.9 / len(chunks))
+            done = {"type": "response.completed", "response": _response_object(model, text),
+                    "sequence_number": len(chunks)}
+            yield f"event: {done['type']}\ndata: {json.dumps(done)}\n\n"
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    @app.get("/articles/{slug}")
+    async def article(slug: str, request: Request):
+        if (error := await _delay_or_fail("articles")) is not None:
+            return error
+        html = _article_html(slug, article_paragraphs)
+        etag = f'"{_digest(html):x}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return HTMLResponse(html, headers={"ETag": etag})
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--article-paragraphs", type=int, default=40, help="page size of /articles/*")
+    for name, profile in DEFAULT_PROFILES.items():
+        parser.add_argument(
+            f"--{name}", type=UpstreamProfile.parse, default=profile, metavar="MEDIAN:P99[:ERR]",
+            help=f"latency ms and error rate (default {profile.median_ms:g}:{profile.p99_ms:g}:{profile.error_rate:g})",
+        )
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_mock_app(
+        {name: getattr(args, name) for name in DEFAULT_PROFILES},
+        seed=args.seed,
+        article_paragraphs=args.article_paragraphs,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks: text normalization and analysis on large inputs, against the
+previous implementations (kept below as references). Every comparison also
+checks that both versions produce the same output.
+
+    python benchmarks/text_normalization.py                 # 1 MB inputs
+    python benchmarks/text_normalization.py --size 5000000 --repeat 3
+    python benchmarks/text_normalization.py --min-speedup 1.5   # CI: exit 1 if slower
+
+Corpora: an ASCII article, a typographic (smart quotes / dashes) article and a
+transcript with line breaks, tabs and stray control characters. Control
+characters are placed inside words. The old formatter left a double space when
+it deleted one that stood between two spaces; the new one does not.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.processor.text_normalization import (  # noqa: E402
+    basic_analysis,
+    collapse_whitespace,
+    terminate_sentence,
+    to_json_ready,
+)
+
+_WORDS = (
+    "the officials said spending rose percent report households region critics argued figures incomplete "
+    "independent review council budget schools crime police overtime vaccine trial effective doses"
+).split()
+
+
+# --- previous implementations --------------------------------------------------
+
+def legacy_normalize_whitespace(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "")).strip()
+
+
+def legacy_basic_analysis(text: str) -> dict:
+    clean = legacy_normalize_whitespace(text)
+    words = re.findall(r"\b[\w’'-]+\b", clean.lower())
+    sentences = re.split(r"(?<=[.!?])\s+", clean) if clean else []
+    stop = {
+        "the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "at", "with", "by", "is", "are",
+        "was", "were", "be", "it", "this", "that", "as", "from", "but", "if", "not", "we", "you",
+        "i", "they", "he", "she", "them", "his", "her", "our", "their", "my", "your"
+    }
+    freq = {}
+    for w in words:
+        if w in stop or len(w) < 3:
+            continue
+        freq[w] = freq.get(w, 0) + 1
+    top = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:10]
+    preview = " ".join(sentences[:3]).strip()
+    return {
+        "characters": len(clean),
+        "words": len(words),
+        "sentences": len([s for s in sentences if s]),
+        "top_terms": top,
+        "preview": preview
+    }
+
+
+def legacy_to_json_ready(text: str) -> str:
+    text = text.replace("\r\n", " ").replace("\n", " ").replace("\t", " ")
+    text = re.sub(r"\s+", " ", text)
+    for k, v in {"“": '"', "”": '"', "‘": "'", "’": "'", "—": "-", "–": "-"}.items():
+        text = text.replace(k, v)
+    return re.sub(r"[\x00-\x1f\x7f]", "", text).strip()
+
+
+def legacy_normalize_for_claimbuster(text: str) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    if not text:
+        return text
+    if text.endswith(("!", "?")):
+        return text[:-1] + "."
+    if not text.endswith("."):
+        return text + "."
+    return text
+
+
+# --- corpora ---------------------------------------------------------------------
+
+def make_corpus(kind: str, size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        r = rng.random()
+        if kind == "typographic" and r < 0.04:
+            word = f"“{word}”"
+        elif kind == "typographic" and r < 0.06:
+            word = f"{word} —"
+        elif kind == "transcript" and r < 0.01:
+            word = word[:2] + "\x00" + word[2:]
+        if r > 0.93:
+            word += rng.choice((".", "!", "?"))
+            word += "\n" if kind == "transcript" else ""
+        elif kind == "transcript" and r > 0.9:
+            word += ",\t"
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+# --- runner ----------------------------------------------------------------------
+
+CASES: Dict[str, tuple[Callable[[str], Any], Callable[[str], Any]]] = {
+    "normalize_whitespace": (legacy_normalize_whitespace, collapse_whitespace),
+    "to_json_ready": (legacy_to_json_ready, to_json_ready),
+    "claimbuster_normalize": (
+        legacy_normalize_for_claimbuster, lambda text: terminate_sentence(collapse_whitespace(text))
+    ),
+    "basic_analysis": (legacy_basic_analysis, basic_analysis),
+}
+
+
+def _best_ms(fn: Callable[[str], Any], text: str, repeat: int) -> float:
+    return min(timeit.repeat(lambda: fn(text), number=1, repeat=repeat)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000, help="characters per corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="best of N")
+    parser.add_argument("--min-speedup", type=float, default=0.0, help="fail if any case is below this")
+    args = parser.parse_args()
+
+    corpora = {kind: make_corpus(kind, args.size) for kind in ("ascii", "typographic", "transcript")}
+    failures: List[str] = []
+    print(f"{'case':<22} {'corpus':<12} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for case, (legacy, new) in CASES.items():
+        for kind, text in corpora.items():
+            if legacy(text) != new(text):
+                failures.append(f"{case}/{kind}: output differs from the legacy implementation")
+                continue
+            old_ms = _best_ms(legacy, text, args.repeat)
+            new_ms = _best_ms(new, text, args.repeat)
+            speedup = old_ms / new_ms if new_ms else float("inf")
+            print(f"{case:<22} {kind:<12} {old_ms:>10.2f} {new_ms:>8.2f} {speedup:>7.1f}x")
+            if speedup < args.min_speedup:
+                failures.append(f"{case}/{kind}: {speedup:.2f}x < {args.min_speedup:.2f}x")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Gunicorn settings (Uvicorn workers). Environment overrides: WEB_CONCURRENCY,
+GUNICORN_TIMEOUT, PORT, PROMETHEUS_MULTIPROC_DIR.
+"""
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+
+# Prometheus multiprocess mode: each worker writes samples under this directory
+# and /metrics aggregates them, whichever worker serves the scrape.
+# Must be set before the app (and prometheus_client) is imported in the workers.
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    # stale files from a previous run would be summed into the new counters
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,107 @@
+"""
+Offline batch analysis: run the /analyze pipeline over a JSONL file without the
+HTTP server, writing one NDJSON result line per document (completion order)
+followed by a "done" summary.
+
+    python scripts/batch_analyze.py articles.jsonl -o results.ndjson --no-llm
+    python scripts/batch_analyze.py requests.jsonl --input-field body --id-field request_id
+
+Each input line is either a JSON object (text/URL under --input-field, falling
+back to input/text/url/body) or a bare JSON string. Uses the same settings
+(.env), caches and provider pools as the API.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from typing import List, TextIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.executors import shutdown_executors  # noqa: E402
+from app.core.http_clients import http_clients  # noqa: E402
+from app.core.lifespan import create_schema  # noqa: E402
+from app.llm.llm_inference import close_client  # noqa: E402
+from app.schemas.pipeline import AnalyzeOptions, BatchItem  # noqa: E402
+from app.services.batch import analyze_batch  # noqa: E402
+
+_INPUT_FALLBACKS = ("input", "text", "url", "body")
+
+
+def read_items(stream: TextIO, input_field: str | None, id_field: str | None) -> List[BatchItem]:
+    items: List[BatchItem] = []
+    for lineno, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, str):
+            items.append(BatchItem(id=str(lineno), input=record))
+            continue
+
+        fields = (input_field,) if input_field else _INPUT_FALLBACKS
+        text = next((record[f] for f in fields if record.get(f)), None)
+        if not text:
+            raise SystemExit(f"line {lineno}: no input field ({', '.join(fields)})")
+        ref = record.get(id_field) if id_field else record.get("id")
+        items.append(BatchItem(id=str(ref) if ref is not None else str(lineno), input=text))
+    return items
+
+
+async def run(items: List[BatchItem], out: TextIO, args: argparse.Namespace) -> int:
+    options = AnalyzeOptions(
+        include_llm=not args.no_llm,
+        factcheck_top_k=args.factcheck_top_k,
+        min_score=args.min_score,
+        language=args.language,
+    )
+
+    if settings.DB_CREATE_ALL:
+        await asyncio.to_thread(create_schema)
+    await http_clients.startup()
+
+    failed = 0
+    try:
+        async for event in analyze_batch(items, options, max_concurrency=args.concurrency):
+            out.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            if event["type"] == "done":
+                failed = event["failed"]
+                print(
+                    f"{event['total']} items ({event['unique']} unique), {failed} failed "
+                    f"in {event['elapsed_ms'] / 1000:.1f}s",
+                    file=sys.stderr,
+                )
+    finally:
+        await http_clients.shutdown()
+        await close_client()
+        shutdown_executors()
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--input-field", help="field holding the text/URL")
+    parser.add_argument("--id-field", help="field echoed back as the item id (default: id, else line number)")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_MAX_CONCURRENCY)
+    parser.add_argument("--no-llm", action="store_true", help="skip the LLM verification stage")
+    parser.add_argument("--factcheck-top-k", type=int, default=3)
+    parser.add_argument("--min-score", type=float, default=0.0)
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    # Files are opened here, outside the event loop, and closed on every exit path
+    with contextlib.ExitStack() as stack:
+        src = sys.stdin if args.path == "-" else stack.enter_context(open(args.path, encoding="utf-8"))
+        items = read_items(src, args.input_field, args.id_field)
+        out = stack.enter_context(open(args.output, "w", encoding="utf-8")) if args.output else sys.stdout
+        return asyncio.run(run(items, out, args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Cold-start guard: import app.main in a fresh interpreter and fail if it takes
+longer than the budget, or if it pulls in modules that should load lazily.
+
+    python scripts/check_import_time.py [--budget-ms 1500]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Slow imports that must stay out of the import path (loaded in the lifespan / on first use)
+LAZY_MODULES = ("openai", "trafilatura")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - t0) * 1000
+print(json.dumps({"ms": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3, help="best of N (filters disk-cache noise)")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": root}
+    results = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE % (LAZY_MODULES,)],
+            cwd=root, env=env, capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    best = min(r["ms"] for r in results)
+    loaded = results[0]["loaded"]
+    print(f"import app.main: {best:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if best > args.budget_ms:
+        print("FAIL: import time over budget", file=sys.stderr)
+        failed = True
+    if loaded:
+        print(f"FAIL: eagerly imported {', '.join(loaded)}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time: configure a throwaway environment before
+# any test module imports the app
+_TMP = tempfile.mkdtemp(prefix="claim-polygraph-tests-")
+os.environ.update({
+    "SECRET_KEY": "test-secret",
+    "CLAIMBUSTER_API_KEY": "test",
+    "FACT_CHECK_API_KEY": "test",
+    "OPENAI_API_KEY": "sk-test",
+    "DATABASE_URL": f"sqlite:///{os.path.join(_TMP, 'test.db')}",
+    "CACHE_BACKEND": "memory",
+    "LLM_CACHE_BACKEND": "memory",
+    "JOB_WORKERS": "0",
+    "TRACING_EXPORTER": "none",
+    "BCRYPT_ROUNDS": "4",
+})
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
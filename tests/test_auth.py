@@ -0,0 +1,76 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_refresh_token
+
+
+@pytest.fixture
+def account(client):
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    assert client.post("/api/v1/users", json={"email": email, "password": "secret-pw"}).status_code == 201
+    return email
+
+
+def _login(client, email):
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "secret-pw"})
+    assert response.status_code == 200
+    return response.json()["access_token"], response.cookies["refresh_token"]
+
+
+def _refresh(client, refresh_token):
+    client.cookies.clear()
+    client.cookies.set("refresh_token", refresh_token)
+    return client.post("/api/v1/auth/refresh")
+
+
+def _me(client, access_token):
+    return client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {access_token}"})
+
+
+def test_refresh_mints_a_working_access_token(client, account):
+    _, refresh_token = _login(client, account)
+    response = _refresh(client, refresh_token)
+    assert response.status_code == 200
+    assert _me(client, response.json()["access_token"]).json()["email"] == account
+
+
+def test_logout_revokes_access_and_refresh_tokens(client, account):
+    access_token, refresh_token = _login(client, account)
+    response = client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+
+    assert _me(client, access_token).status_code == 401
+    assert _refresh(client, refresh_token).status_code == 401
+
+
+@pytest.mark.parametrize("mode", ["stateless", "cached", "database"])
+def test_revoked_refresh_token_cannot_mint_access_tokens(client, account, monkeypatch, mode):
+    monkeypatch.setattr(settings, "AUTH_MODE", mode)
+    access_token, refresh_token = _login(client, account)
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert _refresh(client, refresh_token).status_code == 401
+
+
+def test_new_login_after_revocation_works(client, account):
+    access_token, _ = _login(client, account)
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {access_token}"})
+
+    _, refresh_token = _login(client, account)
+    assert _refresh(client, refresh_token).status_code == 200
+
+
+def test_unversioned_refresh_token_counts_as_version_zero(client, account):
+    access_token, _ = _login(client, account)
+    legacy = create_refresh_token(subject=account)  # minted before uid/ver claims existed
+    assert _refresh(client, legacy).status_code == 200
+
+    client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {access_token}"})
+    assert _refresh(client, legacy).status_code == 401
+
+
+def test_refresh_for_unknown_user_is_rejected(client):
+    token = create_refresh_token(subject="nobody@example.com", user_id=999_999, token_version=0)
+    assert _refresh(client, token).status_code == 401
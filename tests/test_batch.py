@@ -0,0 +1,38 @@
+import asyncio
+
+from app.core.config import settings
+from app.schemas.pipeline import AnalyzeOptions, BatchItem
+from app.services import batch
+
+
+def _run_batch(monkeypatch, n_items, max_concurrency):
+    running = peak = 0
+
+    async def fake_analyze(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(batch, "analyze", fake_analyze)
+    items = [BatchItem(id=str(i), input=f"Claim number {i}.") for i in range(n_items)]
+
+    async def collect():
+        return [event async for event in batch.analyze_batch(items, AnalyzeOptions(), max_concurrency=max_concurrency)]
+
+    return asyncio.run(collect()), peak
+
+
+def test_concurrency_is_a_parameter_not_a_setting(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_CONCURRENCY", 2)
+    events, peak = _run_batch(monkeypatch, n_items=12, max_concurrency=6)
+    assert peak == 6
+    assert settings.BATCH_MAX_CONCURRENCY == 2
+
+
+def test_failures_are_reported_per_item(monkeypatch):
+    events, _ = _run_batch(monkeypatch, n_items=3, max_concurrency=None)
+    assert [e["ok"] for e in events if e["type"] == "item"] == [False] * 3
+    assert events[-1]["type"] == "done" and events[-1]["failed"] == 3
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.batching import MicroBatcher
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_batch_fill_dedup_and_timeouts_are_exported():
+    async def double(items):
+        return [item * 2 for item in items]
+
+    async def slow(items):
+        await asyncio.sleep(1)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher("metrics-test", double, max_batch=4, window_seconds=0.01)
+        first = await asyncio.gather(batcher.submit([1, 2]), batcher.submit([2, 3]))
+        full = await batcher.submit([4, 5, 6, 7])
+        stuck = MicroBatcher("metrics-test-slow", slow, max_batch=4, window_seconds=0.001)
+        with pytest.raises(TimeoutError):
+            await stuck.submit([1], timeout=0.01)
+        return first, full
+
+    assert asyncio.run(scenario()) == ([[2, 4], [4, 6]], [8, 10, 12, 14])
+
+    name = "metrics-test"
+    assert _sample("batch_flushes_total", batcher=name, trigger="window") == 1
+    assert _sample("batch_flushes_total", batcher=name, trigger="full") == 1
+    assert _sample("batch_flush_size_count", batcher=name) == 2
+    assert _sample("batch_flush_size_sum", batcher=name) == 3 + 4
+    assert _sample("batch_fill_ratio_sum", batcher=name) == pytest.approx(0.75 + 1)
+    assert _sample("batch_submitted_items_total", batcher=name) == 8
+    assert _sample("batch_dedup_hits_total", batcher=name) == 1
+    assert _sample("batch_caller_timeouts_total", batcher="metrics-test-slow") == 1
+
+
+def test_batch_metrics_are_on_the_metrics_endpoint(client):
+    assert "batch_fill_ratio" in client.get("/metrics").text
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.cache import DatabaseCache, DiskCache, MemoryCache
+
+
+@pytest.fixture(scope="module", autouse=True)
+def schema():
+    from app.core.lifespan import create_schema
+
+    create_schema()
+
+
+@pytest.fixture(params=["memory", "database", "disk"])
+def make_cache(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_DIR", str(tmp_path))
+    backend = {"memory": MemoryCache, "database": DatabaseCache, "disk": DiskCache}[request.param]
+
+    def make(ttl_seconds=60, stale_seconds=0, max_entries=1000):
+        return backend(f"test-{request.node.name}-{time.monotonic_ns()}", ttl_seconds, max_entries, stale_seconds)
+
+    return make
+
+
+def test_get_many_returns_only_cached_keys(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        await cache.set_many({"a": 1, "b": [2, 3]})
+        await cache.set("c", {"x": 4})
+        return await cache.get_many(["a", "b", "c", "missing", "a"])
+
+    assert asyncio.run(scenario()) == {"a": 1, "b": [2, 3], "c": {"x": 4}}
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_set_many_overwrites_existing_entries(make_cache):
+    cache = make_cache()
+
+    async def scenario():
+        await cache.set("a", 1)
+        await cache.set_many({"a": 2, "b": 3})
+        return await cache.get_many(["a", "b"]), await cache.get("a")
+
+    assert asyncio.run(scenario()) == ({"a": 2, "b": 3}, 2)
+
+
+def test_get_many_leaves_out_stale_and_expired_entries(make_cache):
+    stale = make_cache(ttl_seconds=0, stale_seconds=60)
+    expired = make_cache(ttl_seconds=-1)
+
+    async def scenario():
+        await stale.set_many({"a": 1})
+        await expired.set_many({"a": 1})
+        return await stale.get_many(["a"]), await expired.get_many(["a"])
+
+    assert asyncio.run(scenario()) == ({}, {})
+    assert stale.stale_hits == 1
+    assert expired.misses == 1
+
+
+def test_database_get_many_is_one_round_trip(monkeypatch):
+    cache = DatabaseCache("test-round-trip", 60, 1000)
+    monkeypatch.setattr(DatabaseCache, "IN_CHUNK", 3)  # exercise chunking too
+    hops = 0
+    to_thread = asyncio.to_thread
+
+    async def counting_to_thread(fn, *args):
+        nonlocal hops
+        hops += 1
+        return await to_thread(fn, *args)
+
+    keys = [f"k{i}" for i in range(10)]
+
+    async def scenario():
+        await cache.set_many({key: i for i, key in enumerate(keys)})
+        monkeypatch.setattr(asyncio, "to_thread", counting_to_thread)
+        return await cache.get_many(keys + ["missing"])
+
+    assert asyncio.run(scenario()) == {key: i for i, key in enumerate(keys)}
+    assert hops == 1
+
+
+def test_backend_missing_get_or_set_fails_at_construction():
+    from app.core.cache import BaseCache
+
+    class Incomplete(BaseCache):
+        async def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", 60, 10)
@@ -0,0 +1,155 @@
+import asyncio
+import re
+
+from app.schemas.claimbuster import SentenceScore
+from app.services import claimbuster
+
+_SENTENCE_RE = re.compile(r"\S.*?(?:[.!?]+(?=\s|$)|$)")
+
+
+def _fake_upstream(scores, sent):
+    # Splits like ClaimBuster and scores by the sentence text it received
+    async def score_upstream(input_text):
+        sent.append(input_text)
+        return [SentenceScore(sentence=m.group(), score=scores[m.group()]) for m in _SENTENCE_RE.finditer(input_text)]
+    return score_upstream
+
+
+def test_scores_are_attributed_to_their_own_sentence(monkeypatch):
+    # two callers batched together: the last sentence ends with "?" and is sent as "."
+    sent = []
+    scores = {"Taxes rose 5% in 2020.": 0.9, "Did unemployment fall.": 0.2}
+    monkeypatch.setattr(claimbuster, "_score_upstream", _fake_upstream(scores, sent))
+
+    result = asyncio.run(claimbuster._score_sentences(["Taxes rose 5% in 2020.", "Did unemployment fall?"]))
+
+    assert sent == ["Taxes rose 5% in 2020. Did unemployment fall."]
+    assert [[item.score for item in items] for items in result] == [[0.9], [0.2]]
+
+
+def test_sentences_split_further_keep_every_part(monkeypatch):
+    sent = []
+    scores = {"One.": 0.1, "Two!": 0.5, "Three.": 0.7}
+    monkeypatch.setattr(claimbuster, "_score_upstream", _fake_upstream(scores, sent))
+
+    result = asyncio.run(claimbuster._score_sentences(["One. Two!", "Three."]))
+
+    assert [[item.sentence for item in items] for items in result] == [["One.", "Two!"], ["Three."]]
+
+
+def test_repeated_sentences_are_not_collapsed_onto_the_first(monkeypatch):
+    sent = []
+    monkeypatch.setattr(claimbuster, "_score_upstream", _fake_upstream({"Same.": 0.4}, sent))
+
+    result = asyncio.run(claimbuster._score_sentences(["Same.", "Same.", "Same."]))
+
+    assert [len(items) for items in result] == [1, 1, 1]
+
+
+def test_unlocatable_result_marks_its_neighbours_for_rescoring(monkeypatch):
+    async def score_upstream(input_text):
+        return [
+            SentenceScore(sentence="Taxes rose.", score=0.9),
+            SentenceScore(sentence="Something we never sent.", score=0.8),
+            SentenceScore(sentence="Prices fell.", score=0.3),
+            SentenceScore(sentence="Wages grew.", score=0.1),
+        ]
+
+    monkeypatch.setattr(claimbuster, "_score_upstream", score_upstream)
+    result = asyncio.run(claimbuster._score_sentences(["Taxes rose.", "Jobs fell.", "Prices fell.", "Wages grew."]))
+
+    assert result[0] is None and result[1] is None and result[2] is None
+    assert [item.score for item in result[3]] == [0.1]
+
+
+def test_one_unmatched_result_only_fails_its_own_caller(monkeypatch):
+    monkeypatch.setattr(claimbuster.settings, "CLAIMBUSTER_BATCHING", True)
+    monkeypatch.setattr(claimbuster.settings, "CLAIMBUSTER_BATCH_WINDOW_MS", 20)
+    sent = []
+
+    async def score_upstream(input_text):
+        # the upstream garbles "Bad claim." every time, batched or not
+        sent.append(input_text)
+        return [
+            SentenceScore(sentence=m.group() if m.group() != "Bad claim." else "Garbled.", score=0.5)
+            for m in _SENTENCE_RE.finditer(input_text)
+        ]
+
+    monkeypatch.setattr(claimbuster, "_score_upstream", score_upstream)
+    monkeypatch.setattr(claimbuster, "_claimbuster_batcher", _fresh_batcher())
+
+    async def scenario():
+        return await asyncio.gather(
+            claimbuster.score_text("Good claim one is here."),
+            claimbuster.score_text("Bad claim."),
+            claimbuster.score_text("Good claim two is here."),
+            return_exceptions=True,
+        )
+
+    good_one, bad, good_two = asyncio.run(scenario())
+
+    assert isinstance(bad, claimbuster.ClaimBusterMatchError)
+    assert [item.sentence for item in good_one] == ["Good claim one is here."]
+    assert [item.sentence for item in good_two] == ["Good claim two is here."]
+    assert len(sent) >= 2  # one shared batch, then the affected sentences alone
+
+
+def _fresh_batcher():
+    from app.core.batching import MicroBatcher
+
+    batcher = MicroBatcher(
+        "claimbuster-test",
+        claimbuster._score_sentences,
+        max_batch=64,
+        window_seconds=claimbuster.settings.CLAIMBUSTER_BATCH_WINDOW_MS / 1000,
+    )
+    return lambda: batcher
+
+
+def test_unmatched_result_is_a_502(client, monkeypatch):
+    from app.api.api_v1.endpoints import claimbuster as endpoint
+    from tests.test_health import _token
+
+    async def score_text(input_text):
+        raise claimbuster.ClaimBusterMatchError("ClaimBuster results do not match the submitted sentence")
+
+    monkeypatch.setattr(endpoint, "score_text", score_text)
+    response = client.post(
+        "/api/v1/claimbuster/score",
+        json={"input_text": "Taxes rose."},
+        headers={"Authorization": f"Bearer {_token(client, 'cb-mismatch@example.com')}"},
+    )
+    assert response.status_code == 502
+
+
+def test_batched_callers_wait_for_the_full_retry_budget(monkeypatch):
+    from app.core.resilience import get_provider
+
+    timeouts = []
+
+    class Batcher:
+        async def submit(self, sentences, timeout=None):
+            timeouts.append(timeout)
+            return [[SentenceScore(sentence=s, score=0.5)] for s in sentences]
+
+    monkeypatch.setattr(claimbuster, "_claimbuster_batcher", lambda: Batcher())
+    asyncio.run(claimbuster.score_text("A budget sentence that is not cached yet."))
+
+    provider = get_provider("claimbuster")
+    assert timeouts[0] >= (provider.max_retries + 1) * claimbuster.settings.CLAIMBUSTER_TIMEOUT_SECONDS
+
+
+def test_batch_timeout_is_a_504(client, monkeypatch):
+    from app.api.api_v1.endpoints import claimbuster as endpoint
+    from tests.test_health import _token
+
+    async def score_text(input_text):
+        raise TimeoutError("claimbuster batch did not complete within 1s.")
+
+    monkeypatch.setattr(endpoint, "score_text", score_text)
+    response = client.post(
+        "/api/v1/claimbuster/score",
+        json={"input_text": "Taxes rose."},
+        headers={"Authorization": f"Bearer {_token(client, 'cb-timeout@example.com')}"},
+    )
+    assert response.status_code == 504
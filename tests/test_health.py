@@ -0,0 +1,33 @@
+import uuid
+
+from app.core.config import settings
+
+
+def _token(client, email):
+    client.post("/api/v1/users", json={"email": email, "password": "secret-pw"})
+    return client.post("/api/v1/auth/login", data={"username": email, "password": "secret-pw"}).json()["access_token"]
+
+
+def test_liveness_is_public(client):
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_diagnostics_require_authentication(client):
+    assert client.get("/api/v1/health/diagnostics").status_code == 401
+
+
+def test_diagnostics_are_admin_only(client, monkeypatch):
+    admin, user = (f"{uuid.uuid4().hex[:12]}@example.com" for _ in range(2))
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [admin.upper()])
+
+    response = client.get("/api/v1/health/diagnostics", headers={"Authorization": f"Bearer {_token(client, user)}"})
+    assert response.status_code == 403
+
+    response = client.get("/api/v1/health/diagnostics", headers={"Authorization": f"Bearer {_token(client, admin)}"})
+    assert response.status_code == 200
+    assert {"caches", "inflight", "batchers", "upstreams", "executors", "jobs", "startup_ms"} <= response.json().keys()
+
+
+def test_old_per_worker_stats_routes_are_gone(client):
+    for path in ("caches", "inflight", "batchers", "upstreams", "jobs", "startup"):
+        assert client.get(f"/api/v1/health/{path}").status_code == 404
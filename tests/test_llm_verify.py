@@ -0,0 +1,134 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.llm import llm_inference
+from app.services import llm_verify
+
+_CLAIM = {"confidence_band": "Likely", "reasoning": "Sources agree.", "sources": ["https://example.org/a"]}
+_OUTPUT = json.dumps({
+    "claims": [
+        {"rank": 1, "sentence": "Taxes rose.", "verdict": "True", "confidence": 90, **_CLAIM},
+        {"rank": 2, "sentence": "Jobs fell.", "verdict": "False", "confidence": 20, **_CLAIM},
+    ],
+    "overall_reliability": {"score": 60, "band": "Uncertain / Mixed", "summary": "Mixed."},
+})
+
+
+def _fake_stream(calls, release):
+    async def stream_response_with_search(prompt):
+        calls.append(prompt)
+        for i in range(0, len(_OUTPUT), 16):
+            await release.wait()
+            yield _OUTPUT[i:i + 16]
+    return stream_response_with_search
+
+
+async def _collect(paragraph):
+    return [event async for event in llm_verify.stream_llm_verify_paragraph(paragraph, 3, 2)]
+
+
+def test_concurrent_streams_share_one_llm_call(monkeypatch):
+    calls = []
+
+    async def scenario():
+        release = asyncio.Event()
+        monkeypatch.setattr(llm_verify, "stream_response_with_search", _fake_stream(calls, release))
+        first = asyncio.ensure_future(_collect("A trending story about taxes."))
+        second = asyncio.ensure_future(_collect("A trending story about taxes."))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    for events in (first, second):
+        assert [e["claim"]["rank"] for e in events if e["type"] == "llm_claim"] == [1, 2]
+        assert events[-1]["type"] == "llm_result"
+        assert events[-1]["cache"] == "miss"
+        assert events[-1]["result"]["overall_reliability"]["score"] == 60
+
+
+def test_disconnected_stream_still_fills_the_cache(monkeypatch):
+    calls = []
+
+    async def scenario():
+        release = asyncio.Event()
+        release.set()
+        monkeypatch.setattr(llm_verify, "stream_response_with_search", _fake_stream(calls, release))
+        events = llm_verify.stream_llm_verify_paragraph("A story nobody waits for.", 3, 2)
+        assert (await events.__anext__())["type"] == "llm_claim"
+        await events.aclose()
+        await asyncio.sleep(0.05)
+        return await llm_verify.llm_verify_paragraph("A story nobody waits for.", 3, 2)
+
+    data = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert data["_cache"] == "hit"
+
+
+class _FakeStream:
+    def __init__(self):
+        self.closed = False
+
+    def __aiter__(self):
+        return self._events()
+
+    async def _events(self):
+        for delta in ("one", "two", "three"):
+            yield SimpleNamespace(type="response.output_text.delta", delta=delta)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_upstream_stream_is_closed_when_consumer_stops_early(monkeypatch):
+    stream = _FakeStream()
+
+    async def create_response(**kwargs):
+        return stream
+
+    monkeypatch.setattr(llm_inference, "_create_response", create_response)
+
+    async def scenario():
+        deltas = llm_inference.stream_response_with_search("prompt")
+        assert await deltas.__anext__() == "one"
+        await deltas.aclose()
+
+    asyncio.run(scenario())
+
+    assert stream.closed
+
+
+def test_stream_gets_its_own_span_under_the_request(monkeypatch):
+    from app.core import tracing
+
+    exported = []
+    headers = []
+    monkeypatch.setattr(tracing.settings, "TRACING_EXPORTER", "console")
+    monkeypatch.setattr(tracing, "_export", exported.append)
+
+    async def create_response(**kwargs):
+        headers.append(kwargs["extra_headers"])
+        return _FakeStream()
+
+    monkeypatch.setattr(llm_inference, "_create_response", create_response)
+
+    async def scenario():
+        with tracing.span("POST /api/v1/llm/verify/stream") as root:
+            deltas = llm_inference.stream_response_with_search("prompt")
+            assert await deltas.__anext__() == "one"
+            # between yields the consumer still sees its own span as current
+            assert tracing.current_traceparent() == root.traceparent
+            await deltas.aclose()
+        return root
+
+    root = asyncio.run(scenario())
+
+    [stream_span] = [s for s in exported if s.name == "llm.stream"]
+    assert stream_span.parent_span_id == root.span_id
+    assert stream_span.status == "OK" and stream_span.attributes["closed_early"]
+    assert stream_span.end_ns <= root.end_ns
+    assert headers == [{"traceparent": stream_span.traceparent}]
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models import cache_entry, inflight_lease, job, user  # noqa: F401  (register tables)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    config = Config(os.path.join(_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(_ROOT, "alembic"))
+    config.attributes["configure_logger"] = False
+    engine = create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def test_head_matches_the_models(database):
+    config, engine = database
+    command.upgrade(config, "head")
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+
+
+def test_original_create_all_database_upgrades_after_stamp(database):
+    config, engine = database
+    # the schema the original release created with create_all
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR(255) NOT NULL, "
+            "full_name VARCHAR(255), password_hash VARCHAR(255) NOT NULL)"
+        ))
+        connection.execute(text("CREATE INDEX ix_users_id ON users (id)"))
+        connection.execute(text("CREATE UNIQUE INDEX ix_users_email ON users (email)"))
+        connection.execute(text("INSERT INTO users (email, password_hash) VALUES ('old@example.com', 'x')"))
+
+    command.stamp(config, "0001")
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT token_version FROM users")).scalar_one() == 0
+    assert {"cache_entries", "inflight_leases", "jobs"} <= set(inspect(engine).get_table_names())
+
+
+def test_downgrade_to_base(database):
+    config, engine = database
+    command.upgrade(config, "head")
+    command.downgrade(config, "base")
+    assert set(inspect(engine).get_table_names()) <= {"alembic_version"}
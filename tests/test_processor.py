@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.processor import processor
+
+
+class _Body(httpx.AsyncByteStream):
+    # yields 1 KB chunks and records how many were pulled
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self):
+        for _ in range(self.chunks):
+            self.sent += 1
+            yield b"x" * 1024
+
+
+def _use_transport(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(processor, "http_clients", type("Clients", (), {"get": staticmethod(lambda name: client)}))
+
+
+def test_oversized_body_is_abandoned_while_streaming(monkeypatch):
+    monkeypatch.setattr(processor.settings, "ARTICLE_MAX_BYTES", 10 * 1024)
+    body = _Body(chunks=10_000)
+    _use_transport(monkeypatch, lambda request: httpx.Response(200, stream=body))
+
+    with pytest.raises(ValueError):
+        asyncio.run(processor.fetch_article("https://news.example/huge"))
+    assert body.sent <= 11
+
+
+def test_declared_length_over_the_limit_is_rejected_before_reading(monkeypatch):
+    monkeypatch.setattr(processor.settings, "ARTICLE_MAX_BYTES", 10 * 1024)
+    body = _Body(chunks=100)
+    _use_transport(
+        monkeypatch,
+        lambda request: httpx.Response(200, headers={"Content-Length": str(100 * 1024)}, stream=body),
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(processor.fetch_article("https://news.example/big"))
+    assert body.sent == 0
+
+
+def test_page_within_the_limit_and_not_modified(monkeypatch):
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"<html>ok</html>")
+
+    _use_transport(monkeypatch, handler)
+
+    page = asyncio.run(processor.fetch_article("https://news.example/ok"))
+    assert (page.status_code, page.content, page.headers["etag"]) == (200, b"<html>ok</html>", '"v1"')
+    page = asyncio.run(processor.fetch_article("https://news.example/ok", headers={"If-None-Match": '"v1"'}))
+    assert (page.status_code, page.content) == (304, b"")
+
+
+def test_plain_text_does_not_use_the_extraction_pool(monkeypatch):
+    async def busy(*args, **kwargs):
+        raise AssertionError("plain text must not queue behind trafilatura")
+
+    monkeypatch.setattr(processor.extraction_executor, "run", busy)
+
+    small = asyncio.run(processor.process_input("Taxes rose. Jobs fell."))
+    monkeypatch.setattr(processor.settings, "SEGMENT_INLINE_MAX_CHARS", 10)
+    large = asyncio.run(processor.process_input("Taxes rose. Jobs fell."))
+
+    assert small.source_type == large.source_type == "plain_text"
+    assert len(small.document) == len(large.document) == 2
+    assert small.analysis == large.analysis
@@ -0,0 +1,206 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.resilience import CircuitBreaker, CircuitOpenError, Provider
+
+
+def _open_breaker(provider: Provider) -> None:
+    for _ in range(provider.breaker.threshold):
+        provider.breaker.record_failure()
+    provider.breaker._opened_at -= provider.breaker.reset_seconds  # reset period elapsed
+
+
+def _unavailable() -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://upstream.test/")
+    return httpx.HTTPStatusError("503", request=request, response=httpx.Response(503, request=request))
+
+
+def test_breaker_opens_after_threshold_consecutive_failures():
+    breaker = CircuitBreaker(threshold=3, reset_seconds=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() > 0
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    breaker._opened_at -= 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(threshold=5, reset_seconds=30)
+    for _ in range(5):
+        breaker.record_failure()
+    breaker._opened_at -= 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened == 2
+    assert not breaker.allow()
+
+
+def test_cancelled_probe_frees_the_probe_slot():
+    provider = Provider("test", rate_per_second=1000, max_retries=0)
+    _open_breaker(provider)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.ensure_future(provider.call(hang))
+        await started.wait()
+        assert provider.breaker.state == "half_open"
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        async def ok():
+            return "ok"
+
+        return await provider.call(ok)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert provider.breaker.state == "closed"
+
+
+def test_cancelled_call_does_not_release_another_callers_probe():
+    provider = Provider("test", rate_per_second=1000, max_retries=0)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        closed_call = asyncio.ensure_future(provider.call(hang))
+        await started.wait()
+        _open_breaker(provider)
+        assert provider.breaker.allow()  # someone else takes the probe
+        closed_call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await closed_call
+        with pytest.raises(CircuitOpenError):
+            await provider.call(hang)
+
+    asyncio.run(scenario())
+
+
+def test_transient_errors_are_retried_then_open_the_circuit():
+    provider = Provider("test", rate_per_second=1000, max_retries=2)
+    provider.breaker.threshold = 3
+    provider._backoff = lambda attempt: 0
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise _unavailable()
+
+    async def scenario():
+        with pytest.raises(httpx.HTTPStatusError):
+            await provider.call(failing)
+        with pytest.raises(CircuitOpenError):
+            await provider.call(failing)
+
+    asyncio.run(scenario())
+    assert calls == 3
+    assert provider.breaker.state == "open"
+    assert provider.rejected == 1
+
+
+def test_client_errors_do_not_count_against_the_breaker():
+    provider = Provider("test", rate_per_second=1000, max_retries=2)
+    request = httpx.Request("GET", "https://upstream.test/")
+
+    async def bad_request():
+        raise httpx.HTTPStatusError("400", request=request, response=httpx.Response(400, request=request))
+
+    async def scenario():
+        for _ in range(provider.breaker.threshold + 1):
+            with pytest.raises(httpx.HTTPStatusError):
+                await provider.call(bad_request)
+
+    asyncio.run(scenario())
+    assert provider.breaker.state == "closed"
+    assert provider.retries == 0
+
+
+def _rate_limited(retry_after: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://upstream.test/")
+    response = httpx.Response(429, request=request, headers={"Retry-After": retry_after})
+    return httpx.HTTPStatusError("429", request=request, response=response)
+
+
+def test_long_retry_after_fails_fast_and_pauses_at_most_the_cap(monkeypatch):
+    monkeypatch.setattr(settings, "UPSTREAM_RETRY_MAX_SECONDS", 8)
+    provider = Provider("test", rate_per_second=1000, max_retries=3)
+    calls = 0
+
+    async def limited():
+        nonlocal calls
+        calls += 1
+        raise _rate_limited("3600")
+
+    async def scenario():
+        with pytest.raises(httpx.HTTPStatusError):
+            await asyncio.wait_for(provider.call(limited), timeout=5)
+        return provider.bucket._paused_until - time.monotonic()
+
+    paused_for = asyncio.run(scenario())
+    assert calls == 1
+    assert 0 < paused_for <= 8
+
+
+def test_short_retry_after_is_honoured(monkeypatch):
+    provider = Provider("test", rate_per_second=1000, max_retries=1)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    outcomes = [_rate_limited("2"), "ok"]
+
+    async def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def scenario():
+        monkeypatch.setattr(provider.bucket, "acquire", _no_wait)
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        return await provider.call(flaky)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert slept == [2.0]
+
+
+async def _no_wait():
+    return None
@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+from app.core import security
+from app.core.executors import BoundedExecutor
+
+
+def _slow_hash(seconds):
+    time.sleep(seconds)
+    return "hashed"
+
+
+def test_hash_time_average_excludes_queue_wait(monkeypatch):
+    executor = BoundedExecutor("test_password_hash", max_workers=1, max_queue=64)
+    monkeypatch.setattr(security, "_hash_executor", executor)
+    monkeypatch.setattr(security, "_avg_hash_seconds", 0.02)
+
+    async def burst():
+        return await asyncio.gather(*(security._run_hash_job(_slow_hash, 0.02) for _ in range(10)))
+
+    try:
+        assert asyncio.run(burst()) == ["hashed"] * 10
+    finally:
+        executor.shutdown()
+
+    # with queue wait counted, the last jobs would report ~0.2s each
+    assert security._avg_hash_seconds < 0.06
+
+
+def test_estimated_wait_grows_with_queue_depth(monkeypatch):
+    executor = BoundedExecutor("test_password_hash_depth", max_workers=2, max_queue=64)
+    monkeypatch.setattr(security, "_hash_executor", executor)
+    monkeypatch.setattr(security, "_avg_hash_seconds", 0.1)
+
+    assert security.estimated_hash_wait_seconds() == 0.05
+    executor._pending = 6  # 2 running, 4 waiting
+    assert abs(security.estimated_hash_wait_seconds() - 0.25) < 1e-9
@@ -0,0 +1,40 @@
+import json
+import threading
+
+from app.core import tracing
+from app.core.config import settings
+
+
+def test_file_exporter_writes_from_a_background_thread(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "file")
+    monkeypatch.setattr(settings, "TRACING_FILE", str(tmp_path / "traces-{pid}.jsonl"))
+    threads = []
+    real_run = tracing._SpanFileWriter._run
+
+    def run(self):
+        threads.append(threading.current_thread().name)
+        real_run(self)
+
+    monkeypatch.setattr(tracing._SpanFileWriter, "_run", run)
+
+    for i in range(50):
+        with tracing.span("work", index=i):
+            pass
+    tracing.shutdown_tracing()
+
+    [path] = tmp_path.iterdir()
+    assert path.name.startswith("traces-") and "{pid}" not in path.name
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["attributes"]["index"] for line in lines] == list(range(50))
+    assert threads == ["span-writer"]
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = tracing._SpanFileWriter(str(tmp_path / "t.jsonl"), max_queued=1)
+    # one-slot queue: put() never blocks, whatever does not fit is counted
+    for _ in range(1000):
+        writer.put("{}\n")
+    writer.close()
+
+    written = len((tmp_path / "t.jsonl").read_text().splitlines())
+    assert written + writer.dropped == 1000
@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.schemas.jobs import JobCreate
+from app.services.jobs import InvalidWebhookURLError, check_webhook_url
+
+
+@pytest.mark.parametrize("url", ["not a url", "ftp://example.com/hook", "file:///etc/passwd", "/relative/hook"])
+def test_schema_rejects_non_http_urls(url):
+    with pytest.raises(ValidationError):
+        JobCreate(kind="analyze", payload={}, webhook_url=url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://127.0.0.1/hook",
+        "https://localhost:8000/hook",
+        "https://10.1.2.3/hook",
+        "https://172.16.0.1/hook",
+        "https://192.168.1.10/hook",
+        "https://169.254.169.254/latest/meta-data/",
+        "https://100.64.0.1/hook",
+        "https://0.0.0.0/hook",
+        "https://[::1]/hook",
+        "https://[fe80::1]/hook",
+        "https://[fd00::1]/hook",
+        "https://[::ffff:127.0.0.1]/hook",
+    ],
+)
+def test_private_and_loopback_hosts_are_rejected(url):
+    with pytest.raises(InvalidWebhookURLError):
+        asyncio.run(check_webhook_url(url))
+
+
+def test_plain_http_is_rejected_unless_allowed(monkeypatch):
+    with pytest.raises(InvalidWebhookURLError):
+        asyncio.run(check_webhook_url("http://93.184.216.34/hook"))
+    monkeypatch.setattr(settings, "WEBHOOK_REQUIRE_HTTPS", False)
+    asyncio.run(check_webhook_url("http://93.184.216.34/hook"))
+
+
+def test_public_https_host_is_accepted():
+    asyncio.run(check_webhook_url("https://93.184.216.34:8443/hook"))
+
+
+def test_hostname_resolving_to_a_private_address_is_rejected(monkeypatch):
+    async def getaddrinfo(host, port, **kwargs):
+        return [(2, 1, 6, "", ("10.0.0.7", port)), (2, 1, 6, "", ("93.184.216.34", port))]
+
+    async def scenario():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+        await check_webhook_url("https://hooks.example.com/hook")
+
+    with pytest.raises(InvalidWebhookURLError):
+        asyncio.run(scenario())
+
+
+def test_dev_settings_allow_local_receivers(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_REQUIRE_HTTPS", False)
+    monkeypatch.setattr(settings, "WEBHOOK_ALLOW_PRIVATE_HOSTS", True)
+    asyncio.run(check_webhook_url("http://localhost:9000/hook"))
+
+
+def test_delivery_client_does_not_follow_redirects():
+    assert http_clients.get("webhooks").follow_redirects is False
+
+
+def test_job_with_private_webhook_is_rejected(client):
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    client.post("/api/v1/users", json={"email": email, "password": "secret-pw"})
+    token = client.post("/api/v1/auth/login", data={"username": email, "password": "secret-pw"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"kind": "llm_verify", "payload": {"input_text": "Water is wet."}}
+
+    response = client.post("/api/v1/jobs", json={**body, "webhook_url": "https://169.254.169.254/"}, headers=headers)
+    assert response.status_code == 422
+
+    response = client.post("/api/v1/jobs", json={**body, "webhook_url": "https://93.184.216.34/hook"}, headers=headers)
+    assert response.status_code == 202
+
+
+def test_delivery_connects_to_the_vetted_address(monkeypatch):
+    from app.models.job import Job
+    from app.services import jobs
+
+    sent = []
+    lookups = iter(["93.184.216.34", "127.0.0.1"])  # rebinds after the first lookup
+
+    async def getaddrinfo(host, port, **kwargs):
+        return [(2, 1, 6, "", (next(lookups), port))]
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(204)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(jobs, "http_clients", type("Clients", (), {"get": staticmethod(lambda name: client)}))
+    job = Job(id="job-1", kind="analyze", status="succeeded", priority=0, attempts=1,
+              webhook_url="https://hooks.example.com:8443/hook?x=1", created_at=0.0)
+
+    async def scenario():
+        monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+        return await jobs.deliver_webhook(job)
+
+    assert asyncio.run(scenario()) is True
+    [request] = sent
+    assert str(request.url) == "https://93.184.216.34:8443/hook?x=1"
+    assert request.headers["host"] == "hooks.example.com:8443"
+    assert request.extensions["sni_hostname"] == "hooks.example.com"